@@ -15,7 +15,7 @@ def init_database():
     Crea las tablas y carga datos iniciales para desarrollo/testing.
     """
     print("Inicializando base de datos con datos de ejemplo...")
-    app = create_app()
+    app = create_app(iniciar_segundo_plano=False)
     
     with app.app_context():
         # Crear todas las tablas
@@ -159,6 +159,10 @@ def init_database():
         db.session.add_all([reserva1, reserva2, reserva3, reserva4, reserva5, 
                            reserva6, reserva7, reserva8, reserva9, reserva10])
         db.session.commit()
+        
+        # Sincronizar el contador de cupos con las reservas cargadas
+        from src.repositories.clase_repository import ClaseRepository
+        ClaseRepository().recalcular_cupos_ocupados()
         print(f"✓ {Reserva.query.count()} reservas creadas")
         
         print("\n" + "="*60)
@@ -7,6 +7,7 @@ from .plan_controller import plan_bp
 from .solicitud_baja_controller import solicitud_bp
 from .calendario_controller import calendario_bp
 from .estadisticas_controller import estadisticas_bp
+from .tarea_controller import tarea_bp
 
 __all__ = [
     'socio_bp',
@@ -16,6 +17,7 @@ __all__ = [
     'plan_bp',
     'solicitud_bp',
     'calendario_bp',
-    'estadisticas_bp'
+    'estadisticas_bp',
+    'tarea_bp'
 ]
 
@@ -1,4 +1,6 @@
 """Controlador base con funcionalidad común"""
+import threading
+from typing import Any, Callable
 from flask import jsonify, request
 from functools import wraps
 from src.exceptions.base_exceptions import FitFlowException, ValidationException
@@ -7,6 +9,35 @@ from src.core.logging_config import get_logger
 logger = get_logger(__name__)
 
 
+class ServicioPerezoso:
+    """
+    Servicio que se construye en el primer acceso a uno de sus atributos.
+    
+    Permite declarar los servicios de un controlador a nivel de módulo sin
+    construirlos (ni a sus repositorios y proxies) al importar la aplicación.
+    """
+    
+    def __init__(self, fabrica: Callable[[], Any]):
+        """
+        Args:
+            fabrica: Función (o clase) que crea el servicio
+        """
+        self._fabrica = fabrica
+        self._instancia = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, nombre: str) -> Any:
+        return getattr(self.instancia(), nombre)
+    
+    def instancia(self) -> Any:
+        """Devuelve el servicio, creándolo la primera vez"""
+        if self._instancia is None:
+            with self._lock:
+                if self._instancia is None:
+                    self._instancia = self._fabrica()
+        return self._instancia
+
+
 def handle_errors(f):
     """
     Decorator para manejo centralizado de errores en endpoints.
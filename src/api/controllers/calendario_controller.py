@@ -5,13 +5,13 @@ from src.services.agregador_horarios_service import (
     AgregadorHorariosService,
     ModoVisualizacion
 )
-from src.api.controllers.base_controller import handle_errors
+from src.api.controllers.base_controller import handle_errors, ServicioPerezoso
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 calendario_bp = Blueprint('calendario', __name__, url_prefix='/api/calendario')
-agregador_service = AgregadorHorariosService()
+agregador_service = ServicioPerezoso(AgregadorHorariosService)
 
 
 @calendario_bp.route('', methods=['GET'])
@@ -107,14 +107,18 @@ def forzar_actualizacion():
     Fuerza la actualización inmediata del calendario consolidado.
     
     Normalmente el calendario se actualiza automáticamente cada hora,
-    pero este endpoint permite forzar una actualización manual.
+    pero este endpoint permite forzar una actualización manual. La
+    actualización corre como tarea en segundo plano.
     
     Returns:
-        200: Calendario actualizado
+        202: Tarea de actualización encolada (o la que ya estaba en curso)
     """
-    agregador_service.actualizar_calendario()
+    from src.config.tareas import ejecutor_tareas
+    
+    tarea = ejecutor_tareas.encolar('actualizar_calendario', unica=True)
     
     return jsonify({
         'success': True,
-        'message': 'Calendario consolidado actualizado exitosamente'
-    }), 200
+        'message': 'Actualización del calendario consolidado iniciada',
+        'data': tarea.to_dict()
+    }), 202
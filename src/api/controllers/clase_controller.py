@@ -1,12 +1,17 @@
 """Controlador REST para Clases"""
-from datetime import time as dt_time
-from flask import Blueprint, request, jsonify
+from datetime import date, time as dt_time
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from src.services.clase_service import ClaseService
 from src.services.lista_espera_service import ListaEsperaService
-from src.api.controllers.base_controller import handle_errors, validate_json
+from src.services.reporte_asistencia_service import FORMATOS_REPORTE, ReporteAsistenciaService
+from src.services.agregador_horarios_service import invalidar_cache_calendario
+from src.services.catalogo_planes_service import invalidar_catalogo_planes
+from src.api.controllers.base_controller import handle_errors, validate_json, ServicioPerezoso
 from src.core.logging_config import get_logger
+from src.exceptions.base_exceptions import ValidationException
 from src.utils.enums import DiaSemana
 from src.repositories.base_repository import BaseRepository
+from src.repositories.clase_repository import ClaseRepository
 from src.models.entrenador import Entrenador
 from src.models.horario import Horario
 from src.config.database import db
@@ -14,8 +19,9 @@ from src.config.database import db
 logger = get_logger(__name__)
 
 clase_bp = Blueprint('clases', __name__, url_prefix='/api/clases')
-clase_service = ClaseService()
-lista_espera_service = ListaEsperaService()
+clase_service = ServicioPerezoso(ClaseService)
+lista_espera_service = ServicioPerezoso(ListaEsperaService)
+reporte_asistencia_service = ServicioPerezoso(ReporteAsistenciaService)
 
 
 @clase_bp.route('/entrenadores', methods=['GET'])
@@ -172,6 +178,7 @@ def listar_clases():
         dia: Filtrar por día de la semana (lunes, martes, etc.)
         con_cupo: true/false - solo clases con cupo disponible
         incluir_inactivas: true/false - incluir clases inactivas (solo admin)
+        plan_accesible: ID de plan - solo clases a las que ese plan da acceso
     
     Returns:
         200: Lista de clases
@@ -181,58 +188,59 @@ def listar_clases():
     incluir_inactivas = request.args.get('incluir_inactivas', 'false').lower() == 'true'
     
     # Filtrar por día si se especifica
+    dia_enum = None
     if dia:
         try:
             dia_enum = DiaSemana(dia.lower())
-            clases = clase_service.listar_clases_por_dia(dia_enum)
         except ValueError:
             return jsonify({
                 'success': False,
                 'message': f"Día inválido: {dia}. Use: lunes, martes, miercoles, jueves, viernes, sabado, domingo"
             }), 400
-    else:
-        if incluir_inactivas:
-            # Obtener todas las clases incluyendo inactivas
-            from src.models.clase import Clase
-            clases = Clase.query.all()
-        else:
-            clases = clase_service.listar_clases_activas()
-    
-    # Filtrar por cupo si se solicita
-    if solo_con_cupo:
-        clases = [c for c in clases if c.tiene_cupo_disponible()]
+    
+    # Los filtros se aplican en SQL y las relaciones vienen precargadas
+    clases = clase_service.filtrar_clases(
+        dia=dia_enum,
+        solo_con_cupo=solo_con_cupo,
+        incluir_inactivas=incluir_inactivas,
+        plan_accesible_id=request.args.get('plan_accesible', type=int)
+    )
     
     return jsonify({
         'success': True,
         'count': len(clases),
-        'data': [
-            {
-                'id': c.id,
-                'titulo': c.titulo,
-                'descripcion': c.descripcion,
-                'imagen_url': c.imagen_url,
-                'video_url': c.video_url,
-                'entrenador': c.entrenador.nombre_completo,
-                'dia': c.horario.dia_semana.value,
-                # convertir a string para JSON
-                'hora_inicio': c.horario.hora_inicio.strftime('%H:%M'),
-                # corregido: duracion_minutos es un método, debe invocarse
-                'duracion': c.horario.duracion_minutos(),
-                'cupo_maximo': c.cupo_maximo,
-                'cupos_disponibles': c.cupos_disponibles(),
-                'tiene_cupo': c.tiene_cupo_disponible(),
-                'activa': c.activa,
-                'plan_minimo': {
-                    'id': c.plan_minimo_requerido().id,
-                    'titulo': c.plan_minimo_requerido().titulo,
-                    'nivel': c.plan_minimo_requerido().nivel
-                } if c.plan_minimo_requerido() else None
-            }
-            for c in clases
-        ]
+        'data': [_serializar_clase_catalogo(c) for c in clases]
     }), 200
 
 
+def _serializar_clase_catalogo(c) -> dict:
+    """Serializa una clase para el catálogo (sin consultas adicionales)"""
+    plan_minimo = c.plan_minimo_requerido()
+    cupos_disponibles = c.cupos_disponibles()
+    return {
+        'id': c.id,
+        'titulo': c.titulo,
+        'descripcion': c.descripcion,
+        'imagen_url': c.imagen_url,
+        'video_url': c.video_url,
+        'entrenador': c.entrenador.nombre_completo,
+        'dia': c.horario.dia_semana.value,
+        # convertir a string para JSON
+        'hora_inicio': c.horario.hora_inicio.strftime('%H:%M'),
+        # corregido: duracion_minutos es un método, debe invocarse
+        'duracion': c.horario.duracion_minutos(),
+        'cupo_maximo': c.cupo_maximo,
+        'cupos_disponibles': cupos_disponibles,
+        'tiene_cupo': cupos_disponibles > 0,
+        'activa': c.activa,
+        'plan_minimo': {
+            'id': plan_minimo.id,
+            'titulo': plan_minimo.titulo,
+            'nivel': plan_minimo.nivel
+        } if plan_minimo else None
+    }
+
+
 @clase_bp.route('/plan/<int:plan_id>', methods=['GET'])
 @handle_errors
 def listar_clases_por_plan(plan_id: int):
@@ -277,7 +285,7 @@ def obtener_clase(clase_id: int):
         200: Información de la clase
         404: Clase no encontrada
     """
-    clase = clase_service.obtener_clase(clase_id)
+    clase = clase_service.obtener_clase_detalle(clase_id)
     
     if not clase:
         return jsonify({
@@ -309,7 +317,7 @@ def obtener_clase(clase_id: int):
             'cupos': {
                 'maximo': clase.cupo_maximo,
                 'disponibles': clase.cupos_disponibles(),
-                'ocupados': clase.cupo_maximo - clase.cupos_disponibles()
+                'ocupados': clase.cupos_ocupados
             },
             'planes_ids': [plan.id for plan in clase.planes]
         }
@@ -376,12 +384,15 @@ def crear_clase():
             plan = db.session.get(PlanMembresia, plan_id)
             if plan:
                 plan.agregar_clase(clase)
+        ClaseRepository().recalcular_nivel_minimo([clase.id])
         db.session.commit()
+        invalidar_catalogo_planes()
     
     # Habilitar lista de espera si se solicita
     if data.get('tiene_lista_espera', False):
         lista_espera_service.habilitar_lista_espera(clase)
     
+    invalidar_cache_calendario()
     logger.info(f"Clase creada: {clase.id} - {clase.titulo}")
     
     return jsonify({
@@ -478,9 +489,13 @@ def actualizar_clase(clase_id: int):
             plan = db.session.get(PlanMembresia, plan_id)
             if plan:
                 clase.planes.append(plan)
+        ClaseRepository().recalcular_nivel_minimo([clase.id])
     
     db.session.commit()
+    if 'planes_ids' in data:
+        invalidar_catalogo_planes()
     
+    invalidar_cache_calendario()
     logger.info(f"Clase actualizada: {clase.id} - {clase.titulo}")
     
     return jsonify({
@@ -520,6 +535,7 @@ def eliminar_clase(clase_id: int):
     from src.config.database import db
     db.session.commit()
     
+    invalidar_cache_calendario()
     logger.info(f"Clase desactivada: {clase.id} - {clase.titulo}")
     
     return jsonify({
@@ -628,25 +644,85 @@ def obtener_lista_espera(clase_id: int):
     }), 200
 
 
+def _respuesta_reporte(generador, formato: str, nombre: str) -> Response:
+    """Envía el reporte de asistencia a medida que se genera"""
+    mimetype, extension, _ = FORMATOS_REPORTE[formato]
+    return Response(
+        stream_with_context(generador),
+        mimetype=mimetype,
+        headers={"Content-disposition": f"attachment; filename={nombre}.{extension}"}
+    )
+
+
+def _parametros_reporte():
+    """
+    Lee formato y rango de fechas de la query string del reporte.
+    
+    Raises:
+        ValidationException: Si alguna fecha no tiene formato YYYY-MM-DD
+    """
+    fechas = {}
+    for campo in ('fecha_desde', 'fecha_hasta'):
+        valor = request.args.get(campo)
+        try:
+            fechas[campo] = date.fromisoformat(valor) if valor else None
+        except ValueError:
+            raise ValidationException(
+                f"Formato de {campo} inválido. Use YYYY-MM-DD", field=campo, value=valor
+            )
+    return request.args.get('formato', 'csv').lower(), fechas['fecha_desde'], fechas['fecha_hasta']
+
+
 @clase_bp.route('/<int:clase_id>/reporte-asistencia', methods=['GET'])
 @handle_errors
 def generar_reporte_asistencia(clase_id: int):
     """
-    Genera y descarga el reporte de asistencia de una clase.
+    Descarga el reporte de asistencia de una clase, enviado por partes.
+    
+    Query params:
+        formato: csv (por defecto), xlsx o parquet
+        fecha_desde, fecha_hasta: Rango de fechas de reserva (YYYY-MM-DD, inclusive)
     
     Args:
         clase_id: ID de la clase
         
     Returns:
-        200: Archivo CSV
-        404: Clase no encontrada
+        200: Archivo del reporte
+        400: Clase inexistente, formato o fechas inválidas
     """
-    csv_content = clase_service.generar_reporte_asistencia(clase_id)
-    
-    from flask import Response
-    return Response(
-        csv_content,
-        mimetype="text/csv",
-        headers={"Content-disposition": f"attachment; filename=asistencia_clase_{clase_id}.csv"}
+    formato, fecha_desde, fecha_hasta = _parametros_reporte()
+    generador = clase_service.generar_reporte_asistencia(
+        clase_id, formato, fecha_desde, fecha_hasta
     )
+    return _respuesta_reporte(generador, formato, f"asistencia_clase_{clase_id}")
 
+
+@clase_bp.route('/reporte-asistencia', methods=['GET'])
+@handle_errors
+def generar_reporte_asistencia_clases():
+    """
+    Descarga la asistencia de varias clases (o de todas) en un rango de
+    fechas, para auditorías periódicas. Incluye las columnas de clase.
+    
+    Query params:
+        clases: IDs separados por coma (opcional, por defecto todas)
+        formato: csv (por defecto), xlsx o parquet
+        fecha_desde, fecha_hasta: Rango de fechas de reserva (YYYY-MM-DD, inclusive)
+    
+    Returns:
+        200: Archivo del reporte
+        400: Clases inexistentes, formato o fechas inválidas
+    """
+    formato, fecha_desde, fecha_hasta = _parametros_reporte()
+    clases = request.args.get('clases')
+    clase_ids = None
+    if clases:
+        try:
+            clase_ids = [int(clase_id) for clase_id in clases.split(',') if clase_id.strip()]
+        except ValueError:
+            raise ValidationException(
+                "clases debe ser una lista de IDs separados por coma", field='clases', value=clases
+            )
+    
+    generador = reporte_asistencia_service.exportar(clase_ids, fecha_desde, fecha_hasta, formato)
+    return _respuesta_reporte(generador, formato, "asistencia_clases")
@@ -1,11 +1,33 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from src.services.estadisticas_service import EstadisticasService
+from src.api.controllers.base_controller import handle_errors, ServicioPerezoso
+from src.exceptions.base_exceptions import ValidationException
 
 estadisticas_bp = Blueprint('estadisticas', __name__, url_prefix='/api/estadisticas')
-service = EstadisticasService()
+service = ServicioPerezoso(EstadisticasService)
 
 @estadisticas_bp.route('/dashboard', methods=['GET'])
 def get_dashboard():
     """Obtiene estadísticas generales para el dashboard"""
     stats = service.get_dashboard_stats()
     return jsonify(stats)
+
+@estadisticas_bp.route('/historico', methods=['GET'])
+@handle_errors
+def get_historico():
+    """
+    Obtiene los snapshots históricos de estadísticas para gráficos de tendencia.
+    
+    Query params:
+        dias: Cantidad de días hacia atrás (default: 30, max: 365)
+    """
+    dias = request.args.get('dias', 30, type=int)
+    if dias < 1 or dias > 365:
+        raise ValidationException("dias debe estar entre 1 y 365", field="dias")
+    
+    snapshots = service.get_historico(dias)
+    return jsonify({
+        'success': True,
+        'count': len(snapshots),
+        'data': snapshots
+    }), 200
@@ -1,13 +1,13 @@
 """Controlador REST para Pagos"""
 from flask import Blueprint, request, jsonify
 from src.services.pago_service import PagoService
-from src.api.controllers.base_controller import handle_errors, validate_json
+from src.api.controllers.base_controller import handle_errors, validate_json, ServicioPerezoso
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 pago_bp = Blueprint('pagos', __name__, url_prefix='/api/pagos')
-pago_service = PagoService()
+pago_service = ServicioPerezoso(PagoService)
 
 
 @pago_bp.route('', methods=['POST'])
@@ -61,24 +61,22 @@ def verificar_pagos_pendientes():
     """
     Verifica el estado de todos los pagos pendientes con la pasarela.
     
-    Endpoint administrativo para ejecutar la verificación diaria.
+    Endpoint administrativo para ejecutar la verificación diaria. La
+    verificación corre como tarea en segundo plano; el resultado se
+    consulta en GET /api/tareas/<id>.
     
     Returns:
-        200: Resultado de la verificación
+        202: Tarea de verificación encolada (o la que ya estaba en curso)
     """
-    resultado = pago_service.verificar_pagos_pendientes()
+    from src.config.tareas import ejecutor_tareas
     
-    status_code = 200 if resultado['success'] else 500
+    tarea = ejecutor_tareas.encolar('verificar_pagos_pendientes', unica=True)
     
     return jsonify({
-        'success': resultado['success'],
-        'message': resultado['message'],
-        'data': {
-            'verificados': resultado['verificados'],
-            'aprobados': resultado['aprobados'],
-            'rechazados': resultado['rechazados']
-        }
-    }), status_code
+        'success': True,
+        'message': 'Verificación de pagos pendientes iniciada',
+        'data': tarea.to_dict()
+    }), 202
 
 
 @pago_bp.route('/socio/<int:socio_id>', methods=['GET'])
@@ -1,16 +1,18 @@
 """Controlador REST para Planes de Membresía"""
 from flask import Blueprint, request, jsonify
+from src.repositories.clase_repository import ClaseRepository
 from src.services.plan_service import PlanService
 from src.services.clase_service import ClaseService
-from src.api.controllers.base_controller import handle_errors, validate_json
+from src.services.catalogo_planes_service import invalidar_catalogo_planes
+from src.api.controllers.base_controller import handle_errors, validate_json, ServicioPerezoso
 from src.core.logging_config import get_logger
 from src.config.database import db
 
 logger = get_logger(__name__)
 
 plan_bp = Blueprint('planes', __name__, url_prefix='/api/planes')
-plan_service = PlanService()
-clase_service = ClaseService()
+plan_service = ServicioPerezoso(PlanService)
+clase_service = ServicioPerezoso(ClaseService)
 
 
 @plan_bp.route('', methods=['GET'])
@@ -179,10 +181,12 @@ def actualizar_plan(plan_id: int):
                 'message': 'El nivel debe ser mayor o igual a 1'
             }), 400
         plan.nivel = data['nivel']
+        ClaseRepository().recalcular_nivel_minimo([clase.id for clase in plan.clases])
     if 'activo' in data:
         plan.activo = bool(data['activo'])
     
     db.session.commit()
+    invalidar_catalogo_planes()
     
     logger.info(f"Plan actualizado: {plan.id} - {plan.titulo}")
     
@@ -220,8 +224,7 @@ def eliminar_plan(plan_id: int):
             'message': f'Plan con ID {plan_id} no encontrado'
         }), 404
     
-    plan.activo = False
-    db.session.commit()
+    plan_service.desactivar_plan(plan_id)
     
     logger.info(f"Plan desactivado: {plan.id} - {plan.titulo}")
     
@@ -266,8 +269,7 @@ def agregar_clase_a_plan(plan_id: int, clase_id: int):
             'message': 'La clase ya está incluida en el plan'
         }), 400
     
-    plan.agregar_clase(clase)
-    db.session.commit()
+    plan_service.agregar_clase_a_plan(plan_id, clase)
     
     logger.info(f"Clase {clase_id} agregada a plan {plan_id}")
     
@@ -312,8 +314,7 @@ def quitar_clase_de_plan(plan_id: int, clase_id: int):
             'message': 'La clase no está incluida en el plan'
         }), 400
     
-    plan.quitar_clase(clase)
-    db.session.commit()
+    plan_service.quitar_clase_de_plan(plan_id, clase)
     
     logger.info(f"Clase {clase_id} quitada de plan {plan_id}")
     
@@ -1,15 +1,19 @@
-from flask import Blueprint, request, jsonify
+import json
+from datetime import date, datetime, time, timedelta
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from src.repositories.reserva_repository import ReservaRepository
 from src.services.reserva_service import ReservaService
 from src.services.lista_espera_service import ListaEsperaService
-from src.api.controllers.base_controller import handle_errors, validate_json
+from src.api.controllers.base_controller import handle_errors, paginate, validate_json, ServicioPerezoso
 from src.core.logging_config import get_logger
 from src.exceptions.base_exceptions import ValidationException
 
 logger = get_logger(__name__)
 
 reserva_bp = Blueprint('reservas', __name__, url_prefix='/api/reservas')
-reserva_service = ReservaService()
-lista_espera_service = ListaEsperaService()
+reserva_repository = ReservaRepository()
+reserva_service = ServicioPerezoso(ReservaService)
+lista_espera_service = ServicioPerezoso(ListaEsperaService)
 
 
 @reserva_bp.route('/espera', methods=['POST'])
@@ -44,45 +48,100 @@ def unirse_lista_espera():
         return jsonify({'success': False, 'message': str(e)}), 400
 
 
+def _serializar_reserva(id, socio_id, socio_nombre, clase_id, clase_titulo,
+                        fecha_reserva, confirmada, fecha_cancelacion) -> dict:
+    """Representación JSON de una reserva en el listado general"""
+    return {
+        'id': id,
+        'socio_id': socio_id,
+        'socio_nombre': socio_nombre,
+        'clase_id': clase_id,
+        'clase_titulo': clase_titulo,
+        'fecha_reserva': fecha_reserva.isoformat(),
+        'confirmada': confirmada,
+        'fecha_cancelacion': fecha_cancelacion.isoformat() if fecha_cancelacion else None
+    }
+
+
+def _filtros_listado() -> dict:
+    """
+    Lee los filtros del listado de reservas de la query string.
+    
+    Raises:
+        ValidationException: Si alguna fecha no tiene formato YYYY-MM-DD
+    """
+    fechas = {}
+    for campo in ('fecha_desde', 'fecha_hasta'):
+        valor = request.args.get(campo)
+        try:
+            fechas[campo] = date.fromisoformat(valor) if valor else None
+        except ValueError:
+            raise ValidationException(
+                f"Formato de {campo} inválido. Use YYYY-MM-DD", field=campo, value=valor
+            )
+    hasta = fechas['fecha_hasta']
+    return {
+        'activas': request.args.get('activas', '').lower() == 'true',
+        'clase_id': request.args.get('clase_id', type=int),
+        'socio_id': request.args.get('socio_id', type=int),
+        'desde': datetime.combine(fechas['fecha_desde'], time.min) if fechas['fecha_desde'] else None,
+        'hasta': datetime.combine(hasta + timedelta(days=1), time.min) if hasta else None,
+    }
+
+
 @reserva_bp.route('', methods=['GET'])
 @handle_errors
-def listar_reservas():
+@paginate(default_page_size=50, max_page_size=500)
+def listar_reservas(page: int, page_size: int):
     """
-    Lista todas las reservas del sistema.
+    Lista las reservas del sistema (paginado), filtradas en la base.
     
     Query params:
         activas: true/false (default: all)
+        clase_id: Filtrar por clase
+        socio_id: Filtrar por socio
+        fecha_desde, fecha_hasta: Rango de fechas de reserva (YYYY-MM-DD, inclusive)
+        page: Número de página (default: 1)
+        page_size: Tamaño de página (default: 50, max: 500)
+        cursor: ID de la última reserva recibida (paginación keyset, ignora page)
+        incluir_total: true/false - informar el total de reservas (default: false)
+        formato: ndjson - exporta todas las reservas del filtro, una por línea,
+            enviadas a medida que se leen (ignora la paginación)
     
     Returns:
         200: Lista de reservas
     """
-    solo_activas = request.args.get('activas', '').lower() == 'true'
-    
-    # Obtener todas las reservas
-    from src.repositories.base_repository import BaseRepository
-    from src.models.reserva import Reserva
+    filtros = _filtros_listado()
     
-    repo = BaseRepository(Reserva)
-    reservas = repo.get_all()
+    if request.args.get('formato', '').lower() == 'ndjson':
+        def generar():
+            for fila in reserva_repository.iterar_listado(**filtros):
+                yield json.dumps(_serializar_reserva(
+                    fila.id, fila.socio_id, f"{fila.socio_nombre} {fila.socio_apellido}",
+                    fila.clase_id, fila.clase_titulo, fila.fecha_reserva,
+                    fila.confirmada, fila.fecha_cancelacion
+                )) + '\n'
+        
+        return Response(stream_with_context(generar()), mimetype='application/x-ndjson')
     
-    # Filtrar por activas si se solicita
-    if solo_activas:
-        reservas = [r for r in reservas if r.esta_activa()]
+    resultado = reserva_repository.listar_paginado(
+        page=page,
+        page_size=page_size,
+        cursor=request.args.get('cursor', type=int),
+        incluir_total=request.args.get('incluir_total', 'false').lower() == 'true',
+        **filtros
+    )
+    reservas = resultado.items
     
     return jsonify({
         'success': True,
         'count': len(reservas),
+        'pagination': resultado.pagination.to_dict(),
         'data': [
-            {
-                'id': r.id,
-                'socio_id': r.socio_id,
-                'socio_nombre': r.socio.nombre_completo,
-                'clase_id': r.clase_id,
-                'clase_titulo': r.clase.titulo,
-                'fecha_reserva': r.fecha_reserva.isoformat(),
-                'confirmada': r.confirmada,
-                'fecha_cancelacion': r.fecha_cancelacion.isoformat() if r.fecha_cancelacion else None
-            }
+            _serializar_reserva(
+                r.id, r.socio_id, r.socio.nombre_completo, r.clase_id, r.clase.titulo,
+                r.fecha_reserva, r.confirmada, r.fecha_cancelacion
+            )
             for r in reservas
         ]
     }), 200
@@ -2,7 +2,8 @@
 from flask import Blueprint, request, jsonify
 from src.repositories.socio_repository import SocioRepository
 from src.services.socio_service import SocioService
-from src.api.controllers.base_controller import handle_errors, paginate
+from src.services.csv_importer_service import CSVImporterService
+from src.api.controllers.base_controller import handle_errors, paginate, ServicioPerezoso
 from src.core.logging_config import get_logger
 from src.exceptions.base_exceptions import NotFoundException
 
@@ -10,10 +11,8 @@ logger = get_logger(__name__)
 
 socio_bp = Blueprint('socios', __name__, url_prefix='/api/socios')
 socio_repository = SocioRepository()
-socio_service = SocioService()
-csv_importer = None # Lazy import to avoid circular dependencies if any, or just init here.
-from src.services.csv_importer_service import CSVImporterService
-csv_importer = CSVImporterService()
+socio_service = ServicioPerezoso(SocioService)
+csv_importer = ServicioPerezoso(CSVImporterService)
 
 
 @socio_bp.route('', methods=['GET'])
@@ -27,26 +26,39 @@ def listar_socios(page: int, page_size: int):
         page: Número de página (default: 1)
         page_size: Tamaño de página (default: 20, max: 100)
         estado: Filtrar por estado de membresía
+        cursor: ID del último socio recibido (paginación keyset, ignora page)
+        incluir_total: true/false - informar el total de socios (default: false)
     
     Returns:
         200: Lista de socios
     """
-    # TODO: Implementar paginación en repository
-    socios = socio_repository.get_all()
+    from src.utils.enums import EstadoMembresia
     
     # Filtrar por estado si se especifica
+    estado_enum = None
     estado_filtro = request.args.get('estado')
     if estado_filtro:
-        from src.utils.enums import EstadoMembresia
         try:
             estado_enum = EstadoMembresia(estado_filtro)
-            socios = [s for s in socios if s.estado_membresia == estado_enum]
         except ValueError:
             pass  # Ignorar filtro inválido
     
+    cursor = request.args.get('cursor', type=int)
+    incluir_total = request.args.get('incluir_total', 'false').lower() == 'true'
+    
+    resultado = socio_repository.listar_paginado(
+        page=page,
+        page_size=page_size,
+        estado=estado_enum,
+        cursor=cursor,
+        incluir_total=incluir_total
+    )
+    socios = resultado.items
+    
     return jsonify({
         'success': True,
         'count': len(socios),
+        'pagination': resultado.pagination.to_dict(),
         'data': [
             {
                 'id': s.id,
@@ -210,8 +222,7 @@ def actualizar_socio(socio_id: int):
                 'message': 'Estado de membresía inválido'
             }), 400
     
-    from src.config.database import db
-    db.session.commit()
+    socio = socio_service.actualizar_membresia(socio)
     
     logger.info(f"Socio {socio_id} actualizado")
     
@@ -240,29 +251,7 @@ def eliminar_socio(socio_id: int):
         200: Socio eliminado exitosamente
         404: Socio no encontrado
     """
-    socio = socio_repository.get_by_id(socio_id)
-    
-    if not socio:
-        raise NotFoundException('Socio', socio_id)
-    
-    nombre = socio.nombre_completo
-    
-    # Eliminar reservas asociadas primero para evitar constraint errors
-    from src.config.database import db
-    for reserva in socio.reservas:
-        db.session.delete(reserva)
-    
-    # Eliminar solicitudes de baja asociadas
-    for solicitud in socio.solicitudes_baja:
-        db.session.delete(solicitud)
-    
-    # Eliminar pagos asociados
-    for pago in socio.pagos:
-        db.session.delete(pago)
-    
-    # Ahora eliminar el socio
-    db.session.delete(socio)
-    db.session.commit()
+    nombre = socio_service.eliminar_socio(socio_id)
     
     logger.info(f"Socio {socio_id} ({nombre}) eliminado")
     
@@ -276,6 +265,17 @@ def eliminar_socio(socio_id: int):
 def importar_csv():
     """
     Importa socios desde un archivo CSV.
+    
+    El archivo se procesa de a lotes, sin cargarlo entero en memoria.
+    
+    Query params:
+        en_segundo_plano: true/false - si es true, la importación corre como
+            tarea en segundo plano y se responde 202 con la tarea, cuyo
+            progreso se consulta en GET /api/tareas/<id> (default: true)
+    
+    Returns:
+        200: Estadísticas de la importación (en_segundo_plano=false)
+        202: Tarea de importación encolada
     """
     if 'archivo' not in request.files:
         return jsonify({'success': False, 'message': 'No se seleccionó ningún archivo'}), 400
@@ -287,35 +287,41 @@ def importar_csv():
         
     if not archivo.filename.endswith('.csv'):
         return jsonify({'success': False, 'message': 'El archivo debe ser un CSV'}), 400
-
-    import os
-    import tempfile
     
-    # Guardar archivo temporalmente
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as temp_file:
-        archivo.save(temp_file.name)
-        temp_path = temp_file.name
+    if request.args.get('en_segundo_plano', 'true').lower() == 'true':
+        import os
+        import tempfile
+        from src.config.settings import settings
+        from src.config.tareas import ejecutor_tareas
         
-    try:
-        resultado = csv_importer.importar_socios(temp_path)
+        # El upload deja de existir al terminar el request: se copia por
+        # bloques a un archivo que la importación elimina al terminar. Va al
+        # directorio compartido de las tareas porque, si este proceso muere,
+        # el líder puede reencolarla y la ejecuta otro nodo
+        directorio = settings.tareas.directorio_archivos
+        os.makedirs(directorio, exist_ok=True)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.csv', dir=directorio) as temp_file:
+            archivo.save(temp_file)
         
-        # Eliminar archivo temporal
-        os.unlink(temp_path)
+        tarea = ejecutor_tareas.encolar('importar_socios', {'ruta': temp_file.name})
         
-        if resultado['errores']:
-            return jsonify({
-                'success': True, # Partial success potentially
-                'message': f"Procesado con advertencias: {len(resultado['errores'])} errores.",
-                'data': resultado
-            }), 200
-        else:
-             return jsonify({
-                'success': True,
-                'message': 'Importación completada exitosamente',
-                'data': resultado
-            }), 200
-            
-    except Exception as e:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-        raise e
\ No newline at end of file
+        return jsonify({
+            'success': True,
+            'message': 'Importación iniciada',
+            'data': tarea.to_dict()
+        }), 202
+    
+    resultado = csv_importer.importar_socios(archivo.stream)
+    
+    if resultado['errores']:
+        return jsonify({
+            'success': True, # Partial success potentially
+            'message': f"Procesado con advertencias: {len(resultado['errores'])} errores.",
+            'data': resultado
+        }), 200
+    else:
+         return jsonify({
+            'success': True,
+            'message': 'Importación completada exitosamente',
+            'data': resultado
+        }), 200
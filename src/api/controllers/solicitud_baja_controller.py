@@ -1,13 +1,13 @@
 """Controlador REST para Solicitudes de Baja"""
 from flask import Blueprint, request, jsonify
 from src.services.solicitud_baja_service import SolicitudBajaService
-from src.api.controllers.base_controller import handle_errors, validate_json
+from src.api.controllers.base_controller import handle_errors, validate_json, ServicioPerezoso
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 solicitud_bp = Blueprint('solicitudes', __name__, url_prefix='/api/solicitudes')
-solicitud_service = SolicitudBajaService()
+solicitud_service = ServicioPerezoso(SolicitudBajaService)
 
 
 @solicitud_bp.route('', methods=['GET'])
@@ -0,0 +1,75 @@
+"""Controlador REST para Tareas en segundo plano"""
+from flask import Blueprint, request, jsonify
+from src.repositories.tarea_repository import TareaRepository
+from src.api.controllers.base_controller import handle_errors
+from src.core.logging_config import get_logger
+from src.exceptions.base_exceptions import NotFoundException, ValidationException
+from src.utils.enums import EstadoTarea
+
+logger = get_logger(__name__)
+
+tarea_bp = Blueprint('tareas', __name__, url_prefix='/api/tareas')
+tarea_repository = TareaRepository()
+
+
+@tarea_bp.route('', methods=['GET'])
+@handle_errors
+def listar_tareas():
+    """
+    Lista las tareas en segundo plano más recientes.
+    
+    Query params:
+        tipo: Filtrar por tipo de tarea
+        estado: Filtrar por estado (pendiente, en_curso, completada, fallida)
+        limite: Cantidad máxima de tareas (default: 50, max: 100)
+    
+    Returns:
+        200: Lista de tareas
+    """
+    estado = None
+    estado_filtro = request.args.get('estado')
+    if estado_filtro:
+        try:
+            estado = EstadoTarea(estado_filtro)
+        except ValueError:
+            raise ValidationException(f"Estado de tarea inválido: {estado_filtro}",
+                                      field='estado', value=estado_filtro)
+    
+    limite = request.args.get('limite', 50, type=int)
+    if limite < 1 or limite > 100:
+        raise ValidationException("limite debe estar entre 1 y 100", field="limite")
+    
+    tareas = tarea_repository.find_recientes(
+        tipo=request.args.get('tipo'),
+        estado=estado,
+        limite=limite
+    )
+    
+    return jsonify({
+        'success': True,
+        'count': len(tareas),
+        'data': [t.to_dict() for t in tareas]
+    }), 200
+
+
+@tarea_bp.route('/<tarea_id>', methods=['GET'])
+@handle_errors
+def obtener_tarea(tarea_id: str):
+    """
+    Obtiene el estado, progreso y resultado de una tarea.
+    
+    Args:
+        tarea_id: ID de la tarea
+    
+    Returns:
+        200: Tarea
+    """
+    tarea = tarea_repository.get_actualizada(tarea_id)
+    
+    if not tarea:
+        raise NotFoundException('Tarea', tarea_id)
+    
+    return jsonify({
+        'success': True,
+        'data': tarea.to_dict()
+    }), 200
@@ -1,6 +1,19 @@
 """Configuración de la base de datos"""
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Tuple
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import (Column, DateTime, Integer, String, Table, delete, event, insert, inspect,
+                        select, text, update)
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import QueuePool
+from src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -11,8 +24,402 @@ class Base(DeclarativeBase):
 db = SQLAlchemy(model_class=Base)
 
 
+# Huella del esquema con el que se creó o migró la base por última vez
+esquema_version = Table(
+    'esquema_version', db.metadata,
+    Column('version', String(64), primary_key=True)
+)
+
+# Lease del líder de cada scheduler: un solo proceso ejecuta las tareas programadas
+scheduler_lider = Table(
+    'scheduler_lider', db.metadata,
+    Column('nombre', String(64), primary_key=True),
+    Column('nodo', String(255), nullable=False),
+    Column('expira', DateTime, nullable=False),
+    Column('renovado', DateTime, nullable=False)
+)
+
+# Versión de cada catálogo cacheado en memoria (ej. planes): los workers
+# comparan la suya con esta para saber si deben recargar el catálogo
+catalogo_version = Table(
+    'catalogo_version', db.metadata,
+    Column('nombre', String(64), primary_key=True),
+    Column('version', Integer, nullable=False)
+)
+
+
+# Columnas agregadas a tablas ya existentes: (tabla, columna, definición DDL).
+# db.create_all() no modifica tablas existentes, por eso se agregan aquí.
+COLUMNAS_AGREGADAS: List[Tuple[str, str, str]] = [
+    ('clases', 'cupos_ocupados', 'INTEGER NOT NULL DEFAULT 0'),
+    ('clases', 'ultima_posicion_espera', 'INTEGER NOT NULL DEFAULT 0'),
+    ('clases', 'nivel_minimo', 'INTEGER'),
+    ('tareas', 'nodo', 'VARCHAR(255)'),
+    ('tareas', 'latido_en', 'DATETIME'),
+]
+
+
+class PoolConMetricas(QueuePool):
+    """
+    QueuePool que además cuenta los checkouts que tuvieron que esperar.
+
+    Un checkout espera cuando no hay conexiones libres y ya se alcanzó el
+    máximo de overflow; si esto pasa seguido, el pool es chico para la
+    cantidad de hilos que usan la base (Waitress, tareas, scheduler).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_metricas = threading.Lock()
+        self.esperas = 0
+        self.segundos_esperando = 0.0
+
+    def _do_get(self):
+        saturado = (self._max_overflow > -1 and self.checkedin() == 0
+                    and self.overflow() >= self._max_overflow)
+        if not saturado:
+            return super()._do_get()
+
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            with self._lock_metricas:
+                self.esperas += 1
+                self.segundos_esperando += time.perf_counter() - inicio
+
+
+def _es_sqlite_en_memoria(url) -> bool:
+    """Indica si la URL apunta a una base SQLite en memoria"""
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def opciones_engine(database_url: str, config) -> Dict[str, Any]:
+    """
+    Arma las opciones de create_engine (SQLALCHEMY_ENGINE_OPTIONS).
+
+    Para bases con servidor (ej. Postgres) se aplican tamaño, overflow,
+    timeout, reciclado y pre-ping del pool. Para SQLite en archivo se
+    aplican tamaño, overflow y timeout (reciclado y pre-ping no tienen
+    sentido sin red), y el timeout del driver para esperar locks. SQLite
+    en memoria conserva el pool que elige Flask-SQLAlchemy.
+
+    Args:
+        database_url: URL de la base de datos
+        config: DatabaseConfig con los parámetros del pool
+
+    Returns:
+        Diccionario de opciones para el engine
+    """
+    url = make_url(database_url)
+    if _es_sqlite_en_memoria(url):
+        return {}
+
+    opciones = {
+        'poolclass': PoolConMetricas,
+        'pool_size': config.pool_size,
+        'max_overflow': config.max_overflow,
+        'pool_timeout': config.pool_timeout,
+    }
+    if url.get_backend_name() == 'sqlite':
+        opciones['connect_args'] = {'timeout': config.sqlite_busy_timeout_ms / 1000}
+    else:
+        opciones['pool_recycle'] = config.pool_recycle
+        opciones['pool_pre_ping'] = config.pool_pre_ping
+    return opciones
+
+
+def configurar_pragmas_sqlite(engine: Engine, config) -> None:
+    """
+    Aplica los PRAGMAs de rendimiento a cada conexión SQLite nueva.
+
+    - journal_mode=WAL: los lectores no bloquean al escritor ni viceversa.
+    - synchronous=NORMAL: seguro con WAL y sin un fsync por commit.
+    - busy_timeout: espera el lock de escritura en lugar de fallar.
+    - mmap_size y cache_size: menos lecturas al disco.
+
+    No hace nada si el engine no es SQLite en archivo.
+
+    Args:
+        engine: Engine de SQLAlchemy
+        config: DatabaseConfig con los valores de los PRAGMAs
+    """
+    if engine.dialect.name != 'sqlite' or _es_sqlite_en_memoria(engine.url):
+        return
+
+    pragmas = [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}',
+        f'PRAGMA mmap_size={int(config.sqlite_mmap_mb) * 1024 * 1024}',
+        # Negativo: tamaño en KiB en lugar de páginas
+        f'PRAGMA cache_size={-int(config.sqlite_cache_mb) * 1024}',
+    ]
+
+    @event.listens_for(engine, 'connect')
+    def aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def estado_pool(engine: Engine = None) -> Dict[str, Any]:
+    """
+    Informa el estado del pool de conexiones.
+
+    Args:
+        engine: Engine a inspeccionar (por defecto, el de la aplicación)
+
+    Returns:
+        Diccionario con la clase del pool y, si es un QueuePool, el tamaño,
+        las conexiones en uso y libres, el overflow actual y las esperas
+    """
+    pool = (engine or db.engine).pool
+    estado = {'clase': type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        estado.update({
+            'tamano': pool.size(),
+            'en_uso': pool.checkedout(),
+            'libres': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+            'timeout_segundos': pool.timeout(),
+        })
+    if isinstance(pool, PoolConMetricas):
+        estado['esperas'] = pool.esperas
+        estado['espera_total_ms'] = round(pool.segundos_esperando * 1000, 2)
+
+    return estado
+
+
+def leer_version_catalogo(conexion, nombre: str) -> int:
+    """
+    Lee la versión publicada de un catálogo cacheado.
+
+    Args:
+        conexion: Sesión o conexión con la que se consulta
+        nombre: Nombre del catálogo en catalogo_version
+
+    Returns:
+        La versión, o 0 si el catálogo nunca se invalidó
+    """
+    version = conexion.execute(
+        select(catalogo_version.c.version).where(catalogo_version.c.nombre == nombre)
+    ).scalar()
+    return version or 0
+
+
+def version_catalogo(nombre: str) -> int:
+    """
+    Lee la versión publicada de un catálogo con una conexión propia.
+
+    Args:
+        nombre: Nombre del catálogo en catalogo_version
+
+    Returns:
+        La versión, o 0 si el catálogo nunca se invalidó
+    """
+    with db.engine.connect() as conexion:
+        return leer_version_catalogo(conexion, nombre)
+
+
+def incrementar_version_catalogo(nombre: str) -> None:
+    """
+    Incrementa la versión de un catálogo para que los demás workers
+    descarten su copia.
+
+    Usa transacciones propias: se llama después de confirmar el cambio
+    que invalida el catálogo, fuera de la transacción del request.
+
+    Args:
+        nombre: Nombre del catálogo en catalogo_version
+    """
+    incrementar = (update(catalogo_version)
+                   .where(catalogo_version.c.nombre == nombre)
+                   .values(version=catalogo_version.c.version + 1))
+    with db.engine.begin() as conexion:
+        actualizadas = conexion.execute(incrementar).rowcount
+    if not actualizadas:
+        try:
+            with db.engine.begin() as conexion:
+                conexion.execute(insert(catalogo_version).values(nombre=nombre, version=1))
+        except IntegrityError:
+            # Otro worker creó la fila al mismo tiempo
+            with db.engine.begin() as conexion:
+                conexion.execute(incrementar)
+
+
 def init_db(app):
-    """Inicializa la base de datos con la aplicación Flask"""
+    """
+    Inicializa la base de datos con la aplicación Flask.
+
+    Si la aplicación no define SQLALCHEMY_ENGINE_OPTIONS, se arman a partir
+    de la configuración de la base de datos (ver opciones_engine). Las
+    tablas se crean y migran solo si la versión de esquema registrada en
+    la base no coincide con la de los modelos.
+    """
+    from src.config.settings import settings
+
+    app.config.setdefault(
+        'SQLALCHEMY_ENGINE_OPTIONS',
+        opciones_engine(app.config['SQLALCHEMY_DATABASE_URI'], settings.database)
+    )
     db.init_app(app)
     with app.app_context():
-        db.create_all()
+        configurar_pragmas_sqlite(db.engine, settings.database)
+        version = version_esquema()
+        if esquema_al_dia(version):
+            logger.debug(f"Esquema al día ({version[:12]}), se omite create_all")
+            return
+        actualizar_esquema(version)
+
+
+def version_esquema() -> str:
+    """
+    Calcula la huella del esquema definido por los modelos.
+
+    Es el SHA-256 del DDL (tablas e índices) compilado para el dialecto de
+    la base, por lo que cambia con cualquier modelo, columna o índice nuevo.
+
+    Returns:
+        Huella en hexadecimal
+    """
+    import src.models  # noqa: F401 - registra todas las tablas en la metadata
+
+    dialecto = db.engine.dialect
+    ddl = []
+    for tabla in db.metadata.sorted_tables:
+        ddl.append(str(CreateTable(tabla).compile(dialect=dialecto)))
+        ddl.extend(str(CreateIndex(indice).compile(dialect=dialecto))
+                   for indice in sorted(tabla.indexes, key=lambda i: i.name))
+    return hashlib.sha256('\n'.join(ddl).encode('utf-8')).hexdigest()
+
+
+def esquema_al_dia(version: str) -> bool:
+    """
+    Indica si la base ya fue creada o migrada con la versión de esquema dada.
+
+    Args:
+        version: Huella calculada con version_esquema()
+
+    Returns:
+        True si la versión registrada coincide, False si no coincide o si
+        la base todavía no registra versión
+    """
+    try:
+        with db.engine.connect() as conexion:
+            return conexion.execute(select(esquema_version.c.version)).scalar() == version
+    except SQLAlchemyError:
+        return False
+
+
+def actualizar_esquema(version: str = None) -> List[str]:
+    """
+    Crea las tablas faltantes, aplica las migraciones y registra la versión.
+
+    Args:
+        version: Huella del esquema (por defecto se calcula)
+
+    Returns:
+        Cambios aplicados por migrar_esquema()
+    """
+    version = version or version_esquema()
+    db.create_all()
+    cambios = migrar_esquema()
+    db.session.execute(delete(esquema_version))
+    db.session.execute(insert(esquema_version).values(version=version))
+    db.session.commit()
+    logger.info(f"Esquema de base de datos actualizado a la versión {version[:12]}")
+    return cambios
+
+
+def migrar_esquema() -> List[str]:
+    """
+    Agrega a una base de datos existente las columnas e índices que aún no tiene.
+
+    Si se agrega el contador de cupos ocupados, se reconstruye a partir
+    de las reservas existentes; el de posiciones de lista de espera, a
+    partir de las inscripciones; el nivel mínimo de cada clase, a partir
+    de sus planes.
+
+    Returns:
+        Lista de columnas agregadas con formato 'tabla.columna', seguida
+        de los índices creados (ver crear_indices_faltantes)
+    """
+    inspector = inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    agregadas = []
+
+    for tabla, columna, ddl in COLUMNAS_AGREGADAS:
+        if tabla not in tablas:
+            continue
+        existentes = {c['name'] for c in inspector.get_columns(tabla)}
+        if columna not in existentes:
+            db.session.execute(text(f'ALTER TABLE {tabla} ADD COLUMN {columna} {ddl}'))
+            agregadas.append(f'{tabla}.{columna}')
+
+    if agregadas:
+        db.session.commit()
+
+    if 'clases.cupos_ocupados' in agregadas:
+        from src.repositories.clase_repository import ClaseRepository
+        ClaseRepository().recalcular_cupos_ocupados()
+
+    if 'clases.ultima_posicion_espera' in agregadas:
+        from src.repositories.clase_repository import ClaseRepository
+        ClaseRepository().recalcular_ultima_posicion_espera()
+
+    if 'clases.nivel_minimo' in agregadas:
+        from src.repositories.clase_repository import ClaseRepository
+        ClaseRepository().recalcular_nivel_minimo()
+        db.session.commit()
+
+    return agregadas + crear_indices_faltantes()
+
+
+def crear_indices_faltantes() -> List[str]:
+    """
+    Crea en una base existente los índices de los modelos que aún no tiene.
+
+    db.create_all() no agrega índices a tablas que ya existen. Si falta el
+    índice único de reservas activas, antes de crearlo se cancelan las
+    reservas activas duplicadas (se conserva la más antigua) y se
+    reconstruye el contador de cupos ocupados.
+
+    Returns:
+        Lista de índices creados
+    """
+    from src.models.reserva import INDICE_RESERVA_ACTIVA
+
+    inspector = inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    creados = []
+    duplicadas = 0
+
+    for tabla in db.metadata.sorted_tables:
+        if tabla.name not in tablas:
+            continue
+        existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        for indice in sorted(tabla.indexes, key=lambda i: i.name):
+            if indice.name in existentes:
+                continue
+            if indice.name == INDICE_RESERVA_ACTIVA:
+                from src.repositories.reserva_repository import ReservaRepository
+                duplicadas = ReservaRepository().cancelar_activas_duplicadas()
+            indice.create(db.session.connection())
+            creados.append(indice.name)
+
+    if creados:
+        db.session.commit()
+
+    if duplicadas:
+        from src.repositories.clase_repository import ClaseRepository
+        logger.warning(
+            f"Se cancelaron {duplicadas} reservas activas duplicadas para crear {INDICE_RESERVA_ACTIVA}"
+        )
+        ClaseRepository().recalcular_cupos_ocupados()
+
+    return creados
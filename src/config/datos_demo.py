@@ -0,0 +1,150 @@
+"""Datos de ejemplo para desarrollo y demos (se cargan con `python -m src.main init-db`)"""
+from datetime import time
+from typing import Dict
+from src.config.database import db
+from src.core.logging_config import get_logger
+from src.utils.enums import DiaSemana
+
+logger = get_logger(__name__)
+
+
+# Imagen y video de las clases de ejemplo, por título
+MULTIMEDIA_CLASES: Dict[str, Dict[str, str]] = {
+    "Spinning Intenso": {
+        "imagen_url": "https://images.unsplash.com/photo-1534438327276-14e5300c3a48?q=80&w=1470&auto=format&fit=crop",
+        "video_url": "https://www.youtube.com/watch?v=oAPCPjnU1wA"
+    },
+    "Yoga Matutino": {
+        "imagen_url": "https://images.unsplash.com/photo-1599901860904-17e6ed7083a0?q=80&w=1469&auto=format&fit=crop",
+        "video_url": "https://www.youtube.com/watch?v=v7AYKMP6rOE"
+    },
+    "CrossFit Avanzado": {
+        "imagen_url": "https://images.unsplash.com/photo-1534367507873-d2d7e24c797f?q=80&w=1470&auto=format&fit=crop"
+    },
+    "Zumba Fitness": {
+        "imagen_url": "https://images.unsplash.com/photo-1518611012118-696072aa579a?q=80&w=1470&auto=format&fit=crop"
+    },
+    "Funcional TRX": {
+        "imagen_url": "https://images.unsplash.com/photo-1581009146145-b5ef050c2e1e?q=80&w=1470&auto=format&fit=crop"
+    },
+    "Pilates": {
+        "imagen_url": "https://images.unsplash.com/photo-1518609878373-06d740f60d8b?q=80&w=1470&auto=format&fit=crop"
+    },
+    "Spinning VIP Weekend": {
+        "imagen_url": "https://images.unsplash.com/photo-1594737625785-a6cbdabd333c?q=80&w=1470&auto=format&fit=crop"
+    }
+}
+
+# (título, descripción, cupo, entrenador, día, inicio, fin, plan)
+CLASES_DEMO = [
+    ("Spinning Intenso", "Clase de spinning de alta intensidad para quemar calorías", 20,
+     "carlos", DiaSemana.LUNES, time(18, 0), time(19, 0), "basico"),
+    ("Yoga Matutino", "Sesión de yoga relajante para comenzar el día", 15,
+     "maria", DiaSemana.MIERCOLES, time(10, 0), time(10, 45), "basico"),
+    ("CrossFit Avanzado", "Entrenamiento funcional de alta intensidad", 12,
+     "juan", DiaSemana.MARTES, time(19, 0), time(20, 0), "premium"),
+    ("Zumba Fitness", "Baile y ejercicio cardiovascular al ritmo de música latina", 25,
+     "ana", DiaSemana.JUEVES, time(18, 30), time(19, 30), "basico"),
+    ("Funcional TRX", "Entrenamiento funcional con bandas de suspensión", 15,
+     "pedro", DiaSemana.VIERNES, time(17, 0), time(18, 0), "basico"),
+    ("Pilates", "Fortalecimiento del core y mejora de la postura", 18,
+     "maria", DiaSemana.LUNES, time(9, 0), time(10, 0), "basico"),
+    ("Spinning VIP Weekend", "Clase exclusiva de spinning con instructor personalizado", 10,
+     "carlos", DiaSemana.SABADO, time(11, 0), time(12, 0), "elite"),
+]
+
+# (nombre, apellido, DNI, email, plan)
+SOCIOS_DEMO = [
+    ("Juan", "Pérez", "12345678", "juan.perez@example.com", "premium"),
+    ("María", "González", "23456789", "maria.gonzalez@example.com", "basico"),
+    ("Carlos", "Fernández", "34567890", "carlos.fernandez@example.com", "premium"),
+    ("Ana", "Martínez", "45678901", "ana.martinez@example.com", "elite"),
+    ("Luis", "Rodríguez", "56789012", "luis.rodriguez@example.com", "basico"),
+    ("Laura", "López", "67890123", "laura.lopez@example.com", "premium"),
+    ("Diego", "Sánchez", "78901234", "diego.sanchez@example.com", "elite"),
+    ("Sofía", "Ramírez", "89012345", "sofia.ramirez@example.com", "basico"),
+]
+
+# (índice del socio, índice de la clase)
+RESERVAS_DEMO = [(0, 0), (1, 1), (2, 2), (3, 3), (0, 1), (5, 0), (5, 2), (4, 3), (6, 1), (7, 5)]
+
+
+def cargar_datos_demo() -> bool:
+    """
+    Carga planes, entrenadores, clases, socios y reservas de ejemplo.
+
+    Solo se ejecuta si la base no tiene planes (indicador de base vacía).
+
+    Returns:
+        True si se cargaron los datos, False si la base ya tenía datos
+    """
+    from src.models import PlanMembresia, Socio, Entrenador, Horario, Clase, Reserva
+    from src.repositories.clase_repository import ClaseRepository
+    from src.services.catalogo_planes_service import invalidar_catalogo_planes
+
+    if db.session.query(PlanMembresia.id).first() is not None:
+        logger.info("La base de datos ya contiene datos, no se cargan datos de ejemplo")
+        return False
+
+    planes = {
+        'basico': PlanMembresia("Plan Básico", "Acceso a gimnasio de lunes a viernes de 6:00 a 16:00 y clases grupales básicas", 32000.0, nivel=1),
+        'premium': PlanMembresia("Plan Premium", "Acceso completo al gimnasio, todas las clases grupales, nutricionista y entrenador personal", 38000.0, nivel=2),
+        'elite': PlanMembresia("Plan Elite", "Acceso completo a todas las clases, entrenador personal dedicado, spa y área VIP", 42000.0, nivel=3),
+    }
+    entrenadores = {
+        'carlos': Entrenador("Carlos", "Rodríguez", "carlos.rodriguez@fitflow.com", "Instructor de Spinning certificado con 5 años de experiencia"),
+        'maria': Entrenador("María", "García", "maria.garcia@fitflow.com", "Profesora de Yoga y Pilates"),
+        'juan': Entrenador("Juan", "Martínez", "juan.martinez@fitflow.com", "Entrenador Personal y CrossFit"),
+        'ana': Entrenador("Ana", "López", "ana.lopez@fitflow.com", "Instructora de Zumba y Baile"),
+        'pedro': Entrenador("Pedro", "Sánchez", "pedro.sanchez@fitflow.com", "Profesor de Funcional y TRX"),
+    }
+    db.session.add_all([*planes.values(), *entrenadores.values()])
+
+    clases = []
+    for titulo, descripcion, cupo, entrenador, dia, inicio, fin, plan in CLASES_DEMO:
+        clase = Clase(titulo, descripcion, cupo, entrenadores[entrenador],
+                      Horario(dia, inicio, fin), **MULTIMEDIA_CLASES[titulo])
+        clase.planes = [planes[plan]]
+        clases.append(clase)
+
+    socios = [
+        Socio(nombre, apellido, dni, email, planes[plan])
+        for nombre, apellido, dni, email, plan in SOCIOS_DEMO
+    ]
+    db.session.add_all(clases + socios)
+    db.session.add_all([Reserva(socios[s], clases[c]) for s, c in RESERVAS_DEMO])
+    ClaseRepository().recalcular_nivel_minimo()
+    db.session.commit()
+
+    # Sincronizar el contador de cupos con las reservas cargadas
+    ClaseRepository().recalcular_cupos_ocupados()
+    invalidar_catalogo_planes()
+
+    logger.info("Datos de ejemplo cargados exitosamente")
+    return True
+
+
+def completar_multimedia_clases() -> int:
+    """
+    Completa la imagen y el video faltantes de las clases de ejemplo.
+
+    Returns:
+        Cantidad de clases actualizadas
+    """
+    from src.models.clase import Clase
+
+    actualizadas = 0
+    for clase in Clase.query.filter(Clase.titulo.in_(MULTIMEDIA_CLASES)).all():
+        multimedia = MULTIMEDIA_CLASES[clase.titulo]
+        cambio = False
+        for campo, valor in multimedia.items():
+            if not getattr(clase, campo):
+                setattr(clase, campo, valor)
+                cambio = True
+        if cambio:
+            actualizadas += 1
+            logger.info(f"Actualizada imagen/video para clase: {clase.titulo}")
+
+    if actualizadas:
+        db.session.commit()
+    return actualizadas
@@ -1,18 +1,214 @@
 """Configuración de tareas asincrónicas programadas"""
+import hashlib
+import os
+import socket
+import threading
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import insert, or_, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class EleccionLider:
+    """
+    Elección de líder entre procesos para que las tareas programadas se
+    ejecuten una sola vez aunque haya varios workers o réplicas.
+    
+    En PostgreSQL el líder es quien obtiene un advisory lock de sesión,
+    que mantiene con una conexión dedicada: si el proceso muere, el lock
+    se libera solo al cerrarse la conexión. En SQLite (y otros motores)
+    el líder es el dueño de la fila de la tabla scheduler_lider mientras
+    su lease no venza; cada latido lo renueva y, si el líder deja de
+    latir, otro proceso toma la fila al vencer el lease.
+    
+    En ambos casos la fila registra qué nodo es el líder, para /health.
+    """
+    
+    def __init__(self, engine: Engine, nombre: str = 'scheduler',
+                 lease_segundos: float = 60, nodo: Optional[str] = None):
+        """
+        Args:
+            engine: Engine de la base compartida por los procesos
+            nombre: Nombre del grupo de procesos que compiten por el liderazgo
+            lease_segundos: Duración del lease sin renovar
+            nodo: Identificador de este proceso (por defecto host:pid)
+        """
+        self.engine = engine
+        self.nombre = nombre
+        self.lease = timedelta(seconds=lease_segundos)
+        self.nodo = nodo or f"{socket.gethostname()}:{os.getpid()}"
+        self.mecanismo = 'advisory_lock' if engine.dialect.name == 'postgresql' else 'lease'
+        self._es_lider = False
+        self._conexion: Optional[Connection] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def es_lider(self) -> bool:
+        """Indica si este proceso era el líder en el último intento"""
+        return self._es_lider
+    
+    def intentar(self) -> bool:
+        """
+        Obtiene o renueva el liderazgo.
+        
+        Returns:
+            True si este proceso es el líder
+        """
+        with self._lock:
+            try:
+                if self.mecanismo == 'advisory_lock':
+                    es_lider = self._intentar_advisory_lock()
+                else:
+                    es_lider = self._intentar_lease()
+            except SQLAlchemyError as e:
+                logger.warning(f"No se pudo verificar el liderazgo del scheduler: {e}")
+                self._cerrar_conexion()
+                es_lider = False
+            
+            if es_lider != self._es_lider:
+                logger.info(
+                    f"Nodo {self.nodo} {'asume' if es_lider else 'deja'} "
+                    f"el liderazgo del scheduler '{self.nombre}'"
+                )
+            self._es_lider = es_lider
+            return es_lider
+    
+    def liberar(self) -> None:
+        """Cede el liderazgo para que otro proceso lo tome sin esperar al lease"""
+        with self._lock:
+            if not self._es_lider:
+                return
+            try:
+                from src.config.database import scheduler_lider as tabla
+                
+                with self.engine.begin() as conexion:
+                    conexion.execute(
+                        update(tabla)
+                        .where(tabla.c.nombre == self.nombre, tabla.c.nodo == self.nodo)
+                        .values(expira=datetime.utcnow())
+                    )
+            except SQLAlchemyError as e:
+                logger.warning(f"No se pudo liberar el liderazgo del scheduler: {e}")
+            self._cerrar_conexion()
+            self._es_lider = False
+    
+    def estado(self) -> dict:
+        """
+        Informa qué nodo tiene el liderazgo.
+        
+        Returns:
+            Diccionario con este nodo, si es el líder, el líder vigente
+            (None si el lease venció) y el vencimiento de su lease
+        """
+        from src.config.database import scheduler_lider as tabla
+        
+        estado = {
+            'mecanismo': self.mecanismo,
+            'nodo': self.nodo,
+            'es_lider': self._es_lider,
+            'lider': None,
+            'lease_expira': None,
+        }
+        try:
+            with self.engine.connect() as conexion:
+                fila = conexion.execute(
+                    select(tabla.c.nodo, tabla.c.expira).where(tabla.c.nombre == self.nombre)
+                ).first()
+        except SQLAlchemyError as e:
+            estado['error'] = str(e)
+            return estado
+        if fila is not None and fila.expira > datetime.utcnow():
+            estado['lider'] = fila.nodo
+            estado['lease_expira'] = fila.expira.isoformat()
+        return estado
+    
+    def _intentar_lease(self) -> bool:
+        """Toma o renueva la fila de liderazgo si es propia o su lease venció"""
+        from src.config.database import scheduler_lider as tabla
+        
+        ahora = datetime.utcnow()
+        valores = {'nodo': self.nodo, 'expira': ahora + self.lease, 'renovado': ahora}
+        # UPDATE condicional: la base serializa los intentos concurrentes
+        with self.engine.begin() as conexion:
+            tomadas = conexion.execute(
+                update(tabla)
+                .where(tabla.c.nombre == self.nombre,
+                       or_(tabla.c.nodo == self.nodo, tabla.c.expira < ahora))
+                .values(**valores)
+            ).rowcount
+        if tomadas:
+            return True
+        
+        # Primera elección: la fila todavía no existe
+        try:
+            with self.engine.begin() as conexion:
+                conexion.execute(insert(tabla).values(nombre=self.nombre, **valores))
+            return True
+        except IntegrityError:
+            return False
+    
+    def _intentar_advisory_lock(self) -> bool:
+        """Obtiene el advisory lock en una conexión dedicada o verifica que siga viva"""
+        from src.config.database import scheduler_lider as tabla
+        
+        if self._conexion is None:
+            conexion = self.engine.connect()
+            obtenido = conexion.execute(
+                text('SELECT pg_try_advisory_lock(:clave)'), {'clave': self._clave_lock()}
+            ).scalar()
+            conexion.commit()
+            if not obtenido:
+                conexion.close()
+                return False
+            self._conexion = conexion
+        else:
+            self._conexion.execute(text('SELECT 1'))
+            self._conexion.commit()
+        
+        # El lock es lo que decide; la fila solo registra al líder para /health
+        ahora = datetime.utcnow()
+        valores = {'nodo': self.nodo, 'expira': ahora + self.lease, 'renovado': ahora}
+        with self.engine.begin() as conexion:
+            actualizadas = conexion.execute(
+                update(tabla).where(tabla.c.nombre == self.nombre).values(**valores)
+            ).rowcount
+            if not actualizadas:
+                conexion.execute(insert(tabla).values(nombre=self.nombre, **valores))
+        return True
+    
+    def _clave_lock(self) -> int:
+        """Clave de 64 bits del advisory lock, derivada del nombre"""
+        digest = hashlib.sha256(f'fitflow:{self.nombre}'.encode()).digest()
+        return int.from_bytes(digest[:8], 'big', signed=True)
+    
+    def _cerrar_conexion(self) -> None:
+        """Cierra la conexión dedicada (libera el advisory lock)"""
+        if self._conexion is not None:
+            try:
+                self._conexion.close()
+            except SQLAlchemyError:
+                pass
+            self._conexion = None
+
+
 class TaskScheduler:
-    """Programador de tareas asincrónicas del sistema"""
+    """
+    Programador de tareas asincrónicas del sistema.
+    
+    Si se configura una elección de líder, cada tarea programada se
+    ejecuta solo en el proceso que tiene el liderazgo; el resto la omite.
+    """
     
     def __init__(self):
         self.scheduler = BackgroundScheduler()
         self._jobs = {}
+        self.eleccion: Optional[EleccionLider] = None
     
     def iniciar(self):
         """Inicia el programador de tareas"""
@@ -21,10 +217,53 @@ class TaskScheduler:
             logger.info("Scheduler de tareas iniciado")
     
     def detener(self):
-        """Detiene el programador de tareas"""
+        """Detiene el programador de tareas y cede el liderazgo"""
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler de tareas detenido")
+        if self.eleccion is not None:
+            self.eleccion.liberar()
+    
+    def configurar_liderazgo(self, eleccion: EleccionLider, latido_segundos: int):
+        """
+        Activa la elección de líder y programa el latido que la renueva.
+        
+        Args:
+            eleccion: Elección de líder compartida por los procesos
+            latido_segundos: Intervalo entre renovaciones del liderazgo
+        """
+        self.eleccion = eleccion
+        self.scheduler.add_job(
+            func=eleccion.intentar,
+            trigger='interval',
+            seconds=latido_segundos,
+            id='latido_lider',
+            replace_existing=True,
+            max_instances=1
+        )
+        eleccion.intentar()
+    
+    def estado_liderazgo(self) -> dict:
+        """
+        Informa qué nodo ejecuta las tareas programadas.
+        
+        Returns:
+            Estado de la elección, o solo este proceso como líder si no hay elección
+        """
+        if self.eleccion is None:
+            return {'mecanismo': None, 'es_lider': True}
+        return self.eleccion.estado()
+    
+    def _solo_lider(self, func, job_id: str):
+        """Envuelve una tarea para que solo la ejecute el proceso líder"""
+        def ejecutar_si_lider():
+            # Se renueva al ejecutar: no depende de que el último latido sea reciente
+            if self.eleccion is not None and not self.eleccion.intentar():
+                logger.debug(f"Tarea {job_id} omitida: el líder del scheduler es otro nodo")
+                return None
+            return func()
+        ejecutar_si_lider.__name__ = getattr(func, '__name__', job_id)
+        return ejecutar_si_lider
     
     def agregar_tarea_nocturna(self, func, hora: int = 2, minuto: int = 0, job_id: str = None):
         """
@@ -38,7 +277,7 @@ class TaskScheduler:
         """
         trigger = CronTrigger(hour=hora, minute=minuto)
         job = self.scheduler.add_job(
-            func=func,
+            func=self._solo_lider(func, job_id),
             trigger=trigger,
             id=job_id,
             replace_existing=True,
@@ -59,7 +298,7 @@ class TaskScheduler:
         """
         trigger = CronTrigger(minute=minuto)
         job = self.scheduler.add_job(
-            func=func,
+            func=self._solo_lider(func, job_id),
             trigger=trigger,
             id=job_id,
             replace_existing=True,
@@ -79,7 +318,7 @@ class TaskScheduler:
             job_id: Identificador único del job
         """
         job = self.scheduler.add_job(
-            func=func,
+            func=self._solo_lider(func, job_id),
             trigger='interval',
             minutes=minutos,
             id=job_id,
@@ -90,6 +329,29 @@ class TaskScheduler:
         logger.info(f"Tarea con intervalo programada: {job_id} cada {minutos} minutos")
         return job
     
+    def agregar_tarea_fecha(self, func, fecha: datetime, job_id: str = None):
+        """
+        Agrega una tarea para ejecutarse una sola vez en una fecha dada.
+        
+        No se limita al líder: la programa el proceso que generó el evento
+        y debe ser idempotente (ej. el vencimiento de una notificación).
+        
+        Args:
+            func: Función a ejecutar
+            fecha: Fecha y hora de ejecución
+            job_id: Identificador único del job
+        """
+        job = self.scheduler.add_job(
+            func=func,
+            trigger='date',
+            run_date=fecha,
+            id=job_id,
+            replace_existing=True,
+            misfire_grace_time=None
+        )
+        logger.info(f"Tarea única programada: {job_id} para {fecha.isoformat()}")
+        return job
+    
     def ejecutar_ahora(self, job_id: str):
         """Ejecuta inmediatamente una tarea programada"""
         job = self._jobs.get(job_id)
@@ -121,50 +383,123 @@ def configurar_tareas_programadas(app):
     Args:
         app: Aplicación Flask
     """
-    from src.services.lista_espera_service import ListaEsperaService
-    from src.services.agregador_horarios_service import AgregadorHorariosService
+    from src.repositories.clase_repository import ClaseRepository
+    from src.services.estadisticas_service import EstadisticasService
+    from src.config.database import db
+    from src.config.settings import settings
+    from src.config.tareas import ejecutor_tareas
+    
+    # Las operaciones largas se encolan en el ejecutor de tareas: así quedan
+    # registradas (estado, resultado) y no ocupan el hilo del scheduler
+    def encolar(tipo: str):
+        """Crea la función que encola una tarea del tipo dado"""
+        def encolar_tarea():
+            with app.app_context():
+                try:
+                    ejecutor_tareas.encolar(tipo, unica=True)
+                except Exception as e:
+                    logger.error(f"Error encolando la tarea {tipo}: {e}")
+        return encolar_tarea
     
-    # Crear servicios con contexto de aplicación
-    def procesar_lista_espera_nocturna():
-        """Procesa liberaciones de cupos desde lista de espera (tarea nocturna)"""
+    def purgar_tareas_nocturno():
+        """Elimina las tareas finalizadas fuera del período de retención (tarea nocturna)"""
         with app.app_context():
             try:
-                logger.info("Iniciando procesamiento nocturno de lista de espera...")
-                service = ListaEsperaService()
-                notificaciones = service.procesar_liberaciones_cupos()
+                eliminadas = ejecutor_tareas.purgar(settings.tareas.retencion_dias)
+                logger.info(f"Purga de tareas completada: {eliminadas} tareas eliminadas")
+            except Exception as e:
+                logger.error(f"Error purgando tareas: {e}")
+    
+    def reconciliar_cupos_nocturno():
+        """Reconstruye el contador de cupos ocupados desde las reservas (tarea nocturna)"""
+        with app.app_context():
+            try:
+                logger.info("Iniciando reconciliación de cupos ocupados...")
+                corregidas = ClaseRepository().recalcular_cupos_ocupados()
                 logger.info(
-                    f"Procesamiento nocturno completado: {notificaciones} notificaciones"
+                    f"Reconciliación de cupos completada: {corregidas} clases corregidas"
                 )
             except Exception as e:
-                logger.error(f"Error en procesamiento nocturno de lista de espera: {e}")
+                logger.error(f"Error reconciliando cupos ocupados: {e}")
+    
+    def recuperar_tareas():
+        """Recupera las tareas que dejaron los procesos muertos (solo en el líder)"""
+        with app.app_context():
+            try:
+                interrumpidas, reencoladas = ejecutor_tareas.recuperar(
+                    settings.tareas.abandono_segundos)
+                if interrumpidas or reencoladas:
+                    logger.info(
+                        f"Recuperación de tareas: {interrumpidas} interrumpidas, "
+                        f"{reencoladas} reencoladas"
+                    )
+            except Exception as e:
+                logger.error(f"Error recuperando tareas: {e}")
     
-    def actualizar_calendario_horario():
-        """Actualiza el calendario consolidado (tarea horaria)"""
+    def generar_snapshot_estadisticas():
+        """Guarda un snapshot de las estadísticas del dashboard (tarea horaria)"""
         with app.app_context():
             try:
-                logger.info("Actualizando calendario consolidado...")
-                service = AgregadorHorariosService()
-                service.actualizar_calendario()
-                logger.info("Calendario consolidado actualizado")
+                EstadisticasService().generar_snapshot()
+                logger.info("Snapshot de estadísticas generado")
             except Exception as e:
-                logger.error(f"Error actualizando calendario: {e}")
+                logger.error(f"Error generando snapshot de estadísticas: {e}")
     
     # Programar tareas
     # Procesamiento de lista de espera: 2:00 AM todos los días
     scheduler.agregar_tarea_nocturna(
-        func=procesar_lista_espera_nocturna,
+        func=encolar('procesar_lista_espera'),
         hora=2,
         minuto=0,
         job_id='procesar_lista_espera'
     )
     
+    # Reconciliación del contador de cupos: 3:00 AM todos los días
+    scheduler.agregar_tarea_nocturna(
+        func=reconciliar_cupos_nocturno,
+        hora=3,
+        minuto=0,
+        job_id='reconciliar_cupos'
+    )
+    
+    # Purga de tareas en segundo plano finalizadas: 4:00 AM todos los días
+    scheduler.agregar_tarea_nocturna(
+        func=purgar_tareas_nocturno,
+        hora=4,
+        minuto=0,
+        job_id='purgar_tareas'
+    )
+    
     # Actualización de calendario: cada hora en punto
     scheduler.agregar_tarea_horaria(
-        func=actualizar_calendario_horario,
+        func=encolar('actualizar_calendario'),
         minuto=0,
         job_id='actualizar_calendario'
     )
     
+    # Recuperación de tareas de procesos muertos: cada minuto
+    scheduler.agregar_tarea_intervalo(
+        func=recuperar_tareas,
+        minutos=1,
+        job_id='recuperar_tareas'
+    )
+    
+    # Snapshot de estadísticas para tendencias: cada hora a los 30 minutos
+    scheduler.agregar_tarea_horaria(
+        func=generar_snapshot_estadisticas,
+        minuto=30,
+        job_id='snapshot_estadisticas'
+    )
+    
+    # Solo el líder entre los workers/réplicas ejecuta las tareas
+    with app.app_context():
+        eleccion = EleccionLider(
+            db.engine,
+            lease_segundos=settings.scheduler.lease_segundos,
+            nodo=settings.scheduler.nodo
+        )
+    scheduler.configurar_liderazgo(eleccion, settings.scheduler.latido_segundos)
+    
     # Iniciar scheduler
     scheduler.iniciar()
     
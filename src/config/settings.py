@@ -15,6 +15,13 @@ class DatabaseConfig:
     echo: bool = False
     pool_size: int = 5
     max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    # PRAGMAs que se aplican a cada conexión SQLite
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_mb: int = 256
+    sqlite_cache_mb: int = 64
 
 
 @dataclass
@@ -25,6 +32,42 @@ class ProxyConfig:
     clases_externas_url: str
     clases_externas_api_key: str
     timeout: int = 30
+    # Verificación de pagos en lote: referencias por lote, lotes
+    # concurrentes y timeout (segundos) de cada lote
+    pasarela_lote_tamano: int = 100
+    pasarela_lote_workers: int = 8
+    pasarela_lote_timeout: float = 10.0
+
+
+@dataclass
+class CacheConfig:
+    """Configuración del cache del calendario consolidado"""
+    backend: str = 'memoria'  # 'memoria' (LRU por proceso) o 'sqlite' (compartido)
+    ruta: Optional[str] = None
+    ttl_segundos: int = 300
+    ventana_stale_segundos: int = 60
+    max_entradas: int = 128
+
+
+@dataclass
+class TareasConfig:
+    """Configuración del ejecutor de tareas en segundo plano"""
+    workers: int = 2
+    retencion_dias: int = 7
+    latido_segundos: int = 30
+    abandono_segundos: int = 120  # sin latido por más de esto, la tarea se da por interrumpida
+    # Archivos que reciben las tareas (ej. el CSV de importar_socios). La tarea
+    # puede terminar ejecutándose en otro host: con varias réplicas debe ser
+    # un volumen compartido por todas
+    directorio_archivos: Optional[str] = None
+
+
+@dataclass
+class SchedulerConfig:
+    """Configuración de la elección de líder del scheduler entre procesos"""
+    lease_segundos: int = 60
+    latido_segundos: int = 20
+    nodo: Optional[str] = None  # por defecto host:pid
 
 
 @dataclass
@@ -92,7 +135,41 @@ class Settings:
             url=database_url,
             echo=os.getenv('DB_ECHO', 'False').lower() == 'true',
             pool_size=int(os.getenv('DB_POOL_SIZE', 5)),
-            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10))
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30)),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+            pool_pre_ping=os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true',
+            sqlite_busy_timeout_ms=int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+            sqlite_mmap_mb=int(os.getenv('SQLITE_MMAP_MB', 256)),
+            sqlite_cache_mb=int(os.getenv('SQLITE_CACHE_MB', 64))
+        )
+        
+        # Configuración del cache (el backend sqlite se comparte entre workers; con
+        # 'memoria' los demás workers se enteran de la invalidación por la
+        # versión del calendario en la base)
+        self.cache = CacheConfig(
+            backend=os.getenv('CACHE_BACKEND', 'memoria').lower(),
+            ruta=os.getenv('CACHE_PATH', os.path.join(instance_dir, 'cache.db')),
+            ttl_segundos=int(os.getenv('CALENDARIO_CACHE_TTL', 300)),
+            ventana_stale_segundos=int(os.getenv('CALENDARIO_CACHE_STALE', 60)),
+            max_entradas=int(os.getenv('CACHE_MAX_ENTRADAS', 128))
+        )
+        
+        # Configuración de tareas en segundo plano
+        self.tareas = TareasConfig(
+            workers=int(os.getenv('TAREAS_WORKERS', 2)),
+            retencion_dias=int(os.getenv('TAREAS_RETENCION_DIAS', 7)),
+            latido_segundos=int(os.getenv('TAREAS_LATIDO_SEGUNDOS', 30)),
+            abandono_segundos=int(os.getenv('TAREAS_ABANDONO_SEGUNDOS', 120)),
+            directorio_archivos=os.getenv(
+                'TAREAS_DIRECTORIO_ARCHIVOS', os.path.join(instance_dir, 'importaciones'))
+        )
+        
+        # Elección de líder del scheduler (un solo worker ejecuta las tareas)
+        self.scheduler = SchedulerConfig(
+            lease_segundos=int(os.getenv('SCHEDULER_LEASE_SEGUNDOS', 60)),
+            latido_segundos=int(os.getenv('SCHEDULER_LATIDO_SEGUNDOS', 20)),
+            nodo=os.getenv('SCHEDULER_NODO') or None
         )
         
         # Configuración de servicios proxy
@@ -107,7 +184,10 @@ class Settings:
                 'https://api.talleres-especiales.com'
             ),
             clases_externas_api_key=os.getenv('CLASES_EXTERNAS_API_KEY', 'test_key'),
-            timeout=int(os.getenv('PROXY_TIMEOUT', 30))
+            timeout=int(os.getenv('PROXY_TIMEOUT', 30)),
+            pasarela_lote_tamano=int(os.getenv('PASARELA_LOTE_TAMANO', 100)),
+            pasarela_lote_workers=int(os.getenv('PASARELA_LOTE_WORKERS', 8)),
+            pasarela_lote_timeout=float(os.getenv('PASARELA_LOTE_TIMEOUT', 10))
         )
     
     @classmethod
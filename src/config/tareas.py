@@ -0,0 +1,289 @@
+"""Ejecutor de tareas en segundo plano (operaciones largas fuera del request)"""
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+from src.core.logging_config import get_logger
+from src.utils.enums import EstadoTarea
+
+logger = get_logger(__name__)
+
+# Un manejador recibe los parámetros de la tarea y una función para
+# informar el progreso, y devuelve el resultado (serializable a JSON)
+Manejador = Callable[[dict, Callable[[dict], None]], Optional[dict]]
+
+
+class EjecutorTareas:
+    """
+    Ejecuta tareas persistidas en un pool de hilos.
+    
+    Cada tarea se guarda en la tabla 'tareas' al encolarse, por lo que su
+    estado, progreso y resultado se pueden consultar desde cualquier
+    request mientras el pool la procesa. Los requests que la encolan
+    responden enseguida (202) en lugar de ocupar un hilo de Waitress.
+    
+    Cada proceso (worker de Gunicorn, réplica) tiene su propio ejecutor.
+    Al reclamar una tarea se registra el nodo que la ejecuta, y un hilo
+    renueva el latido de sus tareas en curso; así el líder del scheduler
+    puede recuperar las de un proceso muerto sin tocar las de los vivos.
+    """
+    
+    def __init__(self):
+        self._manejadores: Dict[str, Manejador] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._app = None
+        self.nodo: Optional[str] = None
+        self._detenido = threading.Event()
+    
+    def registrar(self, tipo: str, manejador: Manejador) -> None:
+        """
+        Registra el manejador de un tipo de tarea.
+        
+        Args:
+            tipo: Nombre del tipo de tarea
+            manejador: Función (parametros, reportar) -> resultado
+        """
+        self._manejadores[tipo] = manejador
+    
+    def iniciar(self, app, workers: int, latido_segundos: int = 30,
+                nodo: Optional[str] = None) -> None:
+        """
+        Inicia el pool de workers y el latido de las tareas en curso.
+        
+        No recupera tareas de ejecuciones anteriores: eso lo hace solo el
+        líder del scheduler (ver recuperar), porque al iniciar no se sabe
+        si las tareas en curso son de un proceso muerto o de otro worker.
+        
+        Args:
+            app: Aplicación Flask (para abrir el contexto en los workers)
+            workers: Cantidad de hilos del pool
+            latido_segundos: Intervalo entre renovaciones del latido
+            nodo: Identificador de este proceso (por defecto host:pid)
+        """
+        self._app = app
+        if self._pool is not None:
+            return
+        
+        self.nodo = nodo or f"{socket.gethostname()}:{os.getpid()}"
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tarea')
+        self._detenido.clear()
+        threading.Thread(
+            target=self._latir, args=(latido_segundos,), name='tarea-latido', daemon=True
+        ).start()
+        logger.info(f"Ejecutor de tareas iniciado con {workers} workers (nodo {self.nodo})")
+    
+    def detener(self) -> None:
+        """Detiene el pool sin esperar a las tareas en curso"""
+        if self._pool is not None:
+            self._detenido.set()
+            self._pool.shutdown(wait=False)
+            self._pool = None
+            logger.info("Ejecutor de tareas detenido")
+    
+    def recuperar(self, abandono_segundos: int) -> Tuple[int, int]:
+        """
+        Recupera las tareas que dejaron procesos muertos.
+        
+        Las tareas en curso sin latido desde hace abandono_segundos se
+        marcan como fallidas, y las pendientes encoladas antes de ese
+        plazo (su proceso murió antes de reclamarlas) se envían a este
+        pool. Lo ejecuta solo el líder del scheduler; si otro worker
+        todavía tiene una de esas pendientes, el reclamo condicional
+        evita que corra dos veces.
+        
+        Args:
+            abandono_segundos: Antigüedad a partir de la cual se da una
+                tarea por abandonada
+        
+        Returns:
+            Tupla (tareas interrumpidas, tareas reencoladas)
+        """
+        from src.repositories.tarea_repository import TareaRepository
+        
+        if self._pool is None:
+            raise RuntimeError("El ejecutor de tareas no está iniciado")
+        
+        limite = datetime.utcnow() - timedelta(seconds=abandono_segundos)
+        repo = TareaRepository()
+        interrumpidas = repo.marcar_interrumpidas(limite)
+        pendientes = repo.find_ids_pendientes(creadas_antes_de=limite)
+        for tarea_id in pendientes:
+            self._pool.submit(self._ejecutar, tarea_id)
+        return interrumpidas, len(pendientes)
+    
+    def encolar(self, tipo: str, parametros: dict = None, unica: bool = False):
+        """
+        Persiste una tarea y la envía al pool.
+        
+        Args:
+            tipo: Tipo de tarea registrado
+            parametros: Parámetros para el manejador (serializables a JSON)
+            unica: Si True y ya hay una tarea de ese tipo pendiente o en
+                curso, se devuelve esa en lugar de encolar otra
+        
+        Returns:
+            La tarea encolada (o la existente)
+        
+        Raises:
+            ValueError: Si el tipo no está registrado
+            RuntimeError: Si el ejecutor no fue iniciado
+        """
+        from src.models.tarea import Tarea
+        from src.repositories.tarea_repository import TareaRepository
+        
+        if tipo not in self._manejadores:
+            raise ValueError(f"Tipo de tarea no registrado: {tipo}")
+        if self._pool is None:
+            raise RuntimeError("El ejecutor de tareas no está iniciado")
+        
+        repo = TareaRepository()
+        if unica:
+            existente = repo.find_activa_por_tipo(tipo)
+            if existente:
+                return existente
+        
+        tarea = repo.create(Tarea(uuid.uuid4().hex, tipo, parametros))
+        self._pool.submit(self._ejecutar, tarea.id)
+        logger.info(f"Tarea encolada: {tipo} ({tarea.id})")
+        return tarea
+    
+    def purgar(self, retencion_dias: int) -> int:
+        """
+        Elimina las tareas finalizadas hace más de retencion_dias.
+        
+        Args:
+            retencion_dias: Días que se conservan las tareas finalizadas
+        
+        Returns:
+            Cantidad de tareas eliminadas
+        """
+        from src.repositories.tarea_repository import TareaRepository
+        
+        limite = datetime.utcnow() - timedelta(days=retencion_dias)
+        return TareaRepository().purgar_finalizadas(limite)
+    
+    def _ejecutar(self, tarea_id: str) -> None:
+        """Ejecuta una tarea dentro de un contexto de aplicación"""
+        with self._app.app_context():
+            from src.config.database import db
+            from src.models.tarea import Tarea
+            from src.repositories.tarea_repository import TareaRepository
+            
+            repo = TareaRepository()
+            # Otro worker (u otro proceso) puede haber recibido la misma tarea:
+            # solo la ejecuta quien logra pasarla de pendiente a en curso
+            if not repo.reclamar(tarea_id, self.nodo):
+                return
+            
+            tarea = repo.get_actualizada(tarea_id)
+            tipo, parametros = tarea.tipo, tarea.parametros
+            self._notificar(tarea)
+            
+            def reportar(progreso: dict) -> None:
+                repo.actualizar_progreso(tarea_id, progreso)
+                self._notificar(db.session.get(Tarea, tarea_id))
+            
+            try:
+                resultado = self._manejadores[tipo](parametros, reportar)
+                estado, error = EstadoTarea.COMPLETADA, None
+            except Exception as e:
+                db.session.rollback()
+                logger.exception(f"Error ejecutando la tarea {tipo} ({tarea_id}): {e}")
+                resultado, estado, error = None, EstadoTarea.FALLIDA, str(e)
+            
+            if not repo.finalizar(tarea_id, self.nodo, estado, resultado, error):
+                logger.warning(
+                    f"Tarea {tipo} ({tarea_id}) terminó ({estado.value}) pero ya no estaba "
+                    f"en curso en el nodo {self.nodo}: se descarta su resultado"
+                )
+                return
+            self._notificar(repo.get_actualizada(tarea_id))
+            logger.info(f"Tarea {tipo} ({tarea_id}) {estado.value}")
+    
+    def _latir(self, latido_segundos: int) -> None:
+        """Renueva periódicamente el latido de las tareas en curso de este nodo"""
+        from src.repositories.tarea_repository import TareaRepository
+        
+        while not self._detenido.wait(latido_segundos):
+            try:
+                with self._app.app_context():
+                    TareaRepository().registrar_latido(self.nodo)
+            except Exception as e:
+                logger.warning(f"Error renovando el latido de las tareas: {e}")
+    
+    @staticmethod
+    def _notificar(tarea) -> None:
+        """Emite el estado de la tarea por Socket.IO"""
+        try:
+            from src.extensions import socketio
+            socketio.emit('progreso_tarea', {
+                'id': tarea.id,
+                'tipo': tarea.tipo,
+                'estado': tarea.estado.value,
+                'progreso': tarea.progreso
+            })
+        except Exception as e:
+            # No fallar si hay error en socket
+            logger.warning(f"Error emitiendo progreso de tarea: {e}")
+
+
+# Instancia global del ejecutor
+ejecutor_tareas = EjecutorTareas()
+
+
+def configurar_ejecutor_tareas(app, workers: int, latido_segundos: int = 30,
+                               nodo: Optional[str] = None) -> EjecutorTareas:
+    """
+    Registra los tipos de tarea del sistema e inicia el ejecutor.
+    
+    Args:
+        app: Aplicación Flask
+        workers: Cantidad de hilos del pool
+        latido_segundos: Intervalo entre renovaciones del latido
+        nodo: Identificador de este proceso (por defecto host:pid)
+    
+    Returns:
+        El ejecutor global
+    """
+    from src.services.csv_importer_service import CSVImporterService
+    from src.services.pago_service import PagoService
+    from src.services.lista_espera_service import ListaEsperaService
+    from src.services.agregador_horarios_service import AgregadorHorariosService
+    
+    def importar_socios(parametros, reportar):
+        return CSVImporterService().importar_archivo(parametros['ruta'], reportar)
+    
+    def verificar_pagos_pendientes(parametros, reportar):
+        resultado = PagoService().verificar_pagos_pendientes()
+        if not resultado['success']:
+            raise RuntimeError(resultado['message'])
+        return resultado
+    
+    def procesar_lista_espera(parametros, reportar):
+        return {'notificaciones': ListaEsperaService().procesar_liberaciones_cupos()}
+    
+    def promover_lista_espera(parametros, reportar):
+        notificados = ListaEsperaService().promover_lista_espera(
+            parametros['clase_id'], parametros.get('cupos', 1)
+        )
+        return {'notificaciones': notificados}
+    
+    def vencer_lista_espera(parametros, reportar):
+        return {'notificaciones': ListaEsperaService().procesar_vencimiento(parametros['entrada_id'])}
+    
+    def actualizar_calendario(parametros, reportar):
+        AgregadorHorariosService().actualizar_calendario()
+        return None
+    
+    ejecutor_tareas.registrar('importar_socios', importar_socios)
+    ejecutor_tareas.registrar('verificar_pagos_pendientes', verificar_pagos_pendientes)
+    ejecutor_tareas.registrar('procesar_lista_espera', procesar_lista_espera)
+    ejecutor_tareas.registrar('promover_lista_espera', promover_lista_espera)
+    ejecutor_tareas.registrar('vencer_lista_espera', vencer_lista_espera)
+    ejecutor_tareas.registrar('actualizar_calendario', actualizar_calendario)
+    
+    ejecutor_tareas.iniciar(app, workers, latido_segundos, nodo)
+    return ejecutor_tareas
@@ -0,0 +1,275 @@
+"""Cache con almacenamiento intercambiable y stale-while-revalidate"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EntradaCache:
+    """
+    Entrada almacenada en el cache.
+
+    Hasta fresco_hasta el valor se sirve directamente; entre fresco_hasta
+    y vence_en se sirve viejo mientras se recalcula en segundo plano.
+    Los tiempos son epoch en segundos para poder compartirlos entre procesos.
+    """
+    valor: Any
+    creado_en: float
+    fresco_hasta: float
+    vence_en: float
+
+    def esta_fresca(self, ahora: float) -> bool:
+        """Indica si la entrada puede servirse sin recalcular"""
+        return ahora < self.fresco_hasta
+
+    def esta_vencida(self, ahora: float) -> bool:
+        """Indica si la entrada ya no puede servirse"""
+        return ahora >= self.vence_en
+
+
+class CacheStore:
+    """
+    Interfaz de almacenamiento del cache.
+
+    Las implementaciones deben ser seguras para uso concurrente.
+    """
+
+    def obtener(self, clave: str) -> Optional[EntradaCache]:
+        """Obtiene la entrada de una clave, o None si no existe"""
+        raise NotImplementedError
+
+    def guardar(self, clave: str, entrada: EntradaCache) -> None:
+        """Guarda (o reemplaza) la entrada de una clave"""
+        raise NotImplementedError
+
+    def invalidar(self, prefijo: str = '') -> None:
+        """Elimina todas las entradas cuya clave empieza con el prefijo"""
+        raise NotImplementedError
+
+
+class LRUCacheStore(CacheStore):
+    """Almacenamiento en memoria del proceso, con descarte LRU"""
+
+    def __init__(self, max_entradas: int = 128):
+        self.max_entradas = max_entradas
+        self._entradas: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str) -> Optional[EntradaCache]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+            return entrada
+
+    def guardar(self, clave: str, entrada: EntradaCache) -> None:
+        with self._lock:
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self, prefijo: str = '') -> None:
+        with self._lock:
+            for clave in [c for c in self._entradas if c.startswith(prefijo)]:
+                del self._entradas[clave]
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Almacenamiento en un archivo SQLite, compartido entre workers.
+
+    Los valores se guardan serializados en JSON, por lo que deben ser
+    tipos simples (dict, list, str, números).
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with self._conectar() as conexion:
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entradas ('
+                'clave TEXT PRIMARY KEY, valor TEXT NOT NULL, creado_en REAL NOT NULL, '
+                'fresco_hasta REAL NOT NULL, vence_en REAL NOT NULL)'
+            )
+
+    def _conectar(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.ruta, timeout=5)
+
+    def obtener(self, clave: str) -> Optional[EntradaCache]:
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                'SELECT valor, creado_en, fresco_hasta, vence_en '
+                'FROM cache_entradas WHERE clave = ?', (clave,)
+            ).fetchone()
+        if fila is None:
+            return None
+        return EntradaCache(json.loads(fila[0]), fila[1], fila[2], fila[3])
+
+    def guardar(self, clave: str, entrada: EntradaCache) -> None:
+        with self._conectar() as conexion:
+            conexion.execute(
+                'INSERT OR REPLACE INTO cache_entradas '
+                '(clave, valor, creado_en, fresco_hasta, vence_en) VALUES (?, ?, ?, ?, ?)',
+                (clave, json.dumps(entrada.valor), entrada.creado_en,
+                 entrada.fresco_hasta, entrada.vence_en)
+            )
+
+    def invalidar(self, prefijo: str = '') -> None:
+        with self._conectar() as conexion:
+            conexion.execute(
+                'DELETE FROM cache_entradas WHERE substr(clave, 1, ?) = ?',
+                (len(prefijo), prefijo)
+            )
+
+
+class CacheSWR:
+    """
+    Cache con política stale-while-revalidate sobre un CacheStore.
+
+    - Entrada fresca: se devuelve tal cual.
+    - Entrada vieja (dentro de la ventana stale): se devuelve y se
+      recalcula en un hilo en segundo plano (una sola vez por clave).
+    - Sin entrada o vencida: se calcula en el momento.
+    """
+
+    def __init__(self, store: CacheStore, ttl_segundos: int, ventana_stale_segundos: int):
+        self.store = store
+        self.ttl_segundos = ttl_segundos
+        self.ventana_stale_segundos = ventana_stale_segundos
+        self._revalidando = set()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: str, calcular: Callable[[], Any],
+                ejecutar_en_segundo_plano: Optional[Callable[[Callable[[], None]], None]] = None
+                ) -> EntradaCache:
+        """
+        Obtiene el valor de una clave, calculándolo si hace falta.
+
+        Args:
+            clave: Clave del cache
+            calcular: Función que produce el valor
+            ejecutar_en_segundo_plano: Envoltorio para la revalidación en
+                segundo plano (ej. para abrir un app_context); por defecto
+                la función se ejecuta tal cual en el hilo nuevo
+
+        Returns:
+            EntradaCache con el valor
+        """
+        ahora = time.time()
+        entrada = self.store.obtener(clave)
+
+        if entrada is not None and entrada.esta_fresca(ahora):
+            return entrada
+
+        if entrada is not None and not entrada.esta_vencida(ahora):
+            self._revalidar(clave, calcular, ejecutar_en_segundo_plano)
+            return entrada
+
+        return self.refrescar(clave, calcular)
+
+    def refrescar(self, clave: str, calcular: Callable[[], Any]) -> EntradaCache:
+        """
+        Calcula el valor de una clave y lo guarda en el cache.
+
+        Args:
+            clave: Clave del cache
+            calcular: Función que produce el valor
+
+        Returns:
+            EntradaCache recién calculada
+        """
+        valor = calcular()
+        ahora = time.time()
+        entrada = EntradaCache(
+            valor=valor,
+            creado_en=ahora,
+            fresco_hasta=ahora + self.ttl_segundos,
+            vence_en=ahora + self.ttl_segundos + self.ventana_stale_segundos
+        )
+        self.store.guardar(clave, entrada)
+        return entrada
+
+    def invalidar(self, prefijo: str = '') -> None:
+        """Elimina las entradas cuya clave empieza con el prefijo"""
+        self.store.invalidar(prefijo)
+
+    def _revalidar(self, clave: str, calcular: Callable[[], Any],
+                   ejecutar_en_segundo_plano: Optional[Callable]) -> None:
+        """Lanza la revalidación de una clave si no hay otra en curso"""
+        with self._lock:
+            if clave in self._revalidando:
+                return
+            self._revalidando.add(clave)
+
+        def tarea():
+            try:
+                self.refrescar(clave, calcular)
+            except Exception as e:
+                logger.error(f"Error revalidando cache '{clave}': {e}")
+            finally:
+                with self._lock:
+                    self._revalidando.discard(clave)
+
+        objetivo = (lambda: ejecutar_en_segundo_plano(tarea)) if ejecutar_en_segundo_plano else tarea
+        threading.Thread(target=objetivo, daemon=True).start()
+
+
+class VersionCompartida:
+    """
+    Versión de un cache publicada en un almacenamiento compartido entre
+    workers (ej. la tabla catalogo_version).
+
+    Quien invalida el cache incrementa la versión; cada worker la consulta
+    a lo sumo una vez por intervalo y, si cambió, descarta su copia local.
+    """
+
+    def __init__(self, leer: Callable[[], int], intervalo_segundos: float):
+        """
+        Args:
+            leer: Función que devuelve la versión publicada
+            intervalo_segundos: Tiempo mínimo entre consultas de la versión
+        """
+        self._leer = leer
+        self.intervalo_segundos = intervalo_segundos
+        self.version: Optional[int] = None
+        self.verificado_en = 0.0
+
+    def cambio(self) -> bool:
+        """
+        Consulta la versión si pasó el intervalo desde la última vez.
+
+        Returns:
+            True si otro worker publicó una versión nueva desde la última consulta
+        """
+        ahora = time.time()
+        if ahora - self.verificado_en < self.intervalo_segundos:
+            return False
+        version = self._leer()
+        cambio = self.version is not None and version != self.version
+        self.version, self.verificado_en = version, ahora
+        return cambio
+
+
+def crear_cache(config) -> CacheSWR:
+    """
+    Crea un CacheSWR según la configuración.
+
+    Args:
+        config: CacheConfig con backend ('memoria' o 'sqlite'), ruta y tiempos
+
+    Returns:
+        CacheSWR con el almacenamiento correspondiente
+    """
+    if config.backend == 'sqlite':
+        store = SQLiteCacheStore(config.ruta)
+    else:
+        store = LRUCacheStore(config.max_entradas)
+    return CacheSWR(store, config.ttl_segundos, config.ventana_stale_segundos)
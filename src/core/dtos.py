@@ -1,7 +1,8 @@
 """Data Transfer Objects (DTOs) para transferencia de datos"""
-from dataclasses import dataclass
-from typing import Optional, Generic, TypeVar, Any
+from dataclasses import dataclass, field
+from typing import Optional, Generic, TypeVar, Any, List, Dict
 from datetime import datetime
+from src.utils.enums import MotivoRechazoReserva
 
 T = TypeVar('T')
 
@@ -89,6 +90,58 @@ class ReservaDTO:
     fecha_cancelacion: Optional[datetime] = None
 
 
+@dataclass
+class ResultadoReserva:
+    """
+    Resultado tipado de un intento de reserva.
+    
+    Si la reserva fue rechazada, motivo indica la regla que no se cumplió.
+    """
+    exitosa: bool
+    mensaje: str
+    reserva: Optional[Any] = None
+    motivo: Optional[MotivoRechazoReserva] = None
+    cupos_disponibles: Optional[int] = None
+    
+    @classmethod
+    def ok(cls, reserva: Any, mensaje: str, cupos_disponibles: int) -> 'ResultadoReserva':
+        """Crea un resultado de reserva exitosa"""
+        return cls(exitosa=True, mensaje=mensaje, reserva=reserva,
+                   cupos_disponibles=cupos_disponibles)
+    
+    @classmethod
+    def rechazo(cls, motivo: MotivoRechazoReserva, mensaje: str) -> 'ResultadoReserva':
+        """Crea un resultado de reserva rechazada"""
+        return cls(exitosa=False, mensaje=mensaje, motivo=motivo)
+    
+    def to_dict(self) -> dict:
+        """Convierte el resultado al diccionario que devuelve ReservaService.crear_reserva"""
+        return {
+            'success': self.exitosa,
+            'reserva': self.reserva,
+            'message': self.mensaje,
+            'motivo': self.motivo.value if self.motivo else None
+        }
+
+
+@dataclass
+class ResultadoVerificacionLote:
+    """
+    Resultado de verificar el estado de varios pagos en la pasarela.
+    
+    Si algún lote falla o supera su timeout, sus referencias quedan en
+    no_verificadas y el motivo en errores; el resto se informa igual.
+    """
+    estados: Dict[str, Any] = field(default_factory=dict)
+    no_verificadas: List[str] = field(default_factory=list)
+    errores: List[str] = field(default_factory=list)
+    
+    @property
+    def completo(self) -> bool:
+        """Indica si se verificaron todas las referencias"""
+        return not self.no_verificadas
+
+
 @dataclass
 class PagoDTO:
     """DTO para información de Pago"""
@@ -124,13 +177,32 @@ class ClaseExternaDTO:
 
 @dataclass
 class PaginationInfo:
-    """Información de paginación para listas"""
+    """
+    Información de paginación para listas.
+    
+    total_items y total_pages solo se calculan si se pidió el conteo
+    (un COUNT adicional); en caso contrario son None. next_cursor es el
+    ID a pasar como cursor para obtener la página siguiente (keyset).
+    """
     page: int
     page_size: int
-    total_items: int
-    total_pages: int
+    total_items: Optional[int]
+    total_pages: Optional[int]
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[int] = None
+    
+    def to_dict(self) -> dict:
+        """Convierte la información de paginación a diccionario"""
+        return {
+            'page': self.page,
+            'page_size': self.page_size,
+            'total_items': self.total_items,
+            'total_pages': self.total_pages,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'next_cursor': self.next_cursor
+        }
 
 
 @dataclass
@@ -139,3 +211,30 @@ class PaginatedResult(Generic[T]):
     items: list[T]
     pagination: PaginationInfo
 
+
+@dataclass
+class ProgresoImportacion:
+    """
+    Progreso de una importación de socios en segundo plano.
+    
+    Se guarda como progreso (y al final como resultado) de la tarea. Solo
+    se conservan los primeros errores (ver MAX_ERRORES_REPORTADOS en
+    CSVImporterService); total_errores cuenta todos.
+    """
+    filas_procesadas: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    total_errores: int = 0
+    errores: List[str] = field(default_factory=list)
+    porcentaje: float = 0.0
+    
+    def to_dict(self) -> dict:
+        """Convierte el progreso a diccionario"""
+        return {
+            'filas_procesadas': self.filas_procesadas,
+            'creados': self.creados,
+            'actualizados': self.actualizados,
+            'total_errores': self.total_errores,
+            'errores': list(self.errores),
+            'porcentaje': self.porcentaje
+        }
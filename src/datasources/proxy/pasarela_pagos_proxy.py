@@ -5,8 +5,12 @@ Este módulo simula la integración con una pasarela de pagos externa.
 En un entorno real, se conectaría a una API de pago como Stripe, MercadoPago, etc.
 """
 import random
+from concurrent.futures import ThreadPoolExecutor, wait
+from math import ceil
 from typing import List, Dict, Optional
 from datetime import datetime, UTC
+from src.config.settings import settings
+from src.core.dtos import ResultadoVerificacionLote
 from src.datasources.proxy.base_proxy import BaseProxy
 from src.models.pago import EstadoPago
 
@@ -28,11 +32,17 @@ class PasarelaPagosProxy(BaseProxy):
                 - api_key: Clave API de la pasarela
                 - api_url: URL base de la API
                 - timeout: Timeout para las peticiones
+                - tamano_lote: Referencias por petición de verificación en lote
+                - workers_lote: Lotes que se verifican en paralelo
+                - timeout_lote: Timeout (segundos) de cada lote
         """
         super().__init__(config)
         self.api_key = self.config.get('api_key', 'test_api_key')
         self.api_url = self.config.get('api_url', 'https://api.pasarela-ficcticia.com')
         self.timeout = self.config.get('timeout', 30)
+        self.tamano_lote = self.config.get('tamano_lote', settings.proxy.pasarela_lote_tamano)
+        self.workers_lote = self.config.get('workers_lote', settings.proxy.pasarela_lote_workers)
+        self.timeout_lote = self.config.get('timeout_lote', settings.proxy.pasarela_lote_timeout)
         self.conectado = False
     
     def conectar(self) -> bool:
@@ -110,14 +120,7 @@ class PasarelaPagosProxy(BaseProxy):
             
             print(f"[PasarelaPagosProxy] Verificando pago {referencia_externa}...")
             
-            # Simular respuesta de la API (80% aprobados, 10% rechazados, 10% procesando)
-            rand = random.random()
-            if rand < 0.80:
-                estado = EstadoPago.APROBADO
-            elif rand < 0.90:
-                estado = EstadoPago.RECHAZADO
-            else:
-                estado = EstadoPago.PROCESANDO
+            estado = self._simular_estado()
             
             print(f"[PasarelaPagosProxy] Estado del pago: {estado.value}")
             return estado
@@ -126,39 +129,103 @@ class PasarelaPagosProxy(BaseProxy):
             print(f"[PasarelaPagosProxy] Error al verificar estado: {str(e)}")
             return None
     
-    def verificar_estados_lote(self, referencias: List[str]) -> Dict[str, EstadoPago]:
+    def verificar_estados_lote(self, referencias: List[str]) -> ResultadoVerificacionLote:
         """
         Verifica el estado de múltiples pagos en lote.
         
+        Las referencias se dividen en lotes de tamano_lote que se consultan
+        en paralelo (hasta workers_lote a la vez), por lo que la duración
+        total depende del lote más lento y no de la suma de las consultas.
+        Un lote que falla o supera timeout_lote no invalida a los demás:
+        sus referencias se informan como no verificadas.
+        
         Args:
             referencias: Lista de IDs de transacciones
             
         Returns:
-            Dict con referencia -> estado
+            ResultadoVerificacionLote con referencia -> estado y las
+            referencias que no se pudieron verificar
         """
+        resultado = ResultadoVerificacionLote()
+        
         if not self.conectado:
             print("[PasarelaPagosProxy] No hay conexión establecida")
-            return {}
+            resultado.no_verificadas = list(referencias)
+            resultado.errores.append("No hay conexión establecida")
+            return resultado
+        
+        if not referencias:
+            return resultado
         
+        lotes = [referencias[i:i + self.tamano_lote]
+                 for i in range(0, len(referencias), self.tamano_lote)]
+        workers = min(self.workers_lote, len(lotes))
+        print(f"[PasarelaPagosProxy] Verificando {len(referencias)} pagos "
+              f"en {len(lotes)} lotes ({workers} en paralelo)...")
+        
+        # Cada lote tiene timeout_lote; los lotes que esperan un worker libre
+        # arrancan en rondas posteriores, de ahí el plazo total
+        plazo = self.timeout_lote * ceil(len(lotes) / workers)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pasarela')
         try:
-            # En una implementación real:
-            # POST /api/v1/payments/batch-status
-            # Body: {"payment_ids": referencias}
+            futuros = {pool.submit(self._consultar_lote, lote, self.timeout_lote): lote
+                       for lote in lotes}
+            terminados, pendientes = wait(futuros, timeout=plazo)
             
-            print(f"[PasarelaPagosProxy] Verificando {len(referencias)} pagos en lote...")
+            for futuro in terminados:
+                lote = futuros[futuro]
+                try:
+                    estados = futuro.result()
+                except Exception as e:
+                    resultado.no_verificadas.extend(lote)
+                    resultado.errores.append(f"Lote de {len(lote)} pagos falló: {str(e)}")
+                    continue
+                for ref in lote:
+                    estado = estados.get(ref)
+                    if estado:
+                        resultado.estados[ref] = estado
+                    else:
+                        resultado.no_verificadas.append(ref)
             
-            resultados = {}
-            for ref in referencias:
-                estado = self.verificar_estado_pago(ref)
-                if estado:
-                    resultados[ref] = estado
-            
-            print(f"[PasarelaPagosProxy] Verificados {len(resultados)} de {len(referencias)} pagos")
-            return resultados
+            for futuro in pendientes:
+                lote = futuros[futuro]
+                resultado.no_verificadas.extend(lote)
+                resultado.errores.append(
+                    f"Lote de {len(lote)} pagos superó el timeout de {self.timeout_lote}s"
+                )
+        finally:
+            # No esperar a los lotes vencidos: sus resultados se descartan
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        print(f"[PasarelaPagosProxy] Verificados {len(resultado.estados)} de "
+              f"{len(referencias)} pagos ({len(resultado.errores)} lotes con error)")
+        return resultado
+    
+    def _consultar_lote(self, referencias: List[str], timeout: float) -> Dict[str, EstadoPago]:
+        """
+        Consulta el estado de un lote de pagos en una sola petición.
+        
+        Args:
+            referencias: IDs de transacciones del lote
+            timeout: Timeout de la petición en segundos
             
-        except Exception as e:
-            print(f"[PasarelaPagosProxy] Error en verificación de lote: {str(e)}")
-            return {}
+        Returns:
+            Dict con referencia -> estado (las desconocidas se omiten)
+        """
+        # En una implementación real:
+        # POST /api/v1/payments/batch-status (timeout=timeout)
+        # Body: {"payment_ids": referencias}
+        return {ref: self._simular_estado() for ref in referencias}
+    
+    @staticmethod
+    def _simular_estado() -> EstadoPago:
+        """Simula el estado devuelto por la API (80% aprobados, 10% rechazados, 10% procesando)"""
+        rand = random.random()
+        if rand < 0.80:
+            return EstadoPago.APROBADO
+        if rand < 0.90:
+            return EstadoPago.RECHAZADO
+        return EstadoPago.PROCESANDO
     
     def procesar_pago(self, socio_id: int, monto: float, 
                       metodo_pago: str = "tarjeta") -> Optional[str]:
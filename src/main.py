@@ -6,7 +6,7 @@ from src.config.settings import settings
 from src.core.logging_config import setup_logging, get_logger
 from src.api.controllers import (
     socio_bp, clase_bp, reserva_bp, pago_bp, 
-    plan_bp, solicitud_bp, calendario_bp, estadisticas_bp
+    plan_bp, solicitud_bp, calendario_bp, estadisticas_bp, tarea_bp
 )
 from src.exceptions.base_exceptions import FitFlowException
 from src.extensions import socketio, limiter
@@ -16,13 +16,17 @@ setup_logging(log_level=settings.app.log_level)
 logger = get_logger(__name__)
 
 
-def create_app():
+def create_app(iniciar_segundo_plano: bool = True):
     """
     Factory function para crear y configurar la aplicación Flask.
     
     Aplica el patrón Application Factory para facilitar testing
     y configuración por ambiente.
     
+    Args:
+        iniciar_segundo_plano: Si es False no se inician el ejecutor de
+            tareas ni el scheduler (para comandos como init-db)
+    
     Returns:
         Aplicación Flask configurada
     """
@@ -57,163 +61,6 @@ def create_app():
     limiter.init_app(app)
     logger.info("Extensiones inicializadas (DB, SocketIO, Limiter)")
 
-    # Carga automática de datos de prueba si la BD está vacía (solo si no es testing)
-    if not settings.app.testing:
-        with app.app_context():
-            from src.models.plan_membresia import PlanMembresia
-            try:
-                # Verificar si hay planes (indicador de BD vacía)
-                if PlanMembresia.query.count() == 0:
-                    logger.info("Base de datos vacía detectada. Cargando datos de prueba...")
-                    from init_data import init_database
-                    # Ejecutamos la lógica de init_database pero adaptada para no recrear app
-                    # Importamos las funciones necesarias de init_data
-                    from src.models import Socio, Entrenador, Horario, Clase, Reserva
-                    from src.utils.enums import DiaSemana
-                    from datetime import time
-                    from src.config.database import db
-                    
-                    # --- COPIA DE LOGICA DE CARGA DE DATOS ---
-                    # Crear planes
-                    plan_basico = PlanMembresia("Plan Básico", "Acceso a gimnasio de lunes a viernes de 6:00 a 16:00 y clases grupales básicas", 32000.0, nivel=1)
-                    plan_premium = PlanMembresia("Plan Premium", "Acceso completo al gimnasio, todas las clases grupales, nutricionista y entrenador personal", 38000.0, nivel=2)
-                    plan_estudiante = PlanMembresia("Plan Elite", "Acceso completo a todas las clases, entrenador personal dedicado, spa y área VIP", 42000.0, nivel=3)
-                    db.session.add_all([plan_basico, plan_premium, plan_estudiante])
-                    
-                    # Crear entrenadores
-                    entrenador1 = Entrenador("Carlos", "Rodríguez", "Instructor de Spinning certificado con 5 años de experiencia")
-                    entrenador2 = Entrenador("María", "García", "Profesora de Yoga y Pilates")
-                    entrenador3 = Entrenador("Juan", "Martínez", "Entrenador Personal y CrossFit")
-                    entrenador4 = Entrenador("Ana", "López", "Instructora de Zumba y Baile")
-                    entrenador5 = Entrenador("Pedro", "Sánchez", "Profesor de Funcional y TRX")
-                    db.session.add_all([entrenador1, entrenador2, entrenador3, entrenador4, entrenador5])
-                    db.session.commit()
-                    
-                    # Crear horarios y clases
-                    horario1 = Horario(DiaSemana.LUNES, time(18, 0), time(19, 0))
-                    clase1 = Clase("Spinning Intenso", "Clase de spinning de alta intensidad para quemar calorías", 20, entrenador1, horario1, imagen_url="https://images.unsplash.com/photo-1534438327276-14e5300c3a48?q=80&w=1470&auto=format&fit=crop", video_url="https://www.youtube.com/watch?v=oAPCPjnU1wA")
-                    db.session.add(clase1)
-                    db.session.flush()
-                    clase1.planes = [plan_basico]
-
-                    horario2 = Horario(DiaSemana.MIERCOLES, time(10, 0), time(10, 45))
-                    clase2 = Clase("Yoga Matutino", "Sesión de yoga relajante para comenzar el día", 15, entrenador2, horario2, imagen_url="https://images.unsplash.com/photo-1599901860904-17e6ed7083a0?q=80&w=1469&auto=format&fit=crop", video_url="https://www.youtube.com/watch?v=v7AYKMP6rOE")
-                    db.session.add(clase2)
-                    db.session.flush()
-                    clase2.planes = [plan_basico]
-
-                    horario3 = Horario(DiaSemana.MARTES, time(19, 0), time(20, 0))
-                    clase3 = Clase("CrossFit Avanzado", "Entrenamiento funcional de alta intensidad", 12, entrenador3, horario3, imagen_url="https://images.unsplash.com/photo-1534367507873-d2d7e24c797f?q=80&w=1470&auto=format&fit=crop")
-                    db.session.add(clase3)
-                    db.session.flush()
-                    clase3.planes = [plan_premium]
-
-                    horario4 = Horario(DiaSemana.JUEVES, time(18, 30), time(19, 30))
-                    clase4 = Clase("Zumba Fitness", "Baile y ejercicio cardiovascular al ritmo de música latina", 25, entrenador4, horario4, imagen_url="https://images.unsplash.com/photo-1518611012118-696072aa579a?q=80&w=1470&auto=format&fit=crop")
-                    db.session.add(clase4)
-                    db.session.flush()
-                    clase4.planes = [plan_basico]
-
-                    horario5 = Horario(DiaSemana.VIERNES, time(17, 0), time(18, 0))
-                    clase5 = Clase("Funcional TRX", "Entrenamiento funcional con bandas de suspensión", 15, entrenador5, horario5, imagen_url="https://images.unsplash.com/photo-1581009146145-b5ef050c2e1e?q=80&w=1470&auto=format&fit=crop")
-                    db.session.add(clase5)
-                    db.session.flush()
-                    clase5.planes = [plan_basico]
-
-                    horario6 = Horario(DiaSemana.LUNES, time(9, 0), time(10, 0))
-                    clase6 = Clase("Pilates", "Fortalecimiento del core y mejora de la postura", 18, entrenador2, horario6, imagen_url="https://images.unsplash.com/photo-1518609878373-06d740f60d8b?q=80&w=1470&auto=format&fit=crop")
-                    db.session.add(clase6)
-                    db.session.flush()
-                    clase6.planes = [plan_basico]
-
-                    horario7 = Horario(DiaSemana.SABADO, time(11, 0), time(12, 0))
-                    clase7 = Clase("Spinning VIP Weekend", "Clase exclusiva de spinning con instructor personalizado", 10, entrenador1, horario7, imagen_url="https://images.unsplash.com/photo-1594737625785-a6cbdabd333c?q=80&w=1470&auto=format&fit=crop")
-                    db.session.add(clase7)
-                    db.session.flush()
-                    clase7.planes = [plan_estudiante]
-
-                    db.session.commit()
-                    
-                    # Crear socios
-                    socio1 = Socio("Juan", "Pérez", "12345678", "juan.perez@example.com", plan_premium)
-                    socio2 = Socio("María", "González", "23456789", "maria.gonzalez@example.com", plan_basico)
-                    socio3 = Socio("Carlos", "Fernández", "34567890", "carlos.fernandez@example.com", plan_premium)
-                    socio4 = Socio("Ana", "Martínez", "45678901", "ana.martinez@example.com", plan_estudiante)
-                    socio5 = Socio("Luis", "Rodríguez", "56789012", "luis.rodriguez@example.com", plan_basico)
-                    socio6 = Socio("Laura", "López", "67890123", "laura.lopez@example.com", plan_premium)
-                    socio7 = Socio("Diego", "Sánchez", "78901234", "diego.sanchez@example.com", plan_estudiante)
-                    socio8 = Socio("Sofía", "Ramírez", "89012345", "sofia.ramirez@example.com", plan_basico)
-                    db.session.add_all([socio1, socio2, socio3, socio4, socio5, socio6, socio7, socio8])
-                    db.session.commit()
-                    
-                    # Crear reservas
-                    reserva1 = Reserva(socio1, clase1)
-                    reserva2 = Reserva(socio2, clase2)
-                    reserva3 = Reserva(socio3, clase3)
-                    reserva4 = Reserva(socio4, clase4)
-                    reserva5 = Reserva(socio1, clase2)
-                    reserva6 = Reserva(socio6, clase1)
-                    reserva7 = Reserva(socio6, clase3)
-                    reserva8 = Reserva(socio5, clase4)
-                    reserva9 = Reserva(socio7, clase2)
-                    reserva10 = Reserva(socio8, clase6)
-                    db.session.add_all([reserva1, reserva2, reserva3, reserva4, reserva5, reserva6, reserva7, reserva8, reserva9, reserva10])
-                    db.session.commit()
-                    
-                    logger.info("Datos de prueba cargados exitosamente")
-            except Exception as e:
-                logger.error(f"Error cargando datos de prueba: {e}")
-
-            # Actualizar imágenes faltantes en clases existentes
-            try:
-                from src.models.clase import Clase
-                from src.config.database import db
-                clases_updates = {
-                    "Spinning Intenso": {
-                        "imagen_url": "https://images.unsplash.com/photo-1534438327276-14e5300c3a48?q=80&w=1470&auto=format&fit=crop",
-                        "video_url": "https://www.youtube.com/watch?v=oAPCPjnU1wA"
-                    },
-                    "Yoga Matutino": {
-                        "imagen_url": "https://images.unsplash.com/photo-1599901860904-17e6ed7083a0?q=80&w=1469&auto=format&fit=crop",
-                        "video_url": "https://www.youtube.com/watch?v=v7AYKMP6rOE"
-                    },
-                    "CrossFit Avanzado": {
-                        "imagen_url": "https://images.unsplash.com/photo-1534367507873-d2d7e24c797f?q=80&w=1470&auto=format&fit=crop"
-                    },
-                    "Zumba Fitness": {
-                        "imagen_url": "https://images.unsplash.com/photo-1518611012118-696072aa579a?q=80&w=1470&auto=format&fit=crop"
-                    },
-                    "Funcional TRX": {
-                        "imagen_url": "https://images.unsplash.com/photo-1581009146145-b5ef050c2e1e?q=80&w=1470&auto=format&fit=crop"
-                    },
-                    "Pilates": {
-                        "imagen_url": "https://images.unsplash.com/photo-1518609878373-06d740f60d8b?q=80&w=1470&auto=format&fit=crop"
-                    },
-                    "Spinning VIP Weekend": {
-                        "imagen_url": "https://images.unsplash.com/photo-1594737625785-a6cbdabd333c?q=80&w=1470&auto=format&fit=crop"
-                    }
-                }
-                
-                for titulo, data in clases_updates.items():
-                    clase = Clase.query.filter_by(titulo=titulo).first()
-                    if clase:
-                        changed = False
-                        if not clase.imagen_url and "imagen_url" in data:
-                            clase.imagen_url = data["imagen_url"]
-                            changed = True
-                        if not clase.video_url and "video_url" in data:
-                            clase.video_url = data["video_url"]
-                            changed = True
-                        
-                        if changed:
-                            db.session.add(clase)
-                            logger.info(f"Actualizada imagen/video para clase: {titulo}")
-                
-                if db.session.dirty:
-                    db.session.commit()
-            except Exception as e:
-                logger.error(f"Error actualizando imágenes de clases: {e}")
-    
     # Registrar blueprints (controladores REST)
     app.register_blueprint(socio_bp)
     app.register_blueprint(clase_bp)
@@ -223,18 +70,29 @@ def create_app():
     app.register_blueprint(solicitud_bp)
     app.register_blueprint(calendario_bp)
     app.register_blueprint(estadisticas_bp)
+    app.register_blueprint(tarea_bp)
     logger.info("Controladores REST registrados")
     
-    # Configurar tareas programadas (scheduler)
+    # Iniciar el ejecutor de tareas en segundo plano y el scheduler
     scheduler_active = False
-    try:
-        from src.config.scheduler import configurar_tareas_programadas
-        scheduler = configurar_tareas_programadas(app)
-        scheduler_active = True
-        logger.info("Tareas asincrónicas configuradas")
-    except Exception as e:
-        logger.warning(f"No se pudieron configurar tareas asincrónicas: {e}")
-        logger.warning("La aplicación continuará sin scheduler")
+    if iniciar_segundo_plano:
+        from src.config.tareas import configurar_ejecutor_tareas
+        configurar_ejecutor_tareas(
+            app,
+            settings.tareas.workers,
+            latido_segundos=settings.tareas.latido_segundos,
+            nodo=settings.scheduler.nodo
+        )
+        logger.info("Ejecutor de tareas en segundo plano iniciado")
+        
+        try:
+            from src.config.scheduler import configurar_tareas_programadas
+            scheduler = configurar_tareas_programadas(app)
+            scheduler_active = True
+            logger.info("Tareas asincrónicas configuradas")
+        except Exception as e:
+            logger.warning(f"No se pudieron configurar tareas asincrónicas: {e}")
+            logger.warning("La aplicación continuará sin scheduler")
     
     # Manejador global de errores
     @app.errorhandler(FitFlowException)
@@ -423,17 +281,13 @@ def create_app():
                 'plan': None
             }
         elif session.get('socio_id'):
-            # Obtener información del plan del socio
+            # Plan del socio desde el resumen cacheado (sin consultas si está en cache)
             plan_info = None
             try:
-                from src.models.socio import Socio
-                socio = Socio.query.get(session.get('socio_id'))
-                if socio and socio.plan_membresia:
-                    plan_info = {
-                        'id': socio.plan_membresia.id,
-                        'titulo': socio.plan_membresia.titulo,
-                        'nivel': socio.plan_membresia.nivel
-                    }
+                from src.services.socio_service import obtener_resumen_socio
+                resumen = obtener_resumen_socio(session.get('socio_id'))
+                if resumen:
+                    plan_info = resumen['plan']
             except Exception:
                 pass
             
@@ -485,6 +339,7 @@ def create_app():
                 'solicitudes': '/api/solicitudes',
                 'calendario': '/api/calendario',
                 'estadisticas': '/api/estadisticas',
+                'tareas': '/api/tareas',
                 'health': '/health'
             }
         })
@@ -495,9 +350,10 @@ def create_app():
         Endpoint para verificar el estado del servicio.
         
         Verifica:
-        - Conectividad a la base de datos
+        - Conectividad a la base de datos y estado del pool de conexiones
         - Tiempo de respuesta
         - Uptime de la aplicación
+        - Nodo que tiene el liderazgo del scheduler
         """
         import time
         from datetime import datetime
@@ -512,11 +368,12 @@ def create_app():
         
         # Verificar conectividad a la base de datos
         try:
-            from src.config.database import db
+            from src.config.database import db, estado_pool
             db.session.execute(db.text('SELECT 1'))
             health_status['checks']['database'] = {
                 'status': 'connected',
-                'type': 'sqlite'
+                'type': db.engine.dialect.name,
+                'pool': estado_pool()
             }
         except Exception as e:
             health_status['status'] = 'unhealthy'
@@ -530,8 +387,10 @@ def create_app():
         health_status['response_time_ms'] = round(response_time_ms, 2)
         
         # Información del sistema
+        from src.config.scheduler import scheduler as task_scheduler
         health_status['checks']['scheduler'] = {
-            'status': 'running' if scheduler_active else 'stopped'
+            'status': 'running' if scheduler_active else 'stopped',
+            'liderazgo': task_scheduler.estado_liderazgo()
         }
         
         status_code = 200 if health_status['status'] == 'healthy' else 503
@@ -545,116 +404,24 @@ def init_database():
     """
     Inicializa la base de datos con datos de ejemplo.
     
-    Crea las tablas y carga datos iniciales para desarrollo/testing.
+    Crea o migra el esquema aunque la versión registrada esté al día, carga
+    los datos de ejemplo si la base está vacía y completa la imagen y el
+    video de las clases de ejemplo. Se ejecuta con `python -m src.main
+    init-db` (una vez por despliegue), no en cada arranque de la aplicación.
     """
     logger.info("Inicializando base de datos con datos de ejemplo...")
-    app = create_app()
+    # Solo prepara la base: sin ejecutor de tareas ni scheduler
+    app = create_app(iniciar_segundo_plano=False)
     
     with app.app_context():
-        from datetime import time
-        from src.config.database import db
-        from src.models import (
-            PlanMembresia, Socio, Entrenador,
-            Horario, Clase
-        )
-        from src.utils.enums import DiaSemana
-        
-        # Crear todas las tablas
-        db.create_all()
-        logger.info("Tablas de base de datos creadas")
-        
-        # Verificar si ya hay datos
-        if PlanMembresia.query.first():
-            logger.info("Base de datos ya contiene datos")
-            return
-        
-        # Crear planes de membresía
-        plan_basico = PlanMembresia(
-            "Plan Básico",
-            "Acceso a gimnasio de lunes a viernes de 6:00 a 16:00 y clases grupales básicas",
-            32000.0,
-            nivel=1
-        )
-        plan_premium = PlanMembresia(
-            "Plan Premium",
-            "Acceso completo al gimnasio, todas las clases grupales, nutricionista y entrenador personal",
-            38000.0,
-            nivel=2
-        )
-        plan_estudiante = PlanMembresia(
-            "Plan Elite",
-            "Acceso completo a todas las clases, entrenador personal dedicado, spa y área VIP",
-            42000.0,
-            nivel=3
-        )
-        
-        db.session.add_all([plan_basico, plan_premium, plan_estudiante])
-        db.session.commit()
-        logger.info("Planes de membresía creados")
-        
-        # Crear entrenadores
-        entrenador1 = Entrenador(
-            "Carlos",
-            "Rodriguez",
-            "carlos.rodriguez@fitflow.com",
-            "Instructor de Spinning"
-        )
-        entrenador2 = Entrenador(
-            "Maria",
-            "Garcia",
-            "maria.garcia@fitflow.com",
-            "Profesora de Yoga"
-        )
-        
-        db.session.add_all([entrenador1, entrenador2])
-        db.session.commit()
-        logger.info("Entrenadores creados")
-        
-        # Crear horarios y clases
-        horario1 = Horario(DiaSemana.LUNES, time(18, 0), time(19, 0))
-        horario2 = Horario(DiaSemana.MIERCOLES, time(10, 0), time(10, 45))
-        
-        db.session.add_all([horario1, horario2])
-        db.session.commit()
-        
-        clase1 = Clase(
-            "Spinning Intenso",
-            "Clase de spinning de alta intensidad",
-            20,
-            entrenador1,
-            horario1,
-            imagen_url="https://example.com/spinning.jpg"
-        )
-        clase2 = Clase(
-            "Yoga Matutino",
-            "Sesión de yoga relajante",
-            15,
-            entrenador2,
-            horario2,
-            video_url="https://example.com/yoga_demo.mp4"
-        )
-        
-        clase1.planes.append(plan_premium)
-        clase2.planes.extend([plan_basico, plan_premium])
-        
-        db.session.add_all([clase1, clase2])
-        db.session.commit()
-        logger.info("Clases creadas")
-        
-        # Crear socio de ejemplo
-        socio = Socio(
-            "Juan",
-            "Pérez",
-            "12345678",
-            "juan.perez@example.com",
-            plan_premium
-        )
+        from src.config.database import actualizar_esquema
+        from src.config.datos_demo import cargar_datos_demo, completar_multimedia_clases
         
-        db.session.add(socio)
-        db.session.commit()
-        logger.info("Socio de ejemplo creado")
+        actualizar_esquema()
+        cargar_datos_demo()
+        completar_multimedia_clases()
         
-        logger.info("Base de datos inicializada correctamente con datos de ejemplo")
+        logger.info("Base de datos inicializada correctamente")
 
 
 if __name__ == '__main__':
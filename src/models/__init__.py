@@ -9,6 +9,8 @@ from .solicitud_baja import SolicitudBaja
 from .pago import Pago, EstadoPago
 from .clase_externa import ClaseExterna
 from .lista_espera import ListaEspera
+from .estadisticas_snapshot import EstadisticasSnapshot
+from .tarea import Tarea
 
 __all__ = [
     'PlanMembresia',
@@ -22,5 +24,7 @@ __all__ = [
     'EstadoPago',
     'ClaseExterna',
     'ListaEspera',
+    'EstadisticasSnapshot',
+    'Tarea',
     'plan_clase_association'
 ]
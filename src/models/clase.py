@@ -1,7 +1,7 @@
 """Modelo de Clase"""
-from sqlalchemy import Integer, String, Text, Table, Column, ForeignKey, Boolean
+from sqlalchemy import Integer, String, Text, Table, Column, ForeignKey, Boolean, Index, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from typing import List
+from typing import List, Optional, Tuple
 from src.config.database import db
 
 
@@ -22,6 +22,10 @@ class Clase(db.Model):
     horario y un cupo máximo de participantes.
     """
     __tablename__ = 'clases'
+    __table_args__ = (
+        # Clases accesibles para un plan: nivel_minimo <= plan.nivel
+        Index('ix_clases_nivel_minimo', 'nivel_minimo'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     titulo: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -31,6 +35,23 @@ class Clase(db.Model):
     tiene_lista_espera: Mapped[bool] = mapped_column(Boolean, default=False)
     imagen_url: Mapped[str] = mapped_column(String(255), nullable=True)
     video_url: Mapped[str] = mapped_column(String(255), nullable=True)
+    # Contador desnormalizado de reservas confirmadas (ver ClaseRepository)
+    cupos_ocupados: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0'
+    )
+    # Última posición asignada en la lista de espera (ver ListaEsperaRepository)
+    ultima_posicion_espera: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0'
+    )
+    # Nivel del plan más bajo que incluye la clase (None: ningún plan).
+    # Se recalcula al asociar o quitar planes (ver ClaseRepository)
+    nivel_minimo: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     # Foreign Keys
     entrenador_id: Mapped[int] = mapped_column(
@@ -92,11 +113,17 @@ class Clase(db.Model):
         self.tiene_lista_espera = False
         self.imagen_url = imagen_url
         self.video_url = video_url
+        self.cupos_ocupados = 0
+        self.ultima_posicion_espera = 0
     
     def cupos_disponibles(self) -> int:
-        """Retorna la cantidad de cupos disponibles"""
-        reservas_confirmadas = sum(1 for r in self.reservas if r.confirmada)
-        return self.cupo_maximo - reservas_confirmadas
+        """
+        Retorna la cantidad de cupos disponibles.
+        
+        Usa el contador persistido cupos_ocupados, por lo que no necesita
+        cargar la relación reservas.
+        """
+        return self.cupo_maximo - (self.cupos_ocupados or 0)
     
     def tiene_cupo_disponible(self) -> bool:
         """Verifica si hay cupo disponible"""
@@ -110,10 +137,17 @@ class Clase(db.Model):
         """
         Retorna el plan de nivel mínimo requerido para esta clase.
         
+        Si la relación planes no está cargada usa el catálogo de planes
+        cacheado (ver catalogo_planes_service) en lugar de cargarla.
+        
         Returns:
             El plan con el nivel más bajo asociado a esta clase,
             o None si no tiene planes asociados.
         """
+        minimo = self._plan_minimo_catalogo()
+        if minimo is not None:
+            from src.models.plan_membresia import PlanMembresia
+            return db.session.get(PlanMembresia, minimo[0])
         if not self.planes:
             return None
         return min(self.planes, key=lambda p: p.nivel)
@@ -123,16 +157,27 @@ class Clase(db.Model):
         Verifica si un plan puede acceder a esta clase considerando la jerarquía.
         Un plan de nivel superior puede acceder a clases de planes inferiores.
         
+        Usa la columna persistida nivel_minimo, por lo que no necesita
+        cargar la relación planes.
+        
         Args:
             plan: Plan del socio
             
         Returns:
             True si el plan puede acceder a la clase
         """
-        if not self.planes:
-            return False
-        plan_minimo = self.plan_minimo_requerido()
-        return plan.nivel >= plan_minimo.nivel if plan_minimo else False
+        return self.nivel_minimo is not None and plan.nivel >= self.nivel_minimo
+    
+    def _plan_minimo_catalogo(self) -> Optional[Tuple[int, int]]:
+        """
+        (plan_id, nivel) del plan mínimo según el catálogo cacheado, o None
+        si la relación planes ya está cargada o la clase no figura en él.
+        """
+        if self.id is None or 'planes' not in inspect(self).unloaded:
+            return None
+        from src.services.catalogo_planes_service import obtener_catalogo_planes
+        catalogo = obtener_catalogo_planes()
+        return catalogo.plan_minimo(self.id) if catalogo else None
     
     def desactivar(self) -> None:
         """Desactiva la clase"""
@@ -0,0 +1,60 @@
+"""Modelo de Snapshot de Estadísticas"""
+from sqlalchemy import Integer, Float, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.config.database import db
+
+
+class EstadisticasSnapshot(db.Model):
+    """
+    Foto de las estadísticas del dashboard en un momento dado.
+    
+    Se genera periódicamente desde el scheduler para poder mostrar
+    tendencias históricas sin recorrer la tabla de reservas.
+    """
+    __tablename__ = 'estadisticas_snapshot'
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    fecha: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True
+    )
+    total_socios: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_clases: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_reservas: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_planes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tasa_presentismo: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    # Estadísticas completas del dashboard (clase popular, horario, plan, etc.)
+    datos: Mapped[dict] = mapped_column(JSON, nullable=False)
+    
+    def __init__(self, estadisticas: dict):
+        """
+        Inicializa un snapshot a partir de las estadísticas del dashboard.
+        
+        Args:
+            estadisticas: Diccionario devuelto por EstadisticasService.get_dashboard_stats()
+        """
+        self.fecha = datetime.utcnow()
+        self.total_socios = estadisticas['total_socios']
+        self.total_clases = estadisticas['total_clases']
+        self.total_reservas = estadisticas['total_reservas']
+        self.total_planes = estadisticas['total_planes']
+        self.tasa_presentismo = estadisticas['tasa_presentismo']
+        self.datos = estadisticas
+    
+    def to_dict(self) -> dict:
+        """Convierte el snapshot a diccionario para serialización JSON"""
+        return {
+            'fecha': self.fecha.isoformat(),
+            'total_socios': self.total_socios,
+            'total_clases': self.total_clases,
+            'total_reservas': self.total_reservas,
+            'total_planes': self.total_planes,
+            'tasa_presentismo': self.tasa_presentismo,
+            'datos': self.datos
+        }
+    
+    def __repr__(self) -> str:
+        return f"<EstadisticasSnapshot(id={self.id}, fecha={self.fecha})>"
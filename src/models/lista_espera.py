@@ -1,5 +1,5 @@
 """Modelo de Lista de Espera"""
-from sqlalchemy import Integer, DateTime, Boolean, ForeignKey, String
+from sqlalchemy import Integer, DateTime, Boolean, ForeignKey, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, timedelta
 from src.config.database import db
@@ -13,6 +13,11 @@ class ListaEspera(db.Model):
     en la lista de espera para ser notificados cuando se libere un lugar.
     """
     __tablename__ = 'lista_espera'
+    __table_args__ = (
+        Index('ix_lista_espera_clase_activo_posicion', 'clase_id', 'activo', 'posicion'),
+        # Cola de pendientes: siguientes sin notificar de una clase, en orden
+        Index('ix_lista_espera_clase_pendientes', 'clase_id', 'activo', 'notificado', 'posicion'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     fecha_inscripcion: Mapped[datetime] = mapped_column(
@@ -1,5 +1,5 @@
 """Modelo de Pago"""
-from sqlalchemy import Integer, Float, DateTime, Enum, ForeignKey, String
+from sqlalchemy import Integer, Float, DateTime, Enum, ForeignKey, String, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, UTC
 from src.config.database import db
@@ -23,6 +23,9 @@ class Pago(db.Model):
     registrando el estado del pago verificado con la pasarela externa.
     """
     __tablename__ = 'pagos'
+    __table_args__ = (
+        Index('ix_pagos_socio_periodo', 'socio_id', 'mes_periodo', 'anio_periodo'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     monto: Mapped[float] = mapped_column(Float, nullable=False)
@@ -32,7 +35,8 @@ class Pago(db.Model):
     )
     estado: Mapped[EstadoPago] = mapped_column(
         Enum(EstadoPago),
-        default=EstadoPago.PENDIENTE
+        default=EstadoPago.PENDIENTE,
+        index=True
     )
     referencia_externa: Mapped[str] = mapped_column(
         String(100),
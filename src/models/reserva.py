@@ -1,10 +1,15 @@
 """Modelo de Reserva"""
-from sqlalchemy import Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import Integer, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from src.config.database import db
 
 
+# Índice único parcial: un socio no puede tener dos reservas activas en la
+# misma clase. Las reservas canceladas no participan del índice.
+INDICE_RESERVA_ACTIVA = 'uq_reservas_socio_clase_activa'
+
+
 class Reserva(db.Model):
     """
     Representa la reserva de un socio a una clase.
@@ -13,6 +18,18 @@ class Reserva(db.Model):
     en una fecha determinada.
     """
     __tablename__ = 'reservas'
+    __table_args__ = (
+        Index('ix_reservas_socio_confirmada', 'socio_id', 'confirmada'),
+        Index('ix_reservas_clase_confirmada', 'clase_id', 'confirmada'),
+        # Reporte de asistencia: reservas de una clase por rango de fechas
+        Index('ix_reservas_clase_fecha', 'clase_id', 'fecha_reserva'),
+        Index(
+            INDICE_RESERVA_ACTIVA, 'socio_id', 'clase_id',
+            unique=True,
+            sqlite_where=text('confirmada = 1'),
+            postgresql_where=text('confirmada')
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     fecha_reserva: Mapped[datetime] = mapped_column(
@@ -1,5 +1,5 @@
 """Modelo de Solicitud de Baja"""
-from sqlalchemy import Integer, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Integer, Text, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from src.config.database import db
@@ -15,6 +15,9 @@ class SolicitudBaja(db.Model):
     por un administrador.
     """
     __tablename__ = 'solicitudes_baja'
+    __table_args__ = (
+        Index('ix_solicitudes_baja_socio_estado', 'socio_id', 'estado'),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     justificacion: Mapped[str] = mapped_column(Text, nullable=False)
@@ -0,0 +1,76 @@
+"""Modelo de Tarea en segundo plano"""
+from typing import Optional
+from sqlalchemy import String, Text, DateTime, Enum, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from src.config.database import db
+from src.utils.enums import EstadoTarea
+
+
+class Tarea(db.Model):
+    """
+    Operación larga ejecutada por el EjecutorTareas fuera del request.
+    
+    Guarda los parámetros con los que se encoló, el progreso que va
+    informando mientras corre y el resultado (o el error) al terminar.
+    Las tareas finalizadas se purgan después del período de retención.
+    
+    Mientras corre, la tarea registra el nodo que la reclamó y el último
+    latido de ese nodo: si el latido se atrasa, el proceso murió y el
+    líder del scheduler la marca como interrumpida.
+    """
+    __tablename__ = 'tareas'
+    
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    tipo: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    estado: Mapped[EstadoTarea] = mapped_column(
+        Enum(EstadoTarea),
+        nullable=False,
+        default=EstadoTarea.PENDIENTE,
+        index=True
+    )
+    parametros: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    progreso: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    resultado: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    creada_en: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    iniciada_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finalizada_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+    nodo: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    latido_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    def __init__(self, id: str, tipo: str, parametros: dict = None):
+        """
+        Inicializa una tarea pendiente.
+        
+        Args:
+            id: Identificador de la tarea
+            tipo: Tipo de tarea registrado en el EjecutorTareas
+            parametros: Parámetros para el manejador (deben ser serializables a JSON)
+        """
+        self.id = id
+        self.tipo = tipo
+        self.parametros = parametros or {}
+        self.estado = EstadoTarea.PENDIENTE
+        self.creada_en = datetime.utcnow()
+    
+    def esta_finalizada(self) -> bool:
+        """Indica si la tarea ya terminó (bien o mal)"""
+        return self.estado in (EstadoTarea.COMPLETADA, EstadoTarea.FALLIDA)
+    
+    def to_dict(self) -> dict:
+        """Convierte la tarea a diccionario para serialización JSON"""
+        return {
+            'id': self.id,
+            'tipo': self.tipo,
+            'estado': self.estado.value,
+            'progreso': self.progreso,
+            'resultado': self.resultado,
+            'error': self.error,
+            'creada_en': self.creada_en.isoformat() if self.creada_en else None,
+            'iniciada_en': self.iniciada_en.isoformat() if self.iniciada_en else None,
+            'finalizada_en': self.finalizada_en.isoformat() if self.finalizada_en else None
+        }
+    
+    def __repr__(self) -> str:
+        return f"<Tarea(id={self.id}, tipo={self.tipo}, estado={self.estado.value})>"
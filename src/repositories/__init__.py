@@ -6,6 +6,9 @@ from .clase_repository import ClaseRepository
 from .reserva_repository import ReservaRepository
 from .solicitud_baja_repository import SolicitudBajaRepository
 from .pago_repository import PagoRepository
+from .estadisticas_snapshot_repository import EstadisticasSnapshotRepository
+from .tarea_repository import TareaRepository
+from .unit_of_work import uow, en_unidad_de_trabajo
 
 __all__ = [
     'BaseRepository',
@@ -14,5 +17,9 @@ __all__ = [
     'ClaseRepository',
     'ReservaRepository',
     'SolicitudBajaRepository',
-    'PagoRepository'
+    'PagoRepository',
+    'EstadisticasSnapshotRepository',
+    'TareaRepository',
+    'uow',
+    'en_unidad_de_trabajo'
 ]
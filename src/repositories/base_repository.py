@@ -1,7 +1,10 @@
 """Repositorio base con operaciones CRUD genéricas"""
+from math import ceil
 from typing import Generic, TypeVar, List, Optional
 from sqlalchemy.orm import Session
 from src.config.database import db
+from src.core.dtos import PaginationInfo, PaginatedResult
+from src.repositories.unit_of_work import en_unidad_de_trabajo
 
 T = TypeVar('T')
 
@@ -11,6 +14,10 @@ class BaseRepository(Generic[T]):
     Repositorio base que implementa operaciones CRUD genéricas.
     
     Todas las clases de repositorio específicas deben heredar de esta clase.
+    
+    Fuera de una unidad de trabajo (ver unit_of_work.uow) cada operación
+    de escritura hace su propio commit. Dentro de una, los cambios quedan
+    en la sesión y se confirman juntos al cerrar la unidad.
     """
     
     def __init__(self, model_class: type[T]):
@@ -23,10 +30,28 @@ class BaseRepository(Generic[T]):
         self.model_class = model_class
         self.session: Session = db.session
     
+    def _confirmar(self, entity: Optional[T] = None) -> None:
+        """
+        Confirma los cambios pendientes de una operación de escritura.
+        
+        Fuera de una unidad de trabajo hace commit (y refresh de la entidad,
+        si se indica). Dentro de una no hace nada: confirma la unidad.
+        
+        Args:
+            entity: Entidad a recargar después del commit (opcional)
+        """
+        if en_unidad_de_trabajo(self.session):
+            return
+        self.session.commit()
+        if entity is not None:
+            self.session.refresh(entity)
+    
     def create(self, entity: T) -> T:
         """
         Crea una nueva entidad en la base de datos.
         
+        Dentro de una unidad de trabajo solo hace flush para asignar el ID.
+        
         Args:
             entity: Entidad a crear
             
@@ -34,8 +59,9 @@ class BaseRepository(Generic[T]):
             La entidad creada con su ID asignado
         """
         self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
+        if en_unidad_de_trabajo(self.session):
+            self.session.flush()
+        self._confirmar(entity)
         return entity
     
     def get_by_id(self, entity_id: int) -> Optional[T]:
@@ -59,6 +85,63 @@ class BaseRepository(Generic[T]):
         """
         return self.session.query(self.model_class).all()
     
+    def paginar(self, page: int = 1, page_size: int = 20,
+                filtros: Optional[list] = None, opciones: Optional[list] = None,
+                cursor: Optional[int] = None,
+                incluir_total: bool = False) -> PaginatedResult[T]:
+        """
+        Obtiene una página de entidades ordenadas por ID.
+        
+        Sin cursor usa paginación por offset (page). Con cursor usa
+        paginación keyset (WHERE id > cursor), cuyo costo no crece con
+        la profundidad de la página. Se lee un registro extra para saber
+        si hay página siguiente sin necesidad de un COUNT.
+        
+        Args:
+            page: Número de página, desde 1 (se ignora si hay cursor)
+            page_size: Cantidad de entidades por página
+            filtros: Expresiones SQLAlchemy a aplicar como WHERE (opcional)
+            opciones: Opciones de carga (joinedload, etc.) (opcional)
+            cursor: ID de la última entidad de la página anterior (opcional)
+            incluir_total: Si True, ejecuta un COUNT para informar el total
+            
+        Returns:
+            PaginatedResult con las entidades y la información de paginación
+        """
+        query = self.session.query(self.model_class)
+        for filtro in filtros or []:
+            query = query.filter(filtro)
+        
+        total_items = total_pages = None
+        if incluir_total:
+            total_items = query.order_by(None).count()
+            total_pages = ceil(total_items / page_size) if total_items else 0
+        
+        id_columna = self.model_class.id
+        if opciones:
+            query = query.options(*opciones)
+        if cursor is not None:
+            query = query.filter(id_columna > cursor).order_by(id_columna)
+        else:
+            query = query.order_by(id_columna).offset((page - 1) * page_size)
+        
+        filas = query.limit(page_size + 1).all()
+        has_next = len(filas) > page_size
+        items = filas[:page_size]
+        
+        return PaginatedResult(
+            items=items,
+            pagination=PaginationInfo(
+                page=page,
+                page_size=page_size,
+                total_items=total_items,
+                total_pages=total_pages,
+                has_next=has_next,
+                has_previous=cursor is not None or page > 1,
+                next_cursor=items[-1].id if has_next else None
+            )
+        )
+    
     def update(self, entity: T) -> T:
         """
         Actualiza una entidad existente.
@@ -70,7 +153,7 @@ class BaseRepository(Generic[T]):
             La entidad actualizada
         """
         self.session.merge(entity)
-        self.session.commit()
+        self._confirmar()
         return entity
     
     def save(self, entity: T) -> T:
@@ -91,8 +174,7 @@ class BaseRepository(Generic[T]):
             self.session.merge(entity)
         else:
             self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
+        self._confirmar(entity)
         return entity
     
     def delete(self, entity_id: int) -> bool:
@@ -108,7 +190,7 @@ class BaseRepository(Generic[T]):
         entity = self.get_by_id(entity_id)
         if entity:
             self.session.delete(entity)
-            self.session.commit()
+            self._confirmar()
             return True
         return False
     
@@ -1,24 +1,126 @@
 """Repositorio para la entidad Clase"""
-from typing import List
+from typing import Iterable, List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload, selectinload
 from src.repositories.base_repository import BaseRepository
 from src.models.clase import Clase
+from src.models.horario import Horario
+from src.models.plan_membresia import PlanMembresia
+from src.models.reserva import Reserva
 from src.utils.enums import DiaSemana
 
 
+# Perfiles de carga: relaciones que se traen junto con las clases para que
+# la serialización no dispare una consulta por fila (N+1).
+PERFIL_BASICO = 'basico'
+PERFIL_CATALOGO = 'catalogo'
+
+PERFILES_CARGA = {
+    PERFIL_BASICO: (),
+    # entrenador y horario son many-to-one (JOIN); planes en un único SELECT ... IN
+    PERFIL_CATALOGO: (
+        joinedload(Clase.entrenador),
+        joinedload(Clase.horario),
+        selectinload(Clase.planes),
+    ),
+}
+
+
 class ClaseRepository(BaseRepository[Clase]):
     """Repositorio para operaciones con Clases"""
     
     def __init__(self):
         super().__init__(Clase)
     
-    def get_clases_activas(self) -> List[Clase]:
+    def _query(self, perfil: str = PERFIL_BASICO):
+        """
+        Crea una consulta de clases con el perfil de carga indicado.
+        
+        Args:
+            perfil: Nombre del perfil de carga (ver PERFILES_CARGA)
+            
+        Returns:
+            Query de clases con las opciones de carga aplicadas
+            
+        Raises:
+            ValueError: Si el perfil no existe
+        """
+        if perfil not in PERFILES_CARGA:
+            raise ValueError(f"Perfil de carga desconocido: {perfil}")
+        return self.session.query(Clase).options(*PERFILES_CARGA[perfil])
+    
+    def get_con_perfil(self, clase_id: int, perfil: str = PERFIL_CATALOGO) -> Optional[Clase]:
+        """
+        Obtiene una clase por su ID con el perfil de carga indicado.
+        
+        Args:
+            clase_id: ID de la clase
+            perfil: Nombre del perfil de carga
+            
+        Returns:
+            La clase si existe, None en caso contrario
+        """
+        return self._query(perfil).filter(Clase.id == clase_id).first()
+    
+    def buscar(self, plan_id: int = None, dia: DiaSemana = None,
+               solo_con_cupo: bool = False, incluir_inactivas: bool = False,
+               perfil: str = PERFIL_CATALOGO,
+               nivel_plan: Optional[int] = None) -> List[Clase]:
+        """
+        Busca clases aplicando todos los filtros en SQL.
+        
+        La cantidad de consultas es constante (una por perfil de carga),
+        sin importar cuántas clases devuelva.
+        
+        Args:
+            plan_id: ID del plan que debe incluir la clase (opcional)
+            dia: Día de la semana (opcional)
+            solo_con_cupo: Si True, solo clases con cupo disponible
+            incluir_inactivas: Si True, incluye clases inactivas
+            perfil: Nombre del perfil de carga
+            nivel_plan: Nivel de un plan: solo clases accesibles con él,
+                incluidas las de planes de nivel inferior (opcional)
+            
+        Returns:
+            Lista de clases ordenadas por ID
+        """
+        query = self._query(perfil)
+        if not incluir_inactivas:
+            query = query.filter(Clase.activa == True)
+        if plan_id:
+            query = query.filter(Clase.planes.any(PlanMembresia.id == plan_id))
+        if nivel_plan is not None:
+            query = query.filter(Clase.nivel_minimo <= nivel_plan)
+        if dia:
+            query = query.filter(Clase.horario.has(Horario.dia_semana == dia))
+        if solo_con_cupo:
+            query = query.filter(Clase.cupos_ocupados < Clase.cupo_maximo)
+        return query.order_by(Clase.id).all()
+    
+    def get_con_planes(self, clase_id: int) -> Optional[Clase]:
+        """
+        Obtiene una clase con sus planes precargados.
+        
+        Args:
+            clase_id: ID de la clase
+            
+        Returns:
+            La clase si existe, None en caso contrario
+        """
+        return self.session.get(Clase, clase_id,
+                                options=[selectinload(Clase.planes)])
+    
+    def get_clases_activas(self, perfil: str = PERFIL_BASICO) -> List[Clase]:
         """
         Obtiene todas las clases activas.
         
+        Args:
+            perfil: Nombre del perfil de carga
+        
         Returns:
             Lista de clases activas
         """
-        return self.session.query(Clase).filter_by(activa=True).all()
+        return self._query(perfil).filter(Clase.activa == True).all()
     
     def find_by_plan(self, plan_id: int) -> List[Clase]:
         """
@@ -30,8 +132,6 @@ class ClaseRepository(BaseRepository[Clase]):
         Returns:
             Lista de clases del plan
         """
-        from src.models.plan_membresia import PlanMembresia
-        
         plan = self.session.get(PlanMembresia, plan_id)
         if plan:
             return [clase for clase in plan.clases if clase.activa]
@@ -47,8 +147,6 @@ class ClaseRepository(BaseRepository[Clase]):
         Returns:
             Lista de clases en ese día
         """
-        from src.models.horario import Horario
-        
         return (self.session.query(Clase)
                 .join(Horario)
                 .filter(Horario.dia_semana == dia)
@@ -62,8 +160,10 @@ class ClaseRepository(BaseRepository[Clase]):
         Returns:
             Lista de clases con cupo
         """
-        clases_activas = self.get_clases_activas()
-        return [clase for clase in clases_activas if clase.tiene_cupo_disponible()]
+        return (self.session.query(Clase)
+                .filter(Clase.activa == True)
+                .filter(Clase.cupos_ocupados < Clase.cupo_maximo)
+                .all())
 
     def find_con_lista_espera_habilitada(self) -> List[Clase]:
         """
@@ -74,3 +174,135 @@ class ClaseRepository(BaseRepository[Clase]):
         """
         return self.session.query(Clase).filter_by(activa=True, tiene_lista_espera=True).all()
 
+    def ocupar_cupo(self, clase_id: int) -> bool:
+        """
+        Incrementa atómicamente el contador de cupos ocupados de una clase.
+        
+        El UPDATE es condicional (solo aplica si queda cupo), de modo que
+        dos reservas concurrentes no pueden superar el cupo máximo.
+        No hace commit: el cambio queda en la transacción del llamador.
+        
+        Args:
+            clase_id: ID de la clase
+            
+        Returns:
+            True si se ocupó un cupo, False si la clase no tenía cupo
+        """
+        filas = (self.session.query(Clase)
+                 .filter(Clase.id == clase_id)
+                 .filter(Clase.cupos_ocupados < Clase.cupo_maximo)
+                 .update({Clase.cupos_ocupados: Clase.cupos_ocupados + 1},
+                         synchronize_session='fetch'))
+        return filas == 1
+
+    def liberar_cupo(self, clase_id: int) -> bool:
+        """
+        Decrementa atómicamente el contador de cupos ocupados de una clase.
+        
+        No hace commit: el cambio queda en la transacción del llamador.
+        
+        Args:
+            clase_id: ID de la clase
+            
+        Returns:
+            True si se liberó un cupo, False si el contador ya estaba en cero
+        """
+        filas = (self.session.query(Clase)
+                 .filter(Clase.id == clase_id)
+                 .filter(Clase.cupos_ocupados > 0)
+                 .update({Clase.cupos_ocupados: Clase.cupos_ocupados - 1},
+                         synchronize_session='fetch'))
+        return filas == 1
+
+    def recalcular_cupos_ocupados(self) -> int:
+        """
+        Reconstruye el contador cupos_ocupados a partir de las reservas confirmadas.
+        
+        Se ejecuta en un único UPDATE con subconsulta correlacionada y solo
+        modifica las clases cuyo contador quedó desincronizado.
+        
+        Returns:
+            Cantidad de clases corregidas
+        """
+        confirmadas = (select(func.count(Reserva.id))
+                       .where(Reserva.clase_id == Clase.id)
+                       .where(Reserva.confirmada == True)
+                       .scalar_subquery())
+        filas = (self.session.query(Clase)
+                 .filter(Clase.cupos_ocupados != confirmadas)
+                 .update({Clase.cupos_ocupados: confirmadas},
+                         synchronize_session=False))
+        self.session.commit()
+        return filas
+
+    def recalcular_ultima_posicion_espera(self) -> int:
+        """
+        Reconstruye el contador de posiciones de lista de espera de cada clase.
+        
+        Se usa al agregar la columna a una base existente: el contador
+        queda en la mayor posición inscripta en la clase.
+        
+        Returns:
+            Cantidad de clases corregidas
+        """
+        from src.models.lista_espera import ListaEspera
+        
+        ultima = (select(func.coalesce(func.max(ListaEspera.posicion), 0))
+                  .where(ListaEspera.clase_id == Clase.id)
+                  .scalar_subquery())
+        filas = (self.session.query(Clase)
+                 .filter(Clase.ultima_posicion_espera != ultima)
+                 .update({Clase.ultima_posicion_espera: ultima},
+                         synchronize_session=False))
+        self.session.commit()
+        return filas
+    
+    def find_accesibles_por_nivel(self, nivel: int) -> List[Clase]:
+        """
+        Encuentra las clases activas accesibles con un plan del nivel dado.
+        
+        Un plan accede a las clases de su nivel y de los inferiores: una
+        consulta por rango sobre el índice de nivel_minimo.
+        
+        Args:
+            nivel: Nivel del plan
+            
+        Returns:
+            Lista de clases accesibles, por nivel mínimo y luego por ID
+            (el orden del índice, sin ordenamiento adicional)
+        """
+        return (self.session.query(Clase)
+                .filter(Clase.nivel_minimo <= nivel, Clase.activa == True)
+                .order_by(Clase.nivel_minimo, Clase.id)
+                .all())
+    
+    def recalcular_nivel_minimo(self, clase_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recalcula el nivel mínimo de plan de las clases a partir de sus planes.
+        
+        No hace commit: se llama dentro de la operación que asocia o quita
+        planes, que confirma ambos cambios juntos.
+        
+        Args:
+            clase_ids: Clases a recalcular (None: todas)
+            
+        Returns:
+            Cantidad de clases corregidas
+        """
+        from src.models.clase import plan_clase_association
+        
+        minimo = (select(func.min(PlanMembresia.nivel))
+                  .join(plan_clase_association,
+                        plan_clase_association.c.plan_id == PlanMembresia.id)
+                  .where(plan_clase_association.c.clase_id == Clase.id)
+                  .scalar_subquery())
+        self.session.flush()
+        query = self.session.query(Clase).filter(
+            Clase.nivel_minimo.is_distinct_from(minimo))
+        if clase_ids is not None:
+            query = query.filter(Clase.id.in_(list(clase_ids)))
+        filas = query.update({Clase.nivel_minimo: minimo}, synchronize_session=False)
+        for entidad in list(self.session.identity_map.values()):
+            if isinstance(entidad, Clase):
+                self.session.expire(entidad, ['nivel_minimo'])
+        return filas
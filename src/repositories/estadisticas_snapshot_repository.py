@@ -0,0 +1,41 @@
+"""Repositorio para la entidad EstadisticasSnapshot"""
+from datetime import datetime
+from typing import List, Optional
+from src.repositories.base_repository import BaseRepository
+from src.models.estadisticas_snapshot import EstadisticasSnapshot
+
+
+class EstadisticasSnapshotRepository(BaseRepository[EstadisticasSnapshot]):
+    """Repositorio para operaciones con Snapshots de Estadísticas"""
+    
+    def __init__(self):
+        super().__init__(EstadisticasSnapshot)
+    
+    def find_desde(self, desde: datetime, hasta: Optional[datetime] = None) -> List[EstadisticasSnapshot]:
+        """
+        Obtiene los snapshots generados en un rango de fechas.
+        
+        Args:
+            desde: Fecha inicial (inclusive)
+            hasta: Fecha final (inclusive, opcional)
+            
+        Returns:
+            Lista de snapshots ordenados por fecha
+        """
+        query = self.session.query(EstadisticasSnapshot).filter(
+            EstadisticasSnapshot.fecha >= desde
+        )
+        if hasta:
+            query = query.filter(EstadisticasSnapshot.fecha <= hasta)
+        return query.order_by(EstadisticasSnapshot.fecha).all()
+    
+    def get_ultimo(self) -> Optional[EstadisticasSnapshot]:
+        """
+        Obtiene el snapshot más reciente.
+        
+        Returns:
+            El último snapshot, o None si no hay ninguno
+        """
+        return (self.session.query(EstadisticasSnapshot)
+                .order_by(EstadisticasSnapshot.fecha.desc())
+                .first())
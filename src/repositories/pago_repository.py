@@ -1,8 +1,16 @@
 """Repositorio para la entidad Pago"""
-from typing import List, Optional
+from datetime import datetime, UTC
+from typing import Dict, List, Optional
+from sqlalchemy import update
 from src.repositories.base_repository import BaseRepository
 from src.models.pago import Pago, EstadoPago
 
+# Estados que todavía esperan la verificación de la pasarela
+ESTADOS_PENDIENTES = [EstadoPago.PENDIENTE, EstadoPago.PROCESANDO]
+
+# Máximo de valores por cláusula IN (SQLite limita los parámetros por sentencia)
+TAMANO_LOTE_IN = 500
+
 
 class PagoRepository(BaseRepository[Pago]):
     """Repositorio para operaciones con Pagos"""
@@ -44,8 +52,59 @@ class PagoRepository(BaseRepository[Pago]):
             Lista de pagos en estado PENDIENTE o PROCESANDO
         """
         return self.session.query(Pago).filter(
-            Pago.estado.in_([EstadoPago.PENDIENTE, EstadoPago.PROCESANDO])
+            Pago.estado.in_(ESTADOS_PENDIENTES)
+        ).all()
+    
+    def find_referencias_pendientes(self) -> List[str]:
+        """
+        Obtiene las referencias externas de los pagos pendientes de verificación.
+        
+        Solo lee la columna, sin cargar las entidades.
+        
+        Returns:
+            Lista de referencias de pagos en estado PENDIENTE o PROCESANDO
+        """
+        filas = self.session.query(Pago.referencia_externa).filter(
+            Pago.estado.in_(ESTADOS_PENDIENTES),
+            Pago.referencia_externa.isnot(None)
         ).all()
+        return [fila.referencia_externa for fila in filas]
+    
+    def actualizar_estados_por_referencia(self, estados: Dict[str, EstadoPago]) -> Dict[EstadoPago, int]:
+        """
+        Actualiza en lote el estado de los pagos pendientes.
+        
+        Agrupa las referencias por estado resultante y ejecuta un UPDATE
+        ... WHERE referencia_externa IN (...) por grupo (partido en lotes de
+        TAMANO_LOTE_IN). Solo modifica pagos que siguen pendientes.
+        No hace commit: el llamador controla la transacción.
+        
+        Args:
+            estados: Diccionario referencia externa -> nuevo estado
+            
+        Returns:
+            Cantidad de pagos actualizados por estado
+        """
+        por_estado: Dict[EstadoPago, List[str]] = {}
+        for referencia, estado in estados.items():
+            por_estado.setdefault(estado, []).append(referencia)
+        
+        fecha_verificacion = datetime.now(UTC)
+        actualizados = {}
+        for estado, referencias in por_estado.items():
+            actualizados[estado] = 0
+            for i in range(0, len(referencias), TAMANO_LOTE_IN):
+                resultado = self.session.execute(
+                    update(Pago)
+                    .where(
+                        Pago.referencia_externa.in_(referencias[i:i + TAMANO_LOTE_IN]),
+                        Pago.estado.in_(ESTADOS_PENDIENTES)
+                    )
+                    .values(estado=estado, fecha_verificacion=fecha_verificacion)
+                    .execution_options(synchronize_session=False)
+                )
+                actualizados[estado] += resultado.rowcount
+        return actualizados
     
     def find_by_periodo(self, mes: int, anio: int) -> List[Pago]:
         """
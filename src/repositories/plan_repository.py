@@ -1,6 +1,8 @@
 """Repositorio para la entidad PlanMembresia"""
-from typing import List
+from typing import Dict, Iterable, List, Set, Tuple
+from sqlalchemy import select
 from src.repositories.base_repository import BaseRepository
+from src.models.clase import plan_clase_association
 from src.models.plan_membresia import PlanMembresia
 
 
@@ -30,3 +32,36 @@ class PlanRepository(BaseRepository[PlanMembresia]):
             El plan si existe, None en caso contrario
         """
         return self.session.query(PlanMembresia).filter_by(titulo=titulo).first()
+    
+    def get_ids_existentes(self, ids: Iterable[int]) -> Set[int]:
+        """
+        Obtiene, de un conjunto de IDs, los que corresponden a planes existentes.
+        
+        Args:
+            ids: IDs de planes a verificar
+            
+        Returns:
+            Conjunto con los IDs que existen
+        """
+        ids = list(ids)
+        if not ids:
+            return set()
+        filas = self.session.query(PlanMembresia.id).filter(PlanMembresia.id.in_(ids)).all()
+        return {fila.id for fila in filas}
+    
+    def obtener_planes_minimos_por_clase(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Obtiene, para cada clase con planes asociados, el plan de menor nivel.
+        
+        Returns:
+            Diccionario {clase_id: (plan_id, nivel)}; ante empate de nivel
+            se toma el plan de menor ID
+        """
+        filas = self.session.execute(
+            select(plan_clase_association.c.clase_id, PlanMembresia.id, PlanMembresia.nivel)
+            .join(PlanMembresia, plan_clase_association.c.plan_id == PlanMembresia.id)
+            .order_by(plan_clase_association.c.clase_id.desc(),
+                      PlanMembresia.nivel.desc(), PlanMembresia.id.desc())
+        )
+        # Orden descendente: la última fila de cada clase (la que queda) es la mínima
+        return {fila.clase_id: (fila.id, fila.nivel) for fila in filas}
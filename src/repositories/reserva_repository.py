@@ -1,7 +1,14 @@
 """Repositorio para la entidad Reserva"""
-from typing import List
+from datetime import datetime
+from typing import Iterator, List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import joinedload
 from src.repositories.base_repository import BaseRepository
+from src.core.dtos import PaginatedResult
+from src.models.clase import Clase
 from src.models.reserva import Reserva
+from src.models.socio import Socio
 
 
 class ReservaRepository(BaseRepository[Reserva]):
@@ -22,6 +29,25 @@ class ReservaRepository(BaseRepository[Reserva]):
         """
         return self.session.query(Reserva).filter_by(socio_id=socio_id).all()
     
+    def find_activas_by_socio(self, socio_id: int) -> List[Reserva]:
+        """
+        Encuentra las reservas activas de un socio, con su clase y horario
+        precargados en la misma consulta.
+        
+        Args:
+            socio_id: ID del socio
+            
+        Returns:
+            Lista de reservas activas del socio, en orden de creación
+        """
+        return (self.session.query(Reserva)
+                .options(joinedload(Reserva.clase).joinedload(Clase.horario))
+                .filter(Reserva.socio_id == socio_id)
+                .filter(Reserva.confirmada == True)
+                .filter(Reserva.fecha_cancelacion.is_(None))
+                .order_by(Reserva.id)
+                .all())
+    
     def find_by_clase(self, clase_id: int) -> List[Reserva]:
         """
         Encuentra todas las reservas de una clase.
@@ -48,3 +74,207 @@ class ReservaRepository(BaseRepository[Reserva]):
             clase_id=clase_id,
             confirmada=True
         ).all()
+    
+    def existe_activa(self, socio_id: int, clase_id: int) -> bool:
+        """
+        Verifica con un EXISTS si el socio tiene una reserva activa en la clase.
+        
+        Args:
+            socio_id: ID del socio
+            clase_id: ID de la clase
+            
+        Returns:
+            True si existe una reserva activa, False en caso contrario
+        """
+        consulta = (self.session.query(Reserva.id)
+                    .filter(Reserva.socio_id == socio_id)
+                    .filter(Reserva.clase_id == clase_id)
+                    .filter(Reserva.confirmada == True)
+                    .filter(Reserva.fecha_cancelacion.is_(None)))
+        return self.session.query(consulta.exists()).scalar()
+    
+    def _filtros_listado(self, activas: bool = False, clase_id: Optional[int] = None,
+                         socio_id: Optional[int] = None,
+                         desde: Optional[datetime] = None,
+                         hasta: Optional[datetime] = None) -> list:
+        """Arma las condiciones WHERE del listado general de reservas"""
+        filtros = []
+        if activas:
+            filtros += [Reserva.confirmada == True, Reserva.fecha_cancelacion.is_(None)]
+        if clase_id is not None:
+            filtros.append(Reserva.clase_id == clase_id)
+        if socio_id is not None:
+            filtros.append(Reserva.socio_id == socio_id)
+        if desde is not None:
+            filtros.append(Reserva.fecha_reserva >= desde)
+        if hasta is not None:
+            filtros.append(Reserva.fecha_reserva < hasta)
+        return filtros
+    
+    def listar_paginado(self, page: int = 1, page_size: int = 20,
+                        activas: bool = False, clase_id: Optional[int] = None,
+                        socio_id: Optional[int] = None,
+                        desde: Optional[datetime] = None,
+                        hasta: Optional[datetime] = None,
+                        cursor: Optional[int] = None,
+                        incluir_total: bool = False) -> PaginatedResult[Reserva]:
+        """
+        Lista reservas paginadas, filtradas en SQL, con socio y clase precargados.
+        
+        Args:
+            page: Número de página (paginación por offset)
+            page_size: Cantidad de reservas por página
+            activas: Si True, solo reservas confirmadas y no canceladas
+            clase_id: Clase a filtrar (opcional)
+            socio_id: Socio a filtrar (opcional)
+            desde: Fecha de reserva mínima, inclusive (opcional)
+            hasta: Fecha de reserva máxima, exclusiva (opcional)
+            cursor: ID de la última reserva de la página anterior (keyset, opcional)
+            incluir_total: Si True, informa el total de reservas que cumplen el filtro
+            
+        Returns:
+            PaginatedResult con las reservas de la página
+        """
+        return self.paginar(
+            page=page,
+            page_size=page_size,
+            filtros=self._filtros_listado(activas, clase_id, socio_id, desde, hasta),
+            opciones=[joinedload(Reserva.socio), joinedload(Reserva.clase)],
+            cursor=cursor,
+            incluir_total=incluir_total
+        )
+    
+    def iterar_listado(self, activas: bool = False, clase_id: Optional[int] = None,
+                       socio_id: Optional[int] = None,
+                       desde: Optional[datetime] = None,
+                       hasta: Optional[datetime] = None,
+                       tamano_lote: int = 1000) -> Iterator[Row]:
+        """
+        Recorre todas las reservas que cumplen el filtro, de a lotes, para
+        exportarlas sin cargarlas en memoria (ver iterar_asistencia).
+        
+        Args:
+            activas: Si True, solo reservas confirmadas y no canceladas
+            clase_id: Clase a filtrar (opcional)
+            socio_id: Socio a filtrar (opcional)
+            desde: Fecha de reserva mínima, inclusive (opcional)
+            hasta: Fecha de reserva máxima, exclusiva (opcional)
+            tamano_lote: Filas por lote leído de la base
+            
+        Returns:
+            Iterador de filas ordenadas por ID, con los nombres de socio y clase
+        """
+        consulta = (
+            select(Reserva.id, Reserva.socio_id,
+                   Socio.nombre.label('socio_nombre'), Socio.apellido.label('socio_apellido'),
+                   Reserva.clase_id, Clase.titulo.label('clase_titulo'),
+                   Reserva.fecha_reserva, Reserva.confirmada, Reserva.fecha_cancelacion)
+            .join(Socio, Reserva.socio_id == Socio.id)
+            .join(Clase, Reserva.clase_id == Clase.id)
+            .where(*self._filtros_listado(activas, clase_id, socio_id, desde, hasta))
+            .order_by(Reserva.id)
+            .execution_options(yield_per=tamano_lote)
+        )
+        yield from self.session.execute(consulta)
+    
+    def iterar_asistencia(self, clase_ids: Optional[List[int]] = None,
+                          desde: Optional[datetime] = None,
+                          hasta: Optional[datetime] = None,
+                          tamano_lote: int = 1000) -> Iterator[Row]:
+        """
+        Recorre las reservas con los datos del socio y de la clase, de a lotes.
+        
+        Una sola consulta con JOIN (sin cargar entidades ni relaciones) leída
+        con yield_per: la memoria usada no depende de la cantidad de
+        reservas. En PostgreSQL usa un cursor del lado del servidor.
+        
+        Args:
+            clase_ids: Clases a incluir (None: todas)
+            desde: Fecha de reserva mínima, inclusive (opcional)
+            hasta: Fecha de reserva máxima, exclusiva (opcional)
+            tamano_lote: Filas por lote leído de la base
+            
+        Returns:
+            Iterador de filas ordenadas por clase y fecha de reserva
+        """
+        consulta = (
+            select(Reserva.clase_id, Clase.titulo.label('clase_titulo'),
+                   Socio.id.label('socio_id'), Socio.nombre, Socio.apellido,
+                   Socio.dni, Socio.email, Reserva.confirmada, Reserva.fecha_reserva)
+            .join(Socio, Reserva.socio_id == Socio.id)
+            .join(Clase, Reserva.clase_id == Clase.id)
+            .order_by(Reserva.clase_id, Reserva.fecha_reserva, Reserva.id)
+            .execution_options(yield_per=tamano_lote)
+        )
+        consulta = self._filtrar_asistencia(consulta, clase_ids, desde, hasta)
+        
+        yield from self.session.execute(consulta)
+    
+    def contar_asistencia(self, clase_ids: Optional[List[int]] = None,
+                          desde: Optional[datetime] = None,
+                          hasta: Optional[datetime] = None) -> int:
+        """
+        Cuenta las reservas que recorrería iterar_asistencia con los mismos filtros.
+        
+        Returns:
+            Cantidad de filas del reporte
+        """
+        consulta = select(func.count(Reserva.id))
+        consulta = self._filtrar_asistencia(consulta, clase_ids, desde, hasta)
+        return self.session.execute(consulta).scalar_one()
+    
+    @staticmethod
+    def _filtrar_asistencia(consulta, clase_ids, desde, hasta):
+        """Aplica los filtros de clases y rango de fechas del reporte de asistencia"""
+        if clase_ids is not None:
+            consulta = consulta.where(Reserva.clase_id.in_(clase_ids))
+        if desde is not None:
+            consulta = consulta.where(Reserva.fecha_reserva >= desde)
+        if hasta is not None:
+            consulta = consulta.where(Reserva.fecha_reserva < hasta)
+        return consulta
+    
+    def cancelar_si_activa(self, reserva_id: int) -> bool:
+        """
+        Cancela una reserva solo si sigue confirmada, con un UPDATE condicional.
+        
+        Si dos requests cancelan la misma reserva a la vez, solo uno la
+        actualiza: el otro no debe liberar el cupo de nuevo. No hace
+        commit: el llamador libera el cupo en la misma transacción.
+        
+        Args:
+            reserva_id: ID de la reserva
+        
+        Returns:
+            True si esta llamada canceló la reserva
+        """
+        resultado = self.session.execute(
+            update(Reserva)
+            .where(Reserva.id == reserva_id, Reserva.confirmada == True)
+            .values(confirmada=False, fecha_cancelacion=datetime.utcnow())
+            .execution_options(synchronize_session='fetch')
+        )
+        return resultado.rowcount == 1
+    
+    def cancelar_activas_duplicadas(self) -> int:
+        """
+        Cancela las reservas activas repetidas para un mismo socio y clase,
+        conservando la más antigua.
+        
+        Se usa antes de crear el índice único de reservas activas en una
+        base que ya tiene duplicados. No hace commit: el llamador controla
+        la transacción.
+        
+        Returns:
+            Cantidad de reservas canceladas
+        """
+        primeras = (select(func.min(Reserva.id))
+                    .where(Reserva.confirmada == True)
+                    .group_by(Reserva.socio_id, Reserva.clase_id))
+        resultado = self.session.execute(
+            update(Reserva)
+            .where(Reserva.confirmada == True, Reserva.id.not_in(primeras))
+            .values(confirmada=False, fecha_cancelacion=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
@@ -1,7 +1,12 @@
 """Repositorio para la entidad Socio"""
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import joinedload
 from src.repositories.base_repository import BaseRepository
+from src.repositories.unit_of_work import en_unidad_de_trabajo
 from src.models.socio import Socio
+from src.core.dtos import PaginatedResult
+from src.utils.enums import EstadoMembresia
 
 
 class SocioRepository(BaseRepository[Socio]):
@@ -10,6 +15,46 @@ class SocioRepository(BaseRepository[Socio]):
     def __init__(self):
         super().__init__(Socio)
     
+    def get_con_plan(self, socio_id: int) -> Optional[Socio]:
+        """
+        Obtiene un socio junto con su plan de membresía en una sola consulta.
+        
+        Args:
+            socio_id: ID del socio
+            
+        Returns:
+            El socio si existe, None en caso contrario
+        """
+        return self.session.get(Socio, socio_id,
+                                options=[joinedload(Socio.plan_membresia)])
+    
+    def listar_paginado(self, page: int = 1, page_size: int = 20,
+                        estado: Optional[EstadoMembresia] = None,
+                        cursor: Optional[int] = None,
+                        incluir_total: bool = False) -> PaginatedResult[Socio]:
+        """
+        Lista socios paginados, con el plan precargado.
+        
+        Args:
+            page: Número de página (paginación por offset)
+            page_size: Cantidad de socios por página
+            estado: Estado de membresía a filtrar (opcional)
+            cursor: ID del último socio de la página anterior (keyset, opcional)
+            incluir_total: Si True, informa el total de socios que cumplen el filtro
+            
+        Returns:
+            PaginatedResult con los socios de la página
+        """
+        filtros = [Socio.estado_membresia == estado] if estado else []
+        return self.paginar(
+            page=page,
+            page_size=page_size,
+            filtros=filtros,
+            opciones=[joinedload(Socio.plan_membresia)],
+            cursor=cursor,
+            incluir_total=incluir_total
+        )
+    
     def find_by_dni(self, dni: str) -> Optional[Socio]:
         """
         Busca un socio por su DNI.
@@ -58,13 +103,107 @@ class SocioRepository(BaseRepository[Socio]):
             estado_membresia=EstadoMembresia.ACTIVA
         ).all()
 
+    def find_ids_por_dni(self, dnis: Iterable[str]) -> Dict[str, int]:
+        """
+        Obtiene en una sola consulta los IDs de los socios con los DNIs dados.
+        
+        Args:
+            dnis: DNIs a buscar
+            
+        Returns:
+            Diccionario DNI -> ID de los socios existentes
+        """
+        dnis = list(dnis)
+        if not dnis:
+            return {}
+        filas = self.session.query(Socio.dni, Socio.id).filter(Socio.dni.in_(dnis)).all()
+        return {fila.dni: fila.id for fila in filas}
+    
+    def find_dnis_por_email(self, emails: Iterable[str]) -> Dict[str, str]:
+        """
+        Obtiene en una sola consulta el DNI del socio dueño de cada email.
+        
+        Args:
+            emails: Emails a buscar
+            
+        Returns:
+            Diccionario email -> DNI de los emails ya registrados
+        """
+        emails = list(emails)
+        if not emails:
+            return {}
+        filas = self.session.query(Socio.email, Socio.dni).filter(Socio.email.in_(emails)).all()
+        return {fila.email: fila.dni for fila in filas}
+    
+    def insertar_en_lote(self, filas: List[dict]) -> None:
+        """
+        Inserta socios en lote con un único executemany.
+        
+        No hace commit: el llamador controla la transacción.
+        
+        Args:
+            filas: Diccionarios con los valores de columna de cada socio
+        """
+        if filas:
+            self.session.execute(insert(Socio), filas)
+    
+    def actualizar_en_lote(self, filas: List[dict]) -> None:
+        """
+        Actualiza socios en lote por clave primaria con un único executemany.
+        
+        No hace commit: el llamador controla la transacción.
+        
+        Args:
+            filas: Diccionarios con 'id' y las columnas a actualizar
+        """
+        if filas:
+            self.session.execute(update(Socio), filas)
+    
+    def reactivar_por_pagos(self, referencias: List[str]) -> int:
+        """
+        Reactiva en lote a los socios suspendidos con alguno de los pagos dados.
+        
+        Un UPDATE por cada TAMANO_LOTE_IN referencias, con subconsulta sobre
+        pagos (no se cargan socios ni pagos). No hace commit: el llamador
+        controla la transacción.
+        
+        Args:
+            referencias: Referencias externas de pagos aprobados
+            
+        Returns:
+            Cantidad de socios reactivados
+        """
+        from src.models.pago import Pago
+        from src.repositories.pago_repository import TAMANO_LOTE_IN
+        
+        reactivados = 0
+        for i in range(0, len(referencias), TAMANO_LOTE_IN):
+            socios_pagaron = select(Pago.socio_id).where(
+                Pago.referencia_externa.in_(referencias[i:i + TAMANO_LOTE_IN])
+            )
+            resultado = self.session.execute(
+                update(Socio)
+                .where(
+                    Socio.id.in_(socios_pagaron),
+                    Socio.estado_membresia == EstadoMembresia.SUSPENDIDA
+                )
+                .values(estado_membresia=EstadoMembresia.ACTIVA)
+                .execution_options(synchronize_session=False)
+            )
+            reactivados += resultado.rowcount
+        return reactivados
+    
     #metodo para guardar un nuevo socio
     def create(self, socio: Socio) -> Socio:
         """Guarda un nuevo socio en la base de datos"""
         try:
             self.session.add(socio)
-            self.session.commit()
+            if en_unidad_de_trabajo(self.session):
+                self.session.flush()
+            else:
+                self.session.commit()
             return socio
         except Exception as e:
-            self.session.rollback()
+            if not en_unidad_de_trabajo(self.session):
+                self.session.rollback()
             raise e
\ No newline at end of file
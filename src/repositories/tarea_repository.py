@@ -0,0 +1,209 @@
+"""Repositorio para la entidad Tarea"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import delete, func, update
+from src.repositories.base_repository import BaseRepository
+from src.models.tarea import Tarea
+from src.utils.enums import EstadoTarea
+
+
+class TareaRepository(BaseRepository[Tarea]):
+    """Repositorio para operaciones con Tareas en segundo plano"""
+    
+    def __init__(self):
+        super().__init__(Tarea)
+    
+    def get_actualizada(self, tarea_id: str) -> Optional[Tarea]:
+        """
+        Obtiene una tarea releyéndola de la base.
+        
+        Las tareas las modifican los workers desde otras sesiones, por lo
+        que no se confía en la copia que pueda tener la sesión actual.
+        
+        Args:
+            tarea_id: ID de la tarea
+        
+        Returns:
+            La tarea si existe, None en caso contrario
+        """
+        return self.session.get(Tarea, tarea_id, populate_existing=True)
+    
+    def find_recientes(self, tipo: Optional[str] = None, estado: Optional[EstadoTarea] = None,
+                       limite: int = 50) -> List[Tarea]:
+        """
+        Obtiene las tareas más recientes, opcionalmente filtradas.
+        
+        Args:
+            tipo: Tipo de tarea (opcional)
+            estado: Estado de la tarea (opcional)
+            limite: Cantidad máxima de tareas
+        
+        Returns:
+            Lista de tareas ordenadas de la más nueva a la más vieja
+        """
+        query = self.session.query(Tarea)
+        if tipo:
+            query = query.filter(Tarea.tipo == tipo)
+        if estado:
+            query = query.filter(Tarea.estado == estado)
+        return query.order_by(Tarea.creada_en.desc()).limit(limite).populate_existing().all()
+    
+    def find_activa_por_tipo(self, tipo: str) -> Optional[Tarea]:
+        """
+        Busca una tarea del tipo dado que todavía no haya terminado.
+        
+        Args:
+            tipo: Tipo de tarea
+        
+        Returns:
+            La tarea pendiente o en curso, None si no hay ninguna
+        """
+        return self.session.query(Tarea).filter(
+            Tarea.tipo == tipo,
+            Tarea.estado.in_([EstadoTarea.PENDIENTE, EstadoTarea.EN_CURSO])
+        ).first()
+    
+    def find_ids_pendientes(self, creadas_antes_de: Optional[datetime] = None) -> List[str]:
+        """
+        Obtiene los IDs de las tareas que todavía no empezaron.
+        
+        Args:
+            creadas_antes_de: Si se indica, solo las encoladas antes de esa fecha
+        
+        Returns:
+            Lista de IDs en orden de creación
+        """
+        query = self.session.query(Tarea.id).filter(Tarea.estado == EstadoTarea.PENDIENTE)
+        if creadas_antes_de is not None:
+            query = query.filter(Tarea.creada_en < creadas_antes_de)
+        return [fila.id for fila in query.order_by(Tarea.creada_en).all()]
+    
+    def reclamar(self, tarea_id: str, nodo: Optional[str] = None) -> bool:
+        """
+        Pasa una tarea de pendiente a en curso con un UPDATE condicional.
+        
+        Si dos workers intentan reclamar la misma tarea, la base deja que
+        solo uno la actualice; el otro no debe ejecutarla.
+        
+        Args:
+            tarea_id: ID de la tarea
+            nodo: Proceso que la reclama (host:pid)
+        
+        Returns:
+            True si este llamador obtuvo la tarea
+        """
+        ahora = datetime.utcnow()
+        resultado = self.session.execute(
+            update(Tarea)
+            .where(Tarea.id == tarea_id, Tarea.estado == EstadoTarea.PENDIENTE)
+            .values(estado=EstadoTarea.EN_CURSO, iniciada_en=ahora, nodo=nodo, latido_en=ahora)
+        )
+        self.session.commit()
+        return resultado.rowcount == 1
+    
+    def finalizar(self, tarea_id: str, nodo: Optional[str], estado: EstadoTarea,
+                  resultado: Optional[dict] = None, error: Optional[str] = None) -> bool:
+        """
+        Guarda el resultado de una tarea solo si sigue en curso en el nodo dado.
+        
+        Si el líder ya la dio por interrumpida (el latido se atrasó), el
+        resultado del worker lento no pisa ese estado.
+        
+        Args:
+            tarea_id: ID de la tarea
+            nodo: Proceso que la ejecutó (host:pid)
+            estado: Estado final (completada o fallida)
+            resultado: Resultado del manejador
+            error: Mensaje de error, si falló
+        
+        Returns:
+            True si se guardó el resultado
+        """
+        resultado_update = self.session.execute(
+            update(Tarea)
+            .where(Tarea.id == tarea_id, Tarea.estado == EstadoTarea.EN_CURSO, Tarea.nodo == nodo)
+            .values(estado=estado, resultado=resultado, error=error,
+                    finalizada_en=datetime.utcnow())
+        )
+        self.session.commit()
+        return resultado_update.rowcount == 1
+    
+    def registrar_latido(self, nodo: str) -> int:
+        """
+        Renueva el latido de las tareas en curso de un nodo.
+        
+        Args:
+            nodo: Proceso que ejecuta las tareas (host:pid)
+        
+        Returns:
+            Cantidad de tareas renovadas
+        """
+        resultado = self.session.execute(
+            update(Tarea)
+            .where(Tarea.nodo == nodo, Tarea.estado == EstadoTarea.EN_CURSO)
+            .values(latido_en=datetime.utcnow())
+        )
+        self.session.commit()
+        return resultado.rowcount
+    
+    def marcar_interrumpidas(self, latido_antes_de: datetime) -> int:
+        """
+        Marca como fallidas las tareas en curso cuyo nodo dejó de latir
+        (ej. porque el proceso que las ejecutaba se reinició).
+        
+        Las tareas en curso de los nodos vivos no se tocan: su latido se
+        renueva mientras corren.
+        
+        Args:
+            latido_antes_de: Las tareas sin latido desde esta fecha se dan
+                por interrumpidas
+        
+        Returns:
+            Cantidad de tareas marcadas
+        """
+        resultado = self.session.execute(
+            update(Tarea)
+            .where(
+                Tarea.estado == EstadoTarea.EN_CURSO,
+                func.coalesce(Tarea.latido_en, Tarea.iniciada_en) < latido_antes_de
+            )
+            .values(
+                estado=EstadoTarea.FALLIDA,
+                error='Interrumpida: el proceso que la ejecutaba dejó de responder',
+                finalizada_en=datetime.utcnow()
+            )
+        )
+        self.session.commit()
+        return resultado.rowcount
+    
+    def actualizar_progreso(self, tarea_id: str, progreso: dict) -> None:
+        """
+        Guarda el progreso informado por una tarea en curso.
+        
+        Args:
+            tarea_id: ID de la tarea
+            progreso: Progreso (serializable a JSON)
+        """
+        self.session.execute(
+            update(Tarea).where(Tarea.id == tarea_id).values(progreso=progreso)
+        )
+        self.session.commit()
+    
+    def purgar_finalizadas(self, antes_de: datetime) -> int:
+        """
+        Elimina las tareas que terminaron antes de la fecha dada.
+        
+        Args:
+            antes_de: Fecha límite de finalización
+        
+        Returns:
+            Cantidad de tareas eliminadas
+        """
+        resultado = self.session.execute(
+            delete(Tarea).where(
+                Tarea.estado.in_([EstadoTarea.COMPLETADA, EstadoTarea.FALLIDA]),
+                Tarea.finalizada_en < antes_de
+            )
+        )
+        self.session.commit()
+        return resultado.rowcount
@@ -0,0 +1,56 @@
+"""Unidad de trabajo: agrupa varias operaciones de repositorio en una transacción"""
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy.orm import Session
+from src.config.database import db
+
+# Clave en Session.info con la profundidad de unidades de trabajo abiertas
+_CLAVE_UOW = 'uow_profundidad'
+
+
+def en_unidad_de_trabajo(session: Session = None) -> bool:
+    """
+    Indica si hay una unidad de trabajo abierta sobre la sesión.
+    
+    Args:
+        session: Sesión a consultar (default: db.session)
+    
+    Returns:
+        True si los repositorios deben diferir el commit
+    """
+    session = session if session is not None else db.session
+    return session.info.get(_CLAVE_UOW, 0) > 0
+
+
+@contextmanager
+def uow() -> Iterator[Session]:
+    """
+    Abre una unidad de trabajo sobre la sesión actual.
+    
+    Dentro del bloque los repositorios no hacen commit ni refresh:
+    create() solo hace flush (para asignar el ID) y save/update/delete
+    dejan los cambios en la sesión. Al salir del bloque se hace un único
+    commit, o rollback si se produjo una excepción. Las unidades anidadas
+    se suman a la exterior, que es la única que confirma.
+    
+    Uso:
+        with uow():
+            socio_repo.update(socio)
+            solicitud_repo.create(solicitud)
+    
+    Yields:
+        La sesión de la unidad de trabajo
+    """
+    session = db.session
+    profundidad = session.info.get(_CLAVE_UOW, 0)
+    session.info[_CLAVE_UOW] = profundidad + 1
+    try:
+        yield session
+        if profundidad == 0:
+            session.commit()
+    except BaseException:
+        if profundidad == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_CLAVE_UOW] = profundidad
@@ -2,6 +2,10 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date, time, timedelta
 from enum import Enum
+from flask import current_app, has_app_context
+from src.config.database import incrementar_version_catalogo, version_catalogo
+from src.config.settings import settings
+from src.core.cache import CacheSWR, VersionCompartida, crear_cache
 from src.services.clase_service import ClaseService
 from src.datasources.proxy.clases_externas_proxy import ClasesExternasProxy
 from src.models.clase import Clase
@@ -10,6 +14,15 @@ from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+PREFIJO_CACHE_CALENDARIO = 'calendario:'
+
+# Fila de catalogo_version que versiona el calendario. Con el backend
+# 'memoria' cada worker tiene su propio cache: al invalidar se incrementa la
+# versión y los demás workers la consultan cada INTERVALO_VERIFICACION_SEGUNDOS
+# y descartan su copia si cambió.
+CLAVE_VERSION_CALENDARIO = 'calendario'
+INTERVALO_VERIFICACION_SEGUNDOS = 5
+
 
 class ModoVisualizacion(Enum):
     """Modos de visualización del calendario"""
@@ -82,6 +95,78 @@ class EventoCalendario:
             'proveedor': self.proveedor,
             'url_inscripcion': self.url_inscripcion
         }
+    
+    @classmethod
+    def from_dict(cls, datos: Dict[str, Any]) -> 'EventoCalendario':
+        """Reconstruye un evento a partir del diccionario generado por to_dict()"""
+        return cls(
+            id=datos['id'],
+            titulo=datos['titulo'],
+            instructor=datos['instructor'],
+            fecha=date.fromisoformat(datos['fecha']),
+            hora_inicio=time.fromisoformat(datos['hora_inicio']),
+            duracion_minutos=datos['duracion_minutos'],
+            cupo_maximo=datos['cupo_maximo'],
+            cupos_disponibles=datos['cupos_disponibles'],
+            tipo=datos['tipo'],
+            descripcion=datos['descripcion'],
+            ubicacion=datos['ubicacion'],
+            proveedor=datos['proveedor'],
+            url_inscripcion=datos['url_inscripcion']
+        )
+
+
+def _verificar_version(cache: CacheSWR) -> None:
+    """Descarta el calendario cacheado si otro worker publicó una versión nueva"""
+    version = current_app.extensions.get('calendario_version')
+    if version is None:
+        version = VersionCompartida(lambda: version_catalogo(CLAVE_VERSION_CALENDARIO),
+                                    INTERVALO_VERIFICACION_SEGUNDOS)
+        current_app.extensions['calendario_version'] = version
+    try:
+        if version.cambio():
+            cache.invalidar(PREFIJO_CACHE_CALENDARIO)
+    except Exception as e:
+        logger.error(f"Error verificando la versión del calendario: {e}")
+
+
+def obtener_cache_calendario() -> Optional[CacheSWR]:
+    """
+    Obtiene el cache del calendario de la aplicación actual.
+    
+    Se crea la primera vez que se usa y queda guardado en app.extensions,
+    de modo que cada aplicación tiene su propio cache. Antes de devolverlo
+    verifica (cada INTERVALO_VERIFICACION_SEGUNDOS) si otro worker lo
+    invalidó.
+    
+    Returns:
+        CacheSWR, o None si no hay contexto de aplicación
+    """
+    if not has_app_context():
+        return None
+    cache = current_app.extensions.get('calendario_cache')
+    if cache is None:
+        cache = crear_cache(settings.cache)
+        current_app.extensions['calendario_cache'] = cache
+    _verificar_version(cache)
+    return cache
+
+
+def invalidar_cache_calendario() -> None:
+    """
+    Invalida el calendario cacheado (ej. al crear o cancelar una reserva)
+    en este worker e incrementa la versión para que los demás lo descarten.
+    """
+    try:
+        incrementar_version_catalogo(CLAVE_VERSION_CALENDARIO)
+    except Exception as e:
+        logger.error(f"Error incrementando la versión del calendario: {e}")
+    try:
+        cache = obtener_cache_calendario()
+        if cache is not None:
+            cache.invalidar(PREFIJO_CACHE_CALENDARIO)
+    except Exception as e:
+        logger.error(f"Error invalidando cache del calendario: {e}")
 
 
 class AgregadorHorariosService:
@@ -99,7 +184,6 @@ class AgregadorHorariosService:
         self.clase_service = ClaseService()
         self.clases_externas_proxy = None
         self._ultimo_update = None
-        self._cache_eventos = []
         
     def inicializar_proxies(self) -> None:
         """Inicializa las conexiones con fuentes proxy"""
@@ -249,6 +333,79 @@ class AgregadorHorariosService:
         """
         Obtiene el calendario consolidado de todas las fuentes.
         
+        El resultado se sirve desde el cache del calendario (clave por modo
+        y rango de fechas) con política stale-while-revalidate; solo se
+        consulta la base y el proxy externo cuando no hay entrada vigente.
+        
+        Args:
+            modo: Modo de visualización (NORMAL o OCUPADO)
+            fecha_desde: Fecha inicial del rango (opcional)
+            fecha_hasta: Fecha final del rango (opcional)
+            
+        Returns:
+            Lista consolidada de eventos ordenados por fecha y hora
+        """
+        entrada = self._obtener_entrada_cache(modo, fecha_desde, fecha_hasta)
+        if entrada is None:
+            return self._construir_calendario(modo, fecha_desde, fecha_hasta)
+        
+        self._ultimo_update = datetime.fromtimestamp(entrada.creado_en)
+        return [EventoCalendario.from_dict(datos) for datos in entrada.valor]
+    
+    def _clave_cache(self, modo: ModoVisualizacion, fecha_desde: Optional[date],
+                     fecha_hasta: Optional[date]) -> str:
+        """Genera la clave de cache para un modo y rango de fechas"""
+        desde = fecha_desde.isoformat() if fecha_desde else ''
+        hasta = fecha_hasta.isoformat() if fecha_hasta else ''
+        return f"{PREFIJO_CACHE_CALENDARIO}{modo.value}:{desde}:{hasta}"
+    
+    def _obtener_entrada_cache(self, modo: ModoVisualizacion,
+                               fecha_desde: Optional[date] = None,
+                               fecha_hasta: Optional[date] = None,
+                               forzar: bool = False):
+        """
+        Obtiene la entrada cacheada del calendario, calculándola si hace falta.
+        
+        Args:
+            modo: Modo de visualización
+            fecha_desde: Fecha inicial del rango (opcional)
+            fecha_hasta: Fecha final del rango (opcional)
+            forzar: Si True, recalcula aunque la entrada esté vigente
+            
+        Returns:
+            EntradaCache con la lista de eventos serializados, o None si no
+            hay contexto de aplicación (sin cache disponible)
+        """
+        cache = obtener_cache_calendario()
+        if cache is None:
+            return None
+        
+        clave = self._clave_cache(modo, fecha_desde, fecha_hasta)
+        
+        def calcular():
+            eventos = self._construir_calendario(modo, fecha_desde, fecha_hasta)
+            return [evento.to_dict() for evento in eventos]
+        
+        if forzar:
+            return cache.refrescar(clave, calcular)
+        
+        app = current_app._get_current_object()
+        
+        def en_contexto(tarea):
+            with app.app_context():
+                tarea()
+        
+        return cache.obtener(clave, calcular, ejecutar_en_segundo_plano=en_contexto)
+    
+    def _construir_calendario(
+        self,
+        modo: ModoVisualizacion,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None
+    ) -> List[EventoCalendario]:
+        """
+        Construye el calendario consolidado consultando todas las fuentes.
+        
         Args:
             modo: Modo de visualización (NORMAL o OCUPADO)
             fecha_desde: Fecha inicial del rango (opcional)
@@ -293,17 +450,28 @@ class AgregadorHorariosService:
         Actualiza el calendario consolidado.
         
         Este método debe ser llamado periódicamente (ej. cada hora)
-        para mantener el calendario actualizado.
+        para mantener el calendario actualizado. Descarta las entradas
+        cacheadas y vuelve a calcular las vistas sin rango de fechas.
         """
         logger.info("Actualizando calendario consolidado...")
-        self._cache_eventos = self.obtener_calendario_consolidado()
+        invalidar_cache_calendario()
+        
+        entradas = {
+            modo: self._obtener_entrada_cache(modo, forzar=True)
+            for modo in ModoVisualizacion
+        }
+        completo = entradas[ModoVisualizacion.OCUPADO]
+        total = len(completo.valor) if completo else 0
         self._ultimo_update = datetime.now()
-        logger.info(f"Calendario actualizado: {len(self._cache_eventos)} eventos en cache")
+        logger.info(f"Calendario actualizado: {total} eventos en cache")
     
     def obtener_estadisticas_calendario(self) -> Dict[str, Any]:
         """
         Obtiene estadísticas del calendario consolidado.
         
+        Se calculan sobre la vista completa (modo OCUPADO) cacheada, sin
+        volver a consultar las fuentes si el cache está vigente.
+        
         Returns:
             Diccionario con estadísticas
         """
@@ -0,0 +1,120 @@
+"""Catálogo de planes cacheado en memoria para resolver el plan mínimo de cada clase"""
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy.orm import Session
+from src.config.database import db, incrementar_version_catalogo, leer_version_catalogo
+from src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Fila de catalogo_version que versiona los planes y su relación con las clases.
+# Cada cambio hecho por los servicios incrementa la versión; los demás workers
+# la consultan cada INTERVALO_VERIFICACION_SEGUNDOS y recargan si cambió. El
+# TTL acota lo que puede quedar desactualizado si el cambio se hace por fuera
+# de los servicios.
+CLAVE_CATALOGO_PLANES = 'planes'
+INTERVALO_VERIFICACION_SEGUNDOS = 5
+TTL_CATALOGO_PLANES_SEGUNDOS = 300
+
+
+@dataclass(frozen=True)
+class CatalogoPlanes:
+    """
+    Foto del plan mínimo (y su nivel) de cada clase.
+    
+    Solo incluye las clases que tienen al menos un plan asociado.
+    """
+    version: int
+    minimos: Dict[int, Tuple[int, int]]
+    construido_en: float
+    
+    def plan_minimo(self, clase_id: int) -> Optional[Tuple[int, int]]:
+        """Devuelve (plan_id, nivel) del plan mínimo de la clase, o None"""
+        return self.minimos.get(clase_id)
+
+
+class _EstadoCatalogo:
+    """Catálogo vigente de una aplicación y el momento de su última verificación"""
+    
+    def __init__(self):
+        self.catalogo: Optional[CatalogoPlanes] = None
+        self.verificado_en = 0.0
+
+
+def _estado() -> Optional[_EstadoCatalogo]:
+    """Obtiene el estado del catálogo de la aplicación actual (en app.extensions)"""
+    if not has_app_context():
+        return None
+    estado = current_app.extensions.get('catalogo_planes')
+    if estado is None:
+        estado = _EstadoCatalogo()
+        current_app.extensions['catalogo_planes'] = estado
+    return estado
+
+
+def _construir_catalogo() -> CatalogoPlanes:
+    """
+    Carga el catálogo con una consulta (más la de la versión).
+    
+    Usa una sesión propia para leer solo datos confirmados: cambios sin
+    confirmar de la sesión del request no deben quedar en el cache.
+    """
+    from src.repositories.plan_repository import PlanRepository
+    
+    with Session(db.engine) as sesion:
+        repo = PlanRepository()
+        repo.session = sesion
+        version = leer_version_catalogo(sesion, CLAVE_CATALOGO_PLANES)
+        catalogo = CatalogoPlanes(
+            version=version,
+            minimos=repo.obtener_planes_minimos_por_clase(),
+            construido_en=time.time()
+        )
+    logger.debug(f"Catálogo de planes cargado (versión {version})")
+    return catalogo
+
+
+def obtener_catalogo_planes() -> Optional[CatalogoPlanes]:
+    """
+    Obtiene el catálogo de planes vigente, recargándolo si cambió la versión.
+    
+    Returns:
+        El catálogo, o None fuera de un contexto de aplicación (el llamador
+        debe resolver con las relaciones del modelo)
+    """
+    estado = _estado()
+    if estado is None:
+        return None
+    ahora = time.time()
+    catalogo = estado.catalogo
+    vigente = catalogo is not None and ahora - catalogo.construido_en < TTL_CATALOGO_PLANES_SEGUNDOS
+    if vigente and ahora - estado.verificado_en < INTERVALO_VERIFICACION_SEGUNDOS:
+        return catalogo
+    if vigente:
+        with Session(db.engine) as sesion:
+            vigente = leer_version_catalogo(sesion, CLAVE_CATALOGO_PLANES) == catalogo.version
+    if not vigente:
+        catalogo = _construir_catalogo()
+        estado.catalogo = catalogo
+    estado.verificado_en = ahora
+    return catalogo
+
+
+def invalidar_catalogo_planes() -> None:
+    """
+    Descarta el catálogo de planes en este worker e incrementa la versión
+    en la base para que los demás lo recarguen.
+    
+    Se llama después de confirmar un cambio en los planes (nivel, alta,
+    baja) o en las clases que incluye cada plan.
+    """
+    try:
+        incrementar_version_catalogo(CLAVE_CATALOGO_PLANES)
+    except Exception as e:
+        logger.error(f"Error incrementando la versión del catálogo de planes: {e}")
+    
+    estado = _estado()
+    if estado is not None:
+        estado.catalogo = None
@@ -1,6 +1,9 @@
 """Servicio de gestión de Clases"""
-from typing import List, Optional
-from src.repositories.clase_repository import ClaseRepository
+from datetime import date
+from typing import Iterator, List, Optional
+from src.exceptions.base_exceptions import NotFoundException
+from src.repositories.clase_repository import ClaseRepository, PERFIL_CATALOGO
+from src.repositories.plan_repository import PlanRepository
 from src.models.clase import Clase
 from src.models.entrenador import Entrenador
 from src.models.horario import Horario
@@ -12,6 +15,7 @@ class ClaseService:
     
     def __init__(self):
         self.clase_repo = ClaseRepository()
+        self.plan_repo = PlanRepository()
     
     def crear_clase(self, titulo: str, descripcion: str, cupo_maximo: int,
                    entrenador: Entrenador, horario: Horario,
@@ -57,8 +61,8 @@ class ClaseService:
         return self.clase_repo.get_by_id(clase_id)
     
     def listar_clases_activas(self) -> List[Clase]:
-        """Lista todas las clases activas"""
-        return self.clase_repo.get_clases_activas()
+        """Lista todas las clases activas (con entrenador, horario y planes precargados)"""
+        return self.clase_repo.get_clases_activas(perfil=PERFIL_CATALOGO)
     
     def listar_clases_por_plan(self, plan_id: int) -> List[Clase]:
         """
@@ -89,34 +93,49 @@ class ClaseService:
         return self.clase_repo.find_con_cupo_disponible()
     
     def filtrar_clases(self, plan_id: int = None, dia: DiaSemana = None,
-                      solo_con_cupo: bool = False) -> List[Clase]:
+                      solo_con_cupo: bool = False,
+                      incluir_inactivas: bool = False,
+                      plan_accesible_id: int = None) -> List[Clase]:
         """
         Filtra clases según criterios múltiples.
         
+        Los filtros se resuelven en la base de datos y las clases se
+        devuelven con el perfil de carga de catálogo (entrenador, horario
+        y planes precargados).
+        
         Args:
-            plan_id: ID del plan (opcional)
+            plan_id: ID del plan que incluye la clase (opcional)
             dia: Día de la semana (opcional)
             solo_con_cupo: Si True, solo muestra clases con cupo disponible
+            incluir_inactivas: Si True, incluye clases inactivas
+            plan_accesible_id: ID de un plan: solo clases a las que da
+                acceso según la jerarquía de niveles (opcional)
             
         Returns:
             Lista de clases filtradas
+            
+        Raises:
+            NotFoundException: Si plan_accesible_id no corresponde a un plan
         """
-        # Partir de todas las clases activas
-        clases = self.clase_repo.get_clases_activas()
-        
-        # Filtrar por plan
-        if plan_id:
-            clases = [c for c in clases if any(p.id == plan_id for p in c.planes)]
-        
-        # Filtrar por día
-        if dia:
-            clases = [c for c in clases if c.horario.dia_semana == dia]
-        
-        # Filtrar por cupo disponible
-        if solo_con_cupo:
-            clases = [c for c in clases if c.tiene_cupo_disponible()]
-        
-        return clases
+        nivel_plan = None
+        if plan_accesible_id is not None:
+            plan = self.plan_repo.get_by_id(plan_accesible_id)
+            if plan is None:
+                raise NotFoundException('Plan', plan_accesible_id)
+            nivel_plan = plan.nivel
+        
+        return self.clase_repo.buscar(
+            plan_id=plan_id,
+            dia=dia,
+            solo_con_cupo=solo_con_cupo,
+            incluir_inactivas=incluir_inactivas,
+            perfil=PERFIL_CATALOGO,
+            nivel_plan=nivel_plan
+        )
+    
+    def obtener_clase_detalle(self, clase_id: int) -> Optional[Clase]:
+        """Obtiene una clase por su ID con entrenador, horario y planes precargados"""
+        return self.clase_repo.get_con_perfil(clase_id, PERFIL_CATALOGO)
     
     def desactivar_clase(self, clase_id: int) -> None:
         """
@@ -135,44 +154,30 @@ class ClaseService:
         clase.desactivar()
         self.clase_repo.update(clase)
 
-    def generar_reporte_asistencia(self, clase_id: int) -> str:
+    def generar_reporte_asistencia(self, clase_id: int, formato: str = 'csv',
+                                   fecha_desde: Optional[date] = None,
+                                   fecha_hasta: Optional[date] = None) -> Iterator[bytes]:
         """
-        Genera un reporte de asistencia en formato CSV.
+        Genera el reporte de asistencia de una clase por partes.
+        
+        Ver ReporteAsistenciaService: una sola consulta leída de a lotes,
+        escrita a la salida a medida que se lee.
         
         Args:
             clase_id: ID de la clase
+            formato: 'csv', 'xlsx' o 'parquet'
+            fecha_desde: Primer día de reservas a incluir (opcional)
+            fecha_hasta: Último día de reservas a incluir (opcional)
             
         Returns:
-            String con el contenido CSV
+            Generador de bytes del archivo
             
         Raises:
-            ValueError: Si la clase no existe
+            NotFoundException: Si la clase no existe
+            ValidationException: Si el formato o el rango no son válidos
         """
-        clase = self.obtener_clase(clase_id)
-        if not clase:
-            raise ValueError(f"Clase con ID {clase_id} no existe")
-            
-        import io
-        import csv
+        from src.services.reporte_asistencia_service import ReporteAsistenciaService
         
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow(['Socio ID', 'Nombre', 'Apellido', 'DNI', 'Email', 'Estado Reserva', 'Fecha Reserva'])
-        
-        # Rows
-        for reserva in clase.reservas:
-            socio = reserva.socio
-            estado = "Confirmada" if reserva.confirmada else "Cancelada"
-            writer.writerow([
-                socio.id,
-                socio.nombre,
-                socio.apellido,
-                socio.dni,
-                socio.email,
-                estado,
-                reserva.fecha_reserva.strftime("%Y-%m-%d %H:%M:%S")
-            ])
-            
-        return output.getvalue()
+        return ReporteAsistenciaService().exportar(
+            [clase_id], fecha_desde, fecha_hasta, formato
+        )
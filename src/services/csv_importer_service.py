@@ -1,9 +1,26 @@
 """Servicio de importación de socios desde CSV"""
-import pandas as pd
-from typing import List, Dict
+import os
+from typing import IO, TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple, Union
+from src.core.dtos import ProgresoImportacion
+from src.core.logging_config import get_logger
 from src.repositories.socio_repository import SocioRepository
 from src.repositories.plan_repository import PlanRepository
-from src.models.socio import Socio
+from src.services.socio_service import invalidar_resumen_socio
+from src.utils.enums import RolUsuario, EstadoMembresia
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = get_logger(__name__)
+
+
+COLUMNAS_REQUERIDAS = ['Nombre', 'Apellido', 'DNI', 'Email', 'ID Plan Membresía']
+
+# Filas que se leen del archivo y se escriben por transacción
+TAMANO_LOTE = 1000
+
+# Errores que se conservan en el progreso de una importación en segundo plano
+MAX_ERRORES_REPORTADOS = 100
 
 
 class CSVImporterService:
@@ -12,21 +29,30 @@ class CSVImporterService:
     
     Formato esperado del CSV:
     Nombre, Apellido, DNI, Email, ID Plan Membresía
+    
+    El archivo se lee de a TAMANO_LOTE filas, por lo que la memoria usada
+    no depende de su tamaño. Cada lote se valida por columnas con pandas
+    y se escribe con un INSERT executemany para los socios nuevos y un
+    UPDATE executemany para los existentes, con un commit por lote.
+    
+    pandas se importa recién al importar o exportar, no al cargar la
+    aplicación.
     """
     
     def __init__(self):
         self.socio_repo = SocioRepository()
         self.plan_repo = PlanRepository()
     
-    def importar_socios(self, ruta_archivo: str) -> Dict[str, any]:
+    def importar_socios(self, origen: Union[str, IO]) -> Dict[str, any]:
         """
         Importa socios desde un archivo CSV.
         
         Si un socio con el mismo DNI ya existe, se actualizan sus datos.
         
         Args:
-            ruta_archivo: Ruta al archivo CSV
-            
+            origen: Ruta al archivo CSV o archivo abierto (ej. el stream
+                de un upload)
+        
         Returns:
             Diccionario con estadísticas de la importación:
             - total: Total de registros procesados
@@ -34,34 +60,19 @@ class CSVImporterService:
             - actualizados: Cantidad de socios actualizados
             - errores: Lista de errores encontrados
         """
-        estadisticas = {
-            'total': 0,
-            'creados': 0,
-            'actualizados': 0,
-            'errores': []
-        }
+        import pandas as pd
+        
+        estadisticas = self._estadisticas_vacias()
         
         try:
-            # Leer el archivo CSV
-            df = pd.read_csv(ruta_archivo)
-            
-            # Validar columnas requeridas
-            columnas_requeridas = ['Nombre', 'Apellido', 'DNI', 'Email', 'ID Plan Membresía']
-            if not all(col in df.columns for col in columnas_requeridas):
-                raise ValueError(f"El CSV debe contener las columnas: {columnas_requeridas}")
-            
-            estadisticas['total'] = len(df)
-            
-            # Procesar cada fila
-            for index, row in df.iterrows():
-                try:
-                    self._procesar_fila(row, estadisticas)
-                except Exception as e:
-                    error_msg = f"Error en fila {index + 2}: {str(e)}"
-                    estadisticas['errores'].append(error_msg)
+            for lote in self._importar_por_lotes(origen):
+                estadisticas['total'] += lote['total']
+                estadisticas['creados'] += lote['creados']
+                estadisticas['actualizados'] += lote['actualizados']
+                estadisticas['errores'].extend(lote['errores'])
         
         except FileNotFoundError:
-            estadisticas['errores'].append(f"Archivo no encontrado: {ruta_archivo}")
+            estadisticas['errores'].append(f"Archivo no encontrado: {origen}")
         except pd.errors.EmptyDataError:
             estadisticas['errores'].append("El archivo CSV está vacío")
         except Exception as e:
@@ -69,51 +80,244 @@ class CSVImporterService:
         
         return estadisticas
     
-    def _procesar_fila(self, row: pd.Series, estadisticas: Dict) -> None:
+    def importar_archivo(self, ruta_archivo: str,
+                         reportar: Callable[[dict], None]) -> dict:
+        """
+        Importa un archivo CSV informando el progreso después de cada lote.
+        
+        Pensado para ejecutarse como tarea en segundo plano: el archivo
+        (temporal) se elimina al terminar.
+        
+        Args:
+            ruta_archivo: Ruta al archivo CSV
+            reportar: Función que recibe el progreso (ProgresoImportacion.to_dict())
+            
+        Returns:
+            Progreso final de la importación, como diccionario
+            
+        Raises:
+            Exception: Si el archivo no se puede leer o le faltan columnas
+        """
+        progreso = ProgresoImportacion()
+        
+        try:
+            tamano = os.path.getsize(ruta_archivo) or 1
+            with open(ruta_archivo, 'rb') as archivo:
+                for lote in self._importar_por_lotes(archivo):
+                    progreso.filas_procesadas += lote['total']
+                    progreso.creados += lote['creados']
+                    progreso.actualizados += lote['actualizados']
+                    progreso.total_errores += len(lote['errores'])
+                    espacio = MAX_ERRORES_REPORTADOS - len(progreso.errores)
+                    progreso.errores.extend(lote['errores'][:max(espacio, 0)])
+                    progreso.porcentaje = min(round(archivo.tell() * 100 / tamano, 1), 99.9)
+                    reportar(progreso.to_dict())
+        finally:
+            if os.path.exists(ruta_archivo):
+                os.unlink(ruta_archivo)
+        
+        progreso.porcentaje = 100.0
+        logger.info(f"Importación completada: {progreso.filas_procesadas} filas, "
+                    f"{progreso.total_errores} errores")
+        return progreso.to_dict()
+    
+    def _importar_por_lotes(self, origen: Union[str, IO]) -> Iterator[Dict[str, any]]:
+        """
+        Lee el CSV de a TAMANO_LOTE filas e importa cada lote.
+        
+        Args:
+            origen: Ruta al archivo CSV o archivo abierto
+        
+        Yields:
+            Estadísticas de cada lote importado
+        """
+        import pandas as pd
+        
+        # Todo como texto: los tipos se validan después
+        with pd.read_csv(origen, dtype=str, keep_default_na=False,
+                         chunksize=TAMANO_LOTE) as lector:
+            for lote in lector:
+                self._validar_columnas(lote)
+                estadisticas = self._estadisticas_vacias()
+                estadisticas['total'] = len(lote)
+                self._importar_lote(lote, estadisticas)
+                yield estadisticas
+    
+    @staticmethod
+    def _estadisticas_vacias() -> Dict[str, any]:
+        """Crea el diccionario de estadísticas inicial"""
+        return {
+            'total': 0,
+            'creados': 0,
+            'actualizados': 0,
+            'errores': []
+        }
+    
+    @staticmethod
+    def _validar_columnas(df: 'pd.DataFrame') -> None:
+        """
+        Verifica que el CSV tenga las columnas requeridas.
+        
+        Raises:
+            ValueError: Si falta alguna columna
+        """
+        if not all(col in df.columns for col in COLUMNAS_REQUERIDAS):
+            raise ValueError(f"El CSV debe contener las columnas: {COLUMNAS_REQUERIDAS}")
+    
+    def _importar_lote(self, lote: 'pd.DataFrame', estadisticas: Dict) -> None:
         """
-        Procesa una fila del CSV y crea o actualiza el socio.
+        Valida e importa un lote de filas en una única transacción.
+        
+        Si la escritura del lote falla, se reintenta fila por fila: las filas
+        válidas se importan igual y cada fila que falla se informa con su
+        número, como en la validación.
         
         Args:
-            row: Fila del DataFrame
+            lote: Filas del CSV (el índice es la posición de la fila de datos)
             estadisticas: Diccionario de estadísticas a actualizar
         """
-        nombre = str(row['Nombre']).strip()
-        apellido = str(row['Apellido']).strip()
-        dni = str(row['DNI']).strip()
-        email = str(row['Email']).strip()
-        plan_id = int(row['ID Plan Membresía'])
-        
-        # Validar datos
-        if not all([nombre, apellido, dni, email]):
-            raise ValueError("Todos los campos son obligatorios")
-        
-        # Obtener el plan
-        plan = self.plan_repo.get_by_id(plan_id)
-        if not plan:
-            raise ValueError(f"Plan con ID {plan_id} no existe")
-        
-        # Buscar si el socio ya existe
-        socio_existente = self.socio_repo.find_by_dni(dni)
-        
-        if socio_existente:
-            # Actualizar socio existente
-            socio_existente.nombre = nombre
-            socio_existente.apellido = apellido
-            socio_existente.email = email
-            socio_existente.asignar_plan(plan)
-            self.socio_repo.update(socio_existente)
-            estadisticas['actualizados'] += 1
-        else:
-            # Crear nuevo socio
-            nuevo_socio = Socio(
-                nombre=nombre,
-                apellido=apellido,
-                dni=dni,
-                email=email,
-                plan_membresia=plan
+        filas, errores = self._validar_lote(lote)
+        
+        if not filas.empty:
+            # Si el DNI se repite en el archivo, prevalece la última fila
+            ids_existentes = self.socio_repo.find_ids_por_dni(filas['DNI'].unique())
+            existe = filas['DNI'].isin(ids_existentes.keys())
+            primera_aparicion = ~filas['DNI'].duplicated(keep='first')
+            finales = filas.drop_duplicates('DNI', keep='last')
+            
+            nuevos = finales[~finales['DNI'].isin(ids_existentes.keys())]
+            existentes = finales[finales['DNI'].isin(ids_existentes.keys())]
+            
+            try:
+                self.socio_repo.insertar_en_lote(self._valores_socio(nuevos))
+                self.socio_repo.actualizar_en_lote([
+                    {'id': ids_existentes[valores['dni']], **valores}
+                    for valores in self._valores_socio(existentes)
+                ])
+                self.socio_repo.session.commit()
+            except Exception as e:
+                self.socio_repo.session.rollback()
+                primera, ultima = lote.index[0] + 2, lote.index[-1] + 2
+                logger.warning(f"Falló la escritura de las filas {primera} a {ultima}, "
+                               f"se reintenta fila por fila: {e}")
+                creados, actualizados = self._importar_fila_por_fila(filas, errores)
+            else:
+                creados = int((~existe & primera_aparicion).sum())
+                actualizados = len(filas) - creados
+            
+            if actualizados:
+                # Los socios actualizados pueden haber cambiado de plan
+                invalidar_resumen_socio()
+            estadisticas['creados'] += creados
+            estadisticas['actualizados'] += actualizados
+        
+        estadisticas['errores'].extend(mensaje for _, mensaje in sorted(errores))
+    
+    def _importar_fila_por_fila(self, filas: 'pd.DataFrame', errores: List) -> Tuple[int, int]:
+        """
+        Importa filas ya validadas con una transacción por fila.
+        
+        Se usa solo cuando falla la escritura del lote completo, para no
+        perder las filas válidas por una que falla.
+        
+        Args:
+            filas: Filas validadas (el índice es la posición de la fila de datos)
+            errores: Lista de pares (número de fila, mensaje) a completar
+        
+        Returns:
+            Tupla (socios creados, socios actualizados)
+        """
+        creados = actualizados = 0
+        for indice, valores in zip(filas.index, self._valores_socio(filas)):
+            try:
+                socio_id = self.socio_repo.find_ids_por_dni([valores['dni']]).get(valores['dni'])
+                if socio_id is None:
+                    self.socio_repo.insertar_en_lote([valores])
+                else:
+                    self.socio_repo.actualizar_en_lote([{'id': socio_id, **valores}])
+                self.socio_repo.session.commit()
+            except Exception as e:
+                self.socio_repo.session.rollback()
+                errores.append((indice + 2, f"Error en fila {indice + 2}: {str(e)}"))
+            else:
+                if socio_id is None:
+                    creados += 1
+                else:
+                    actualizados += 1
+        return creados, actualizados
+    
+    def _validar_lote(self, lote: 'pd.DataFrame'):
+        """
+        Valida un lote de filas por columnas, sin recorrerlo fila por fila.
+        
+        Los lotes anteriores ya están confirmados, por lo que los emails
+        repetidos entre lotes se detectan con la consulta a la base.
+        
+        Args:
+            lote: Filas del CSV
+        
+        Returns:
+            Tupla (filas válidas con la columna 'plan_id', lista de errores
+            como pares (número de fila, mensaje))
+        """
+        import pandas as pd
+        
+        datos = lote[COLUMNAS_REQUERIDAS].apply(lambda columna: columna.str.strip())
+        motivo = pd.Series('', index=datos.index)
+        
+        def marcar(mascara, mensaje):
+            """Asigna el mensaje a las filas que aún no tienen error"""
+            mascara = mascara & (motivo == '')
+            motivo[mascara] = mensaje[mascara] if isinstance(mensaje, pd.Series) else mensaje
+        
+        # Campos obligatorios
+        marcar((datos == '').any(axis=1), "Todos los campos son obligatorios")
+        
+        # ID de plan numérico y existente
+        plan_ids = pd.to_numeric(datos['ID Plan Membresía'], errors='coerce')
+        marcar(plan_ids.isna() | (plan_ids % 1 != 0),
+               "ID de plan inválido: " + datos['ID Plan Membresía'])
+        plan_ids = plan_ids.fillna(0).astype('int64')
+        planes_existentes = self.plan_repo.get_ids_existentes(
+            int(plan_id) for plan_id in plan_ids[motivo == ''].unique()
+        )
+        marcar(~plan_ids.isin(planes_existentes),
+               "Plan con ID " + plan_ids.astype(str) + " no existe")
+        
+        # Emails que ya pertenecen a otro socio (en la base o en el lote)
+        validas = motivo == ''
+        duenos_email = self.socio_repo.find_dnis_por_email(datos.loc[validas, 'Email'].unique())
+        primer_dni = datos[validas].groupby('Email')['DNI'].transform('first')
+        dueno = datos['Email'].map(duenos_email).fillna(primer_dni).fillna(datos['DNI'])
+        marcar(dueno != datos['DNI'],
+               "El email " + datos['Email'] + " ya está registrado por otro socio")
+        
+        errores = [
+            (indice + 2, f"Error en fila {indice + 2}: {mensaje}")
+            for indice, mensaje in motivo[motivo != ''].items()
+        ]
+        filas = datos[motivo == ''].assign(plan_id=plan_ids[motivo == ''])
+        return filas, errores
+    
+    @staticmethod
+    def _valores_socio(filas: 'pd.DataFrame') -> List[dict]:
+        """Convierte filas validadas en valores de columna para la tabla socios"""
+        return [
+            {
+                'nombre': nombre,
+                'apellido': apellido,
+                'dni': dni,
+                'email': email,
+                'plan_membresia_id': int(plan_id),
+                # Equivalente a Socio.asignar_plan()
+                'rol': RolUsuario.SOCIO_REGISTRADO,
+                'estado_membresia': EstadoMembresia.ACTIVA
+            }
+            for nombre, apellido, dni, email, plan_id in zip(
+                filas['Nombre'], filas['Apellido'], filas['DNI'],
+                filas['Email'], filas['plan_id']
             )
-            self.socio_repo.create(nuevo_socio)
-            estadisticas['creados'] += 1
+        ]
     
     def exportar_plantilla(self, ruta_destino: str) -> None:
         """
@@ -122,6 +326,8 @@ class CSVImporterService:
         Args:
             ruta_destino: Ruta donde guardar la plantilla
         """
+        import pandas as pd
+        
         plantilla = pd.DataFrame(columns=[
             'Nombre',
             'Apellido',
@@ -1,10 +1,13 @@
-from sqlalchemy import func, desc
+from datetime import datetime, timedelta
+from sqlalchemy import func, desc, select, true
 from src.config.database import db
 from src.models.clase import Clase
 from src.models.reserva import Reserva
 from src.models.plan_membresia import PlanMembresia
 from src.models.socio import Socio
 from src.models.horario import Horario
+from src.models.estadisticas_snapshot import EstadisticasSnapshot
+from src.repositories.estadisticas_snapshot_repository import EstadisticasSnapshotRepository
 
 class EstadisticasService:
     def get_clase_mas_popular(self):
@@ -49,15 +52,19 @@ class EstadisticasService:
         ).scalar() or 0
         
         # Cupo total de todas las clases activas
-        clases = db.session.query(Clase).filter(Clase.activa == True).all()
-        cupo_total = sum(c.cupo_maximo for c in clases) if clases else 0
+        cupo_total = db.session.query(func.sum(Clase.cupo_maximo)).filter(
+            Clase.activa == True
+        ).scalar() or 0
         
+        return self._calcular_tasa(reservas_activas, cupo_total)
+    
+    @staticmethod
+    def _calcular_tasa(reservas_activas: int, cupo_total: int) -> float:
+        """Tasa de presentismo como porcentaje del cupo utilizado (máximo 100%)"""
         if cupo_total == 0:
             return 0.0
-        
-        # Tasa como porcentaje del cupo utilizado
         tasa = (reservas_activas / cupo_total) * 100
-        return round(min(tasa, 100), 1)  # Máximo 100%
+        return round(min(tasa, 100), 1)
 
     def get_totales(self):
         """Obtiene conteos totales para el dashboard"""
@@ -74,13 +81,116 @@ class EstadisticasService:
         }
 
     def get_dashboard_stats(self):
-        """Obtiene todas las estadísticas para el dashboard"""
-        totales = self.get_totales()
+        """
+        Obtiene todas las estadísticas para el dashboard.
+        
+        Cada agregado se arma una sola vez como CTE y el SELECT final los
+        combina: los totales devuelven siempre una fila y los rankings se
+        unen con LEFT JOIN (sin reservas o socios no devuelven ninguna). Se
+        hace un solo viaje a la base.
+        """
+        reserva_confirmada = Reserva.confirmada == True
+        total_reservas_clase = func.count(Reserva.id)
+        ingresos_plan = func.count(Socio.id) * PlanMembresia.precio
+        
+        socios = select(func.count(Socio.id).label('total')).cte('total_socios')
+        clases = (select(func.count(Clase.id).label('total'),
+                         func.coalesce(func.sum(Clase.cupo_maximo), 0).label('cupo'))
+                  .where(Clase.activa == True)
+                  .cte('clases_activas'))
+        reservas = (select(func.count(Reserva.id).label('total'))
+                    .where(reserva_confirmada)
+                    .cte('reservas_confirmadas'))
+        planes = (select(func.count(PlanMembresia.id).label('total'))
+                  .where(PlanMembresia.activo == True)
+                  .cte('planes_activos'))
+        clase_popular = (select(Clase.titulo, total_reservas_clase.label('reservas'))
+                         .join(Reserva, Clase.id == Reserva.clase_id)
+                         .where(reserva_confirmada)
+                         .group_by(Clase.id, Clase.titulo)
+                         .order_by(total_reservas_clase.desc(), Clase.id)
+                         .limit(1)
+                         .cte('clase_popular'))
+        horario_concurrido = (select(Horario.dia_semana, Horario.hora_inicio,
+                                     total_reservas_clase.label('reservas'))
+                              .join(Clase, Horario.id == Clase.horario_id)
+                              .join(Reserva, Clase.id == Reserva.clase_id)
+                              .where(reserva_confirmada)
+                              .group_by(Horario.id, Horario.dia_semana, Horario.hora_inicio)
+                              .order_by(total_reservas_clase.desc(), Horario.id)
+                              .limit(1)
+                              .cte('horario_concurrido'))
+        plan_ingresos = (select(PlanMembresia.titulo, ingresos_plan.label('ingresos'))
+                         .join(Socio, PlanMembresia.id == Socio.plan_membresia_id)
+                         .group_by(PlanMembresia.id, PlanMembresia.titulo, PlanMembresia.precio)
+                         .order_by(ingresos_plan.desc(), PlanMembresia.id)
+                         .limit(1)
+                         .cte('plan_ingresos'))
+        
+        fila = db.session.execute(
+            select(
+                socios.c.total.label('total_socios'),
+                clases.c.total.label('total_clases'),
+                reservas.c.total.label('total_reservas'),
+                planes.c.total.label('total_planes'),
+                clases.c.cupo.label('cupo_total'),
+                clase_popular.c.titulo.label('clase_popular'),
+                clase_popular.c.reservas.label('clase_popular_reservas'),
+                horario_concurrido.c.dia_semana.label('horario_dia'),
+                horario_concurrido.c.hora_inicio.label('horario_hora'),
+                horario_concurrido.c.reservas.label('horario_reservas'),
+                plan_ingresos.c.titulo.label('plan_ingresos'),
+                plan_ingresos.c.ingresos.label('plan_ingresos_total'),
+            )
+            .select_from(socios.join(clases, true()).join(reservas, true()).join(planes, true()))
+            .outerjoin(clase_popular, true())
+            .outerjoin(horario_concurrido, true())
+            .outerjoin(plan_ingresos, true())
+        ).one()
         
         return {
-            "clase_popular": self.get_clase_mas_popular(),
-            "horario_concurrido": self.get_horario_mas_concurrido(),
-            "plan_ingresos": self.get_plan_mayor_ingresos(),
-            "tasa_presentismo": self.get_tasa_presentismo(),
-            **totales
+            "clase_popular": {
+                "clase": fila.clase_popular,
+                "reservas": fila.clase_popular_reservas
+            } if fila.clase_popular is not None else None,
+            "horario_concurrido": {
+                "dia": fila.horario_dia.value,
+                "hora": fila.horario_hora.strftime("%H:%M"),
+                "reservas": fila.horario_reservas
+            } if fila.horario_dia is not None else None,
+            "plan_ingresos": {
+                "plan": fila.plan_ingresos,
+                "ingresos": float(fila.plan_ingresos_total)
+            } if fila.plan_ingresos is not None else None,
+            "tasa_presentismo": self._calcular_tasa(fila.total_reservas or 0, fila.cupo_total or 0),
+            "total_socios": fila.total_socios or 0,
+            "total_clases": fila.total_clases or 0,
+            "total_reservas": fila.total_reservas or 0,
+            "total_planes": fila.total_planes or 0
         }
+    
+    def generar_snapshot(self) -> EstadisticasSnapshot:
+        """
+        Guarda una foto de las estadísticas actuales del dashboard.
+        
+        Returns:
+            El snapshot creado
+        """
+        snapshot = EstadisticasSnapshot(self.get_dashboard_stats())
+        return EstadisticasSnapshotRepository().create(snapshot)
+    
+    def get_historico(self, dias: int = 30):
+        """
+        Obtiene los snapshots de los últimos días para gráficos de tendencia.
+        
+        Solo lee la tabla estadisticas_snapshot, sin recorrer reservas.
+        
+        Args:
+            dias: Cantidad de días hacia atrás
+            
+        Returns:
+            Lista de snapshots serializados, ordenados por fecha
+        """
+        desde = datetime.utcnow() - timedelta(days=dias)
+        snapshots = EstadisticasSnapshotRepository().find_desde(desde)
+        return [snapshot.to_dict() for snapshot in snapshots]
@@ -1,6 +1,9 @@
 """Servicio de Gestión de Listas de Espera"""
-from typing import List, Optional
-from datetime import datetime, timedelta
+from collections import Counter
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload
 from src.models.lista_espera import ListaEspera
 from src.models.clase import Clase
 from src.models.socio import Socio
@@ -27,12 +30,27 @@ class ListaEsperaRepository(BaseRepository[ListaEspera]):
         return query.order_by(ListaEspera.posicion).all()
     
     def obtener_siguiente_posicion(self, clase_id: int) -> int:
-        """Obtiene la siguiente posición disponible en la lista de espera"""
-        ultima = (self.model_class.query
-                  .filter_by(clase_id=clase_id)
-                  .order_by(ListaEspera.posicion.desc())
-                  .first())
-        return (ultima.posicion + 1) if ultima else 1
+        """
+        Asigna atómicamente la siguiente posición de la lista de espera de una clase.
+        
+        Incrementa el contador de la clase en un único UPDATE ... RETURNING,
+        por lo que dos inscripciones concurrentes no reciben la misma
+        posición. No hace commit: la posición queda reservada en la
+        transacción del llamador.
+        
+        Args:
+            clase_id: ID de la clase
+            
+        Returns:
+            La posición asignada
+        """
+        return self.session.execute(
+            update(Clase)
+            .where(Clase.id == clase_id)
+            .values(ultima_posicion_espera=Clase.ultima_posicion_espera + 1)
+            .returning(Clase.ultima_posicion_espera)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
     
     def obtener_por_socio_clase(self, socio_id: int, clase_id: int) -> Optional[ListaEspera]:
         """Obtiene la entrada de lista de espera de un socio en una clase"""
@@ -45,6 +63,129 @@ class ListaEsperaRepository(BaseRepository[ListaEspera]):
         return (self.model_class.query
                 .filter_by(notificado=True, confirmado=False, activo=True)
                 .all())
+    
+    def obtener_sin_notificar(self, clase_id: int, limite: int) -> List[ListaEspera]:
+        """Obtiene las primeras entradas activas aún no notificadas de una clase"""
+        return (self.model_class.query
+                .filter_by(clase_id=clase_id, activo=True, notificado=False)
+                .order_by(ListaEspera.posicion)
+                .limit(limite)
+                .all())
+    
+    def contar_notificados_vigentes(self, clase_id: int) -> int:
+        """Cuenta los notificados de una clase que todavía pueden confirmar"""
+        return self.session.execute(
+            select(func.count(ListaEspera.id))
+            .where(ListaEspera.clase_id == clase_id, *self._filtro_notificados_vigentes())
+        ).scalar()
+    
+    def notificar_primeros(self, clase_id: int, cantidad: int,
+                           tiempo_limite_horas: int) -> List[int]:
+        """
+        Notifica en un único UPDATE a las primeras entradas sin notificar de una clase.
+        
+        La subconsulta recorre el índice de pendientes de la clase en orden
+        de posición. En PostgreSQL bloquea esas filas con SKIP LOCKED y en
+        SQLite la escritura ya es exclusiva, así que dos promociones
+        concurrentes nunca notifican la misma entrada. No hace commit.
+        
+        Args:
+            clase_id: ID de la clase
+            cantidad: Máximo de entradas a notificar
+            tiempo_limite_horas: Horas para confirmar
+            
+        Returns:
+            IDs de las entradas notificadas
+        """
+        if cantidad <= 0:
+            return []
+        
+        ahora = datetime.utcnow()
+        siguientes = (self._siguientes_sin_notificar(clase_id, cantidad)
+                      .with_for_update(skip_locked=True))
+        return self.session.execute(
+            update(ListaEspera)
+            .where(ListaEspera.id.in_(siguientes), ListaEspera.notificado == False)
+            .values(notificado=True, fecha_notificacion=ahora,
+                    fecha_limite_confirmacion=ahora + timedelta(hours=tiempo_limite_horas))
+            .returning(ListaEspera.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+    
+    def obtener_con_socio_y_clase(self, ids: List[int]) -> List[ListaEspera]:
+        """Obtiene entradas por ID con su socio y su clase, en orden de posición"""
+        if not ids:
+            return []
+        return (self.model_class.query
+                .options(joinedload(ListaEspera.socio), joinedload(ListaEspera.clase))
+                .filter(ListaEspera.id.in_(ids))
+                .order_by(ListaEspera.posicion)
+                .all())
+    
+    def desactivar_expirados(self) -> List[int]:
+        """
+        Desactiva en un único UPDATE las notificaciones vencidas sin confirmar.
+        
+        No hace commit.
+        
+        Returns:
+            ID de la clase de cada entrada desactivada (con repeticiones)
+        """
+        return self.session.execute(
+            update(ListaEspera)
+            .where(ListaEspera.activo == True,
+                   ListaEspera.notificado == True,
+                   ListaEspera.confirmado == False,
+                   ListaEspera.fecha_limite_confirmacion < datetime.utcnow())
+            .values(activo=False)
+            .returning(ListaEspera.clase_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+    
+    def cupos_por_ofrecer(self) -> List[Tuple[int, int]]:
+        """
+        Calcula en una sola consulta las clases con cupos libres sin ofrecer.
+        
+        Solo incluye clases activas con lista de espera habilitada que
+        tienen inscriptos sin notificar.
+        
+        Returns:
+            Pares (clase_id, cupos libres menos notificados vigentes)
+        """
+        vigentes = (select(func.count(ListaEspera.id))
+                    .where(ListaEspera.clase_id == Clase.id, *self._filtro_notificados_vigentes())
+                    .scalar_subquery())
+        libres = Clase.cupo_maximo - Clase.cupos_ocupados - vigentes
+        hay_pendientes = (select(ListaEspera.id)
+                          .where(ListaEspera.clase_id == Clase.id,
+                                 ListaEspera.activo == True,
+                                 ListaEspera.notificado == False)
+                          .exists())
+        filas = self.session.execute(
+            select(Clase.id, libres)
+            .where(Clase.activa == True, Clase.tiene_lista_espera == True,
+                   hay_pendientes, libres > 0)
+            .order_by(Clase.id)
+        ).all()
+        return [(clase_id, cupos) for clase_id, cupos in filas]
+    
+    @staticmethod
+    def _siguientes_sin_notificar(clase_id: int, limite: int):
+        """Consulta de los IDs de las próximas entradas sin notificar (índice de pendientes)"""
+        return (select(ListaEspera.id)
+                .where(ListaEspera.clase_id == clase_id,
+                       ListaEspera.activo == True,
+                       ListaEspera.notificado == False)
+                .order_by(ListaEspera.posicion)
+                .limit(limite))
+    
+    @staticmethod
+    def _filtro_notificados_vigentes() -> list:
+        """Condiciones de una notificación que todavía puede confirmarse"""
+        return [ListaEspera.activo == True,
+                ListaEspera.notificado == True,
+                ListaEspera.confirmado == False,
+                ListaEspera.fecha_limite_confirmacion > datetime.utcnow()]
 
 
 class ListaEsperaService:
@@ -190,36 +331,54 @@ class ListaEsperaService:
         """
         Notifica al siguiente socio en la lista de espera que hay un lugar disponible.
         
+        El siguiente es el primero por posición que aún no fue notificado.
+        
         Args:
             clase: Clase con lugar disponible
             tiempo_limite_horas: Horas para confirmar (default: 24)
             
         Returns:
-            Entrada notificada o None si no hay nadie en la lista
+            Entrada notificada o None si no hay nadie sin notificar en la lista
         """
-        if tiempo_limite_horas is None:
-            tiempo_limite_horas = self.tiempo_limite_confirmacion
+        notificadas = self._notificar_primeros(clase.id, 1, tiempo_limite_horas)
         
-        # Obtener primera entrada activa de la lista
-        entradas = self.lista_espera_repo.obtener_por_clase(clase.id, solo_activos=True)
-        
-        if not entradas:
-            logger.info(f"No hay personas en lista de espera para clase {clase.id}")
+        if not notificadas:
+            logger.info(f"No hay personas sin notificar en lista de espera para clase {clase.id}")
             return None
         
-        primera_entrada = entradas[0]
-        primera_entrada.notificar(tiempo_limite_horas)
-        db.session.commit()
+        return notificadas[0]
+    
+    def _notificar_primeros(self, clase_id: int, cantidad: int,
+                            tiempo_limite_horas: int = None) -> List[ListaEspera]:
+        """
+        Notifica a las primeras entradas sin notificar de una clase y
+        programa el vencimiento de cada una.
         
-        logger.info(
-            f"Notificado socio {primera_entrada.socio.id} de lista de espera "
-            f"para clase {clase.id}"
-        )
+        Args:
+            clase_id: ID de la clase
+            cantidad: Máximo de socios a notificar
+            tiempo_limite_horas: Horas para confirmar (default: 24)
+            
+        Returns:
+            Entradas notificadas
+        """
+        if tiempo_limite_horas is None:
+            tiempo_limite_horas = self.tiempo_limite_confirmacion
         
-        # En un sistema real, aquí se enviaría un email o notificación push
-        self._enviar_notificacion(primera_entrada)
+        ids = self.lista_espera_repo.notificar_primeros(clase_id, cantidad, tiempo_limite_horas)
+        db.session.commit()
         
-        return primera_entrada
+        notificadas = self.lista_espera_repo.obtener_con_socio_y_clase(ids)
+        for entrada in notificadas:
+            logger.info(
+                f"Notificado socio {entrada.socio_id} de lista de espera "
+                f"para clase {clase_id}"
+            )
+            # En un sistema real, aquí se enviaría un email o notificación push
+            self._enviar_notificacion(entrada)
+            programar_vencimiento(entrada.id, entrada.fecha_limite_confirmacion)
+        
+        return notificadas
     
     def _enviar_notificacion(self, entrada: ListaEspera) -> None:
         """
@@ -271,21 +430,26 @@ class ListaEsperaService:
                     "No puedes confirmar en este momento"
                 )
         
-        # Verificar que aún hay cupo (por si acaso)
-        if not clase.tiene_cupo_disponible():
-            raise BusinessException(
-                "Ya no hay cupo disponible en esta clase"
-            )
-        
-        # Crear reserva
         from src.repositories.base_repository import BaseRepository
-        reserva = Reserva(socio=socio, clase=clase)
-        reserva_repo = BaseRepository(Reserva)
-        reserva = reserva_repo.create(reserva)
+        from src.repositories.clase_repository import ClaseRepository
+        from src.repositories.unit_of_work import uow
         
-        # Confirmar y desactivar entrada de lista de espera
-        entrada.confirmar()
-        db.session.commit()
+        # Cupo, reserva y entrada de lista de espera se confirman juntos
+        # (si algo falla, la unidad de trabajo deshace el cupo ocupado)
+        with uow():
+            # Ocupar el cupo de forma atómica (falla si otra reserva lo tomó antes)
+            if not ClaseRepository().ocupar_cupo(clase.id):
+                raise BusinessException(
+                    "Ya no hay cupo disponible en esta clase"
+                )
+            
+            reserva = BaseRepository(Reserva).create(Reserva(socio=socio, clase=clase))
+            
+            # Confirmar y desactivar entrada de lista de espera
+            entrada.confirmar()
+        
+        from src.services.agregador_horarios_service import invalidar_cache_calendario
+        invalidar_cache_calendario()
         
         logger.info(
             f"Socio {socio.id} confirmó lugar desde lista de espera "
@@ -294,41 +458,92 @@ class ListaEsperaService:
         
         return reserva
     
+    def promover_lista_espera(self, clase_id: int, cupos_liberados: int = 1) -> int:
+        """
+        Ofrece los cupos liberados de una clase a los primeros de su lista de espera.
+        
+        Se notifica como máximo a tantos socios como cupos se liberaron, y
+        nunca más que los cupos libres que no estén ya ofrecidos a alguien
+        que todavía puede confirmar. A cada notificado se le programa el
+        vencimiento de su plazo.
+        
+        Args:
+            clase_id: ID de la clase
+            cupos_liberados: Cupos liberados por el evento
+            
+        Returns:
+            Cantidad de socios notificados
+        """
+        clase = db.session.get(Clase, clase_id)
+        if clase is None or not clase.tiene_lista_espera:
+            return 0
+        
+        pendientes = self.lista_espera_repo.contar_notificados_vigentes(clase_id)
+        a_ofrecer = min(cupos_liberados, clase.cupos_disponibles() - pendientes)
+        notificadas = self._notificar_primeros(clase_id, a_ofrecer)
+        
+        logger.info(
+            f"Promoción de lista de espera de clase {clase_id}: "
+            f"{len(notificadas)} notificados por {cupos_liberados} cupos liberados"
+        )
+        return len(notificadas)
+    
+    def procesar_vencimiento(self, entrada_id: int) -> int:
+        """
+        Vence una notificación no confirmada y ofrece el cupo al siguiente.
+        
+        Lo ejecuta el job programado al notificar; si la entrada ya se
+        confirmó o desactivó no hace nada.
+        
+        Args:
+            entrada_id: ID de la entrada notificada
+            
+        Returns:
+            Cantidad de socios notificados en su lugar
+        """
+        entrada = self.lista_espera_repo.get_by_id(entrada_id)
+        if entrada is None or not entrada.activo or entrada.confirmado:
+            return 0
+        if not entrada.ha_expirado():
+            return 0
+        
+        entrada.desactivar()
+        db.session.commit()
+        logger.info(
+            f"Entrada de lista de espera {entrada.id} expirada "
+            f"(socio {entrada.socio_id}, clase {entrada.clase_id})"
+        )
+        return self.promover_lista_espera(entrada.clase_id, 1)
+    
     def procesar_expirados(self) -> int:
         """
         Procesa las entradas de lista de espera que expiraron sin confirmar.
         
+        Las desactiva en un único UPDATE y ofrece cada cupo liberado al
+        siguiente de su clase.
+        
         Returns:
             Cantidad de entradas procesadas
         """
-        entradas_notificadas = self.lista_espera_repo.obtener_notificados_sin_confirmar()
-        procesadas = 0
-        
-        for entrada in entradas_notificadas:
-            if entrada.ha_expirado():
-                entrada.desactivar()
-                procesadas += 1
-                logger.info(
-                    f"Entrada de lista de espera {entrada.id} expirada "
-                    f"(socio {entrada.socio.id}, clase {entrada.clase.id})"
-                )
-                
-                # Notificar al siguiente si hay cupo disponible
-                if entrada.clase.tiene_cupo_disponible():
-                    self.notificar_siguiente_en_lista(entrada.clase)
+        clases = self.lista_espera_repo.desactivar_expirados()
+        db.session.commit()
         
-        if procesadas > 0:
-            db.session.commit()
+        for clase_id, cantidad in Counter(clases).items():
+            self.promover_lista_espera(clase_id, cantidad)
         
-        logger.info(f"Procesadas {procesadas} entradas expiradas de lista de espera")
-        return procesadas
+        logger.info(f"Procesadas {len(clases)} entradas expiradas de lista de espera")
+        return len(clases)
     
     def procesar_liberaciones_cupos(self) -> int:
         """
         Procesa las clases que tienen cupo disponible y lista de espera pendiente.
         
-        Debe ejecutarse periódicamente (ej. cada noche) para notificar
-        a las personas en lista de espera.
+        Las liberaciones se atienden al cancelar (promover_lista_espera) y
+        los vencimientos con su job programado; esta pasada nocturna solo
+        reconcilia lo que esos eventos no cubrieron (cupos liberados por
+        otras vías, jobs perdidos en un reinicio). Una consulta calcula los
+        cupos sin ofrecer de todas las clases y cada clase se notifica con
+        un único UPDATE.
         
         Returns:
             Cantidad de notificaciones enviadas
@@ -337,29 +552,8 @@ class ListaEsperaService:
         self.procesar_expirados()
         
         notificaciones = 0
-        
-        # Obtener todas las clases con lista de espera habilitada
-        from src.repositories.clase_repository import ClaseRepository
-        clase_repo = ClaseRepository()
-        clases_con_lista = clase_repo.find_con_lista_espera_habilitada()
-        
-        for clase in clases_con_lista:
-            # Si la clase tiene cupo disponible y hay personas en lista de espera
-            if clase.tiene_cupo_disponible():
-                entradas_activas = self.lista_espera_repo.obtener_por_clase(
-                    clase.id, solo_activos=True
-                )
-                
-                # Filtrar las que no han sido notificadas
-                entradas_sin_notificar = [
-                    e for e in entradas_activas if not e.notificado
-                ]
-                
-                # Notificar hasta llenar el cupo disponible
-                cupos_disponibles = clase.cupos_disponibles()
-                for entrada in entradas_sin_notificar[:cupos_disponibles]:
-                    self.notificar_siguiente_en_lista(clase)
-                    notificaciones += 1
+        for clase_id, libres in self.lista_espera_repo.cupos_por_ofrecer():
+            notificaciones += len(self._notificar_primeros(clase_id, libres))
         
         logger.info(
             f"Procesamiento de liberación de cupos completado: "
@@ -367,3 +561,59 @@ class ListaEsperaService:
         )
         
         return notificaciones
+
+
+def encolar_promocion(clase_id: int, cupos_liberados: int = 1) -> None:
+    """
+    Encola la promoción de la lista de espera de una clase tras liberar cupos.
+    
+    La procesa el ejecutor de tareas en segundos. Si no se puede encolar,
+    la reconciliación nocturna ofrece el cupo igual.
+    
+    Args:
+        clase_id: ID de la clase
+        cupos_liberados: Cupos liberados
+    """
+    from src.config.tareas import ejecutor_tareas
+    
+    try:
+        ejecutor_tareas.encolar(
+            'promover_lista_espera',
+            {'clase_id': clase_id, 'cupos': cupos_liberados}
+        )
+    except Exception as e:
+        logger.warning(f"No se pudo encolar la promoción de lista de espera de clase {clase_id}: {e}")
+
+
+def programar_vencimiento(entrada_id: int, fecha) -> None:
+    """
+    Programa el vencimiento de una notificación de lista de espera.
+    
+    Al llegar la fecha límite se encola una tarea 'vencer_lista_espera'
+    para esa entrada. Si el job se pierde (reinicio), la reconciliación
+    nocturna procesa el vencimiento.
+    
+    Args:
+        entrada_id: ID de la entrada notificada
+        fecha: Fecha límite de confirmación (UTC)
+    """
+    from flask import current_app
+    from src.config.scheduler import scheduler
+    from src.config.tareas import ejecutor_tareas
+    
+    app = current_app._get_current_object()
+    
+    def encolar_vencimiento():
+        with app.app_context():
+            try:
+                ejecutor_tareas.encolar('vencer_lista_espera', {'entrada_id': entrada_id})
+            except Exception as e:
+                logger.error(f"Error encolando el vencimiento de lista de espera {entrada_id}: {e}")
+    
+    try:
+        scheduler.agregar_tarea_fecha(
+            encolar_vencimiento, fecha.replace(tzinfo=timezone.utc),
+            job_id=f'vencer_lista_espera_{entrada_id}'
+        )
+    except Exception as e:
+        logger.warning(f"No se pudo programar el vencimiento de lista de espera {entrada_id}: {e}")
@@ -4,6 +4,7 @@ from datetime import datetime
 from src.repositories.pago_repository import PagoRepository
 from src.repositories.socio_repository import SocioRepository
 from src.models.pago import Pago, EstadoPago
+from src.services.socio_service import invalidar_resumen_socio
 from src.datasources.proxy.pasarela_pagos_proxy import PasarelaPagosProxy
 
 
@@ -135,11 +136,11 @@ class PagoService:
                 'rechazados': 0
             }
         
-        # Obtener pagos pendientes
-        pagos_pendientes = self.pago_repository.find_pagos_pendientes()
-        print(f"Pagos pendientes encontrados: {len(pagos_pendientes)}")
+        # Obtener referencias de los pagos pendientes (sin cargar las entidades)
+        referencias = self.pago_repository.find_referencias_pendientes()
+        print(f"Pagos pendientes encontrados: {len(referencias)}")
         
-        if not pagos_pendientes:
+        if not referencias:
             return {
                 'success': True,
                 'message': 'No hay pagos pendientes de verificación',
@@ -148,46 +149,49 @@ class PagoService:
                 'rechazados': 0
             }
         
-        # Obtener referencias para verificar en lote
-        referencias = [p.referencia_externa for p in pagos_pendientes 
-                      if p.referencia_externa]
-        
-        # Verificar estados en lote
-        estados = self.pasarela_proxy.verificar_estados_lote(referencias)
-        
-        # Actualizar estados de los pagos
-        verificados = 0
-        aprobados = 0
-        rechazados = 0
-        
-        for pago in pagos_pendientes:
-            if pago.referencia_externa in estados:
-                nuevo_estado = estados[pago.referencia_externa]
-                pago.actualizar_estado(nuevo_estado)
-                self.pago_repository.save(pago)
-                
-                verificados += 1
-                if nuevo_estado == EstadoPago.APROBADO:
-                    aprobados += 1
-                    # Reactivar membresía si estaba suspendida
-                    self._actualizar_estado_membresia(pago)
-                elif nuevo_estado == EstadoPago.RECHAZADO:
-                    rechazados += 1
-                    print(f"⚠️  Pago rechazado: {pago.referencia_externa}")
-        
+        # Verificar estados en lote (los lotes fallidos no frenan al resto)
+        verificacion = self.pasarela_proxy.verificar_estados_lote(referencias)
+        for error in verificacion.errores:
+            print(f"⚠️  {error}")
+        
+        # Actualizar pagos y reactivar membresías en lote, en una sola transacción
+        aprobadas = [ref for ref, estado in verificacion.estados.items()
+                     if estado == EstadoPago.APROBADO]
+        session = self.pago_repository.session
+        try:
+            actualizados = self.pago_repository.actualizar_estados_por_referencia(
+                verificacion.estados
+            )
+            reactivados = self.socio_repository.reactivar_por_pagos(aprobadas)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        
+        if reactivados:
+            invalidar_resumen_socio()
         self.pasarela_proxy.desconectar()
         
+        verificados = sum(actualizados.values())
+        aprobados = actualizados.get(EstadoPago.APROBADO, 0)
+        rechazados = actualizados.get(EstadoPago.RECHAZADO, 0)
+        
         print(f"\n=== Verificación completada ===")
         print(f"Total verificados: {verificados}")
         print(f"Aprobados: {aprobados}")
         print(f"Rechazados: {rechazados}")
+        print(f"Membresías reactivadas: {reactivados}")
+        print(f"No verificados: {len(verificacion.no_verificadas)}")
         
         return {
             'success': True,
             'message': f'Verificación completada: {verificados} pagos procesados',
             'verificados': verificados,
             'aprobados': aprobados,
-            'rechazados': rechazados
+            'rechazados': rechazados,
+            'reactivados': reactivados,
+            'no_verificados': len(verificacion.no_verificadas),
+            'errores': verificacion.errores
         }
     
     def listar_pagos_socio(self, socio_id: int) -> List[Pago]:
@@ -213,21 +217,3 @@ class PagoService:
             Objeto Pago o None si no existe
         """
         return self.pago_repository.find_by_referencia_externa(referencia)
-    
-    def _actualizar_estado_membresia(self, pago: Pago) -> None:
-        """
-        Actualiza el estado de membresía del socio según el pago.
-        
-        Args:
-            pago: Pago aprobado
-        """
-        from src.utils.enums import EstadoMembresia
-        
-        socio = pago.socio
-        if pago.esta_aprobado():
-            # Si el pago fue aprobado, activar la membresía
-            if socio.estado_membresia == EstadoMembresia.SUSPENDIDA:
-                socio.estado_membresia = EstadoMembresia.ACTIVA
-                self.socio_repository.save(socio)
-                print(f"✓ Membresía reactivada para socio {socio.nombre_completo}")
-
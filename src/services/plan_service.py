@@ -1,8 +1,11 @@
 """Servicio de gestión de Planes de Membresía"""
 from typing import List, Optional
+from src.repositories.clase_repository import ClaseRepository
 from src.repositories.plan_repository import PlanRepository
 from src.models.plan_membresia import PlanMembresia
 from src.models.clase import Clase
+from src.services.catalogo_planes_service import invalidar_catalogo_planes
+from src.services.socio_service import invalidar_resumen_socio
 
 
 class PlanService:
@@ -10,6 +13,7 @@ class PlanService:
     
     def __init__(self):
         self.plan_repo = PlanRepository()
+        self.clase_repo = ClaseRepository()
     
     def crear_plan(self, titulo: str, descripcion: str, precio: float, nivel: int = 1) -> PlanMembresia:
         """
@@ -48,7 +52,9 @@ class PlanService:
             nivel=nivel
         )
         
-        return self.plan_repo.create(nuevo_plan)
+        nuevo_plan = self.plan_repo.create(nuevo_plan)
+        invalidar_catalogo_planes()
+        return nuevo_plan
     
     def obtener_plan(self, plan_id: int) -> Optional[PlanMembresia]:
         """Obtiene un plan por su ID"""
@@ -88,7 +94,11 @@ class PlanService:
                 raise ValueError("El precio debe ser mayor a 0")
             plan.precio = precio
         
-        return self.plan_repo.update(plan)
+        plan = self.plan_repo.update(plan)
+        # El título del plan forma parte del resumen de cada socio
+        invalidar_resumen_socio()
+        invalidar_catalogo_planes()
+        return plan
     
     def desactivar_plan(self, plan_id: int) -> None:
         """
@@ -106,6 +116,7 @@ class PlanService:
         
         plan.desactivar()
         self.plan_repo.update(plan)
+        invalidar_catalogo_planes()
     
     def agregar_clase_a_plan(self, plan_id: int, clase: Clase) -> None:
         """
@@ -123,7 +134,9 @@ class PlanService:
             raise ValueError(f"Plan con ID {plan_id} no existe")
         
         plan.agregar_clase(clase)
+        self.clase_repo.recalcular_nivel_minimo([clase.id])
         self.plan_repo.update(plan)
+        invalidar_catalogo_planes()
     
     def quitar_clase_de_plan(self, plan_id: int, clase: Clase) -> None:
         """
@@ -141,4 +154,6 @@ class PlanService:
             raise ValueError(f"Plan con ID {plan_id} no existe")
         
         plan.quitar_clase(clase)
+        self.clase_repo.recalcular_nivel_minimo([clase.id])
         self.plan_repo.update(plan)
+        invalidar_catalogo_planes()
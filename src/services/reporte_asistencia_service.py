@@ -0,0 +1,234 @@
+"""Servicio de exportación de reportes de asistencia"""
+import csv
+import io
+import os
+import tempfile
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Optional
+from src.core.logging_config import get_logger
+from src.exceptions.base_exceptions import NotFoundException, ValidationException
+from src.repositories.clase_repository import ClaseRepository
+from src.repositories.reserva_repository import ReservaRepository
+
+logger = get_logger(__name__)
+
+# Filas por lote: cada lote se lee de la base y se escribe a la salida de una vez
+TAMANO_LOTE_REPORTE = 1000
+
+# Máximo de filas en XLSX: el archivo se arma completo antes de enviarlo
+# (ver _xlsx), así que el tiempo hasta el primer byte y el archivo temporal
+# crecen con el reporte. Para más filas están CSV y Parquet
+MAX_FILAS_XLSX = 50000
+
+# Formato -> (mimetype, extensión, dependencia opcional)
+FORMATOS_REPORTE = {
+    'csv': ('text/csv', 'csv', None),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx', 'openpyxl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet', 'pyarrow'),
+}
+
+COLUMNAS_CLASE = ['Clase ID', 'Clase']
+COLUMNAS_ASISTENCIA = ['Socio ID', 'Nombre', 'Apellido', 'DNI', 'Email', 'Estado Reserva', 'Fecha Reserva']
+
+
+class _SalidaDrenable(io.RawIOBase):
+    """
+    Archivo de solo escritura que acumula lo escrito hasta que se drena.
+    
+    tell() cuenta todos los bytes escritos (no solo los pendientes), como
+    necesitan los escritores que registran posiciones (Parquet).
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._partes: List[bytes] = []
+        self._posicion = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, datos) -> int:
+        self._partes.append(bytes(datos))
+        self._posicion += len(datos)
+        return len(datos)
+    
+    def tell(self) -> int:
+        return self._posicion
+    
+    def drenar(self) -> bytes:
+        """Devuelve lo escrito desde el último drenado"""
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+class ReporteAsistenciaService:
+    """
+    Exporta la asistencia (reservas) de una o varias clases en CSV, XLSX o Parquet.
+    
+    La exportación es un generador de bytes: las reservas se leen de a
+    lotes con una sola consulta y cada lote se escribe a la salida apenas
+    se lee, por lo que la memoria no crece con el historial y el primer
+    byte sale enseguida. XLSX es la excepción: el formato es un ZIP que se
+    arma al final, por lo que se limita a MAX_FILAS_XLSX filas.
+    """
+    
+    def __init__(self):
+        self.reserva_repo = ReservaRepository()
+        self.clase_repo = ClaseRepository()
+    
+    def exportar(self, clase_ids: Optional[List[int]] = None,
+                 fecha_desde: Optional[date] = None,
+                 fecha_hasta: Optional[date] = None,
+                 formato: str = 'csv') -> Iterator[bytes]:
+        """
+        Valida los parámetros y devuelve el generador del reporte.
+        
+        La validación ocurre al llamar (no al consumir el generador), así
+        los errores se informan antes de empezar a responder.
+        
+        Args:
+            clase_ids: Clases a incluir (None: todas). Con una sola clase
+                el reporte no incluye las columnas de clase
+            fecha_desde: Primer día de reservas a incluir (opcional)
+            fecha_hasta: Último día de reservas a incluir, inclusive (opcional)
+            formato: 'csv', 'xlsx' o 'parquet'
+        
+        Returns:
+            Generador de bytes del archivo
+        
+        Raises:
+            ValidationException: Si el formato, el rango o las clases no son
+                válidos, o si el reporte supera MAX_FILAS_XLSX en XLSX
+            NotFoundException: Si alguna clase no existe
+        """
+        if formato not in FORMATOS_REPORTE:
+            raise ValidationException(
+                f"Formato inválido: {formato}. Use {', '.join(FORMATOS_REPORTE)}",
+                field='formato', value=formato
+            )
+        dependencia = FORMATOS_REPORTE[formato][2]
+        if dependencia:
+            self._verificar_dependencia(formato, dependencia)
+        if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+            raise ValidationException(
+                "fecha_desde no puede ser posterior a fecha_hasta", field='fecha_desde'
+            )
+        if clase_ids is not None:
+            if not clase_ids:
+                raise ValidationException("Debe indicar al menos una clase", field='clases')
+            for clase_id in clase_ids:
+                if self.clase_repo.get_by_id(clase_id) is None:
+                    raise NotFoundException('Clase', clase_id)
+        
+        incluir_clase = clase_ids is None or len(clase_ids) > 1
+        desde = datetime.combine(fecha_desde, time.min) if fecha_desde else None
+        hasta = datetime.combine(fecha_hasta + timedelta(days=1), time.min) if fecha_hasta else None
+        if formato == 'xlsx':
+            total = self.reserva_repo.contar_asistencia(clase_ids, desde, hasta)
+            if total > MAX_FILAS_XLSX:
+                raise ValidationException(
+                    f"El reporte tiene {total} filas y XLSX admite hasta {MAX_FILAS_XLSX}. "
+                    "Use csv o parquet, o acote el rango de fechas",
+                    field='formato', value=formato
+                )
+        filas = self._filas(clase_ids, desde, hasta, incluir_clase)
+        columnas = (COLUMNAS_CLASE if incluir_clase else []) + COLUMNAS_ASISTENCIA
+        
+        escritor = {'csv': self._csv, 'xlsx': self._xlsx, 'parquet': self._parquet}[formato]
+        return escritor(columnas, filas)
+    
+    def _filas(self, clase_ids, desde, hasta, incluir_clase: bool) -> Iterator[list]:
+        """Convierte las filas de la consulta en las columnas del reporte"""
+        for fila in self.reserva_repo.iterar_asistencia(
+            clase_ids, desde, hasta, TAMANO_LOTE_REPORTE
+        ):
+            valores = [fila.clase_id, fila.clase_titulo] if incluir_clase else []
+            valores.extend([
+                fila.socio_id, fila.nombre, fila.apellido, fila.dni, fila.email,
+                "Confirmada" if fila.confirmada else "Cancelada",
+                fila.fecha_reserva,
+            ])
+            yield valores
+    
+    @staticmethod
+    def _lotes(filas: Iterable[list]) -> Iterator[List[list]]:
+        """Agrupa las filas en lotes de TAMANO_LOTE_REPORTE"""
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) == TAMANO_LOTE_REPORTE:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+    
+    def _csv(self, columnas: List[str], filas: Iterable[list]) -> Iterator[bytes]:
+        """Genera el CSV: el encabezado primero y después un bloque por lote"""
+        salida = io.StringIO()
+        escritor = csv.writer(salida)
+        escritor.writerow(columnas)
+        yield salida.getvalue().encode('utf-8')
+        
+        for lote in self._lotes(filas):
+            salida.seek(0)
+            salida.truncate()
+            for fila in lote:
+                fila[-1] = fila[-1].strftime("%Y-%m-%d %H:%M:%S")
+                escritor.writerow(fila)
+            yield salida.getvalue().encode('utf-8')
+    
+    def _xlsx(self, columnas: List[str], filas: Iterable[list]) -> Iterator[bytes]:
+        """
+        Genera el XLSX con openpyxl en modo write_only y lo envía por bloques.
+        
+        openpyxl arma el ZIP recién al guardar, así que las filas se escriben
+        primero a un archivo temporal y el envío empieza al terminar. Por eso
+        exportar() limita el reporte a MAX_FILAS_XLSX filas.
+        """
+        from openpyxl import Workbook
+        
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet('Asistencia')
+        hoja.append(columnas)
+        for fila in filas:
+            hoja.append(fila)
+        
+        descriptor, ruta = tempfile.mkstemp(suffix='.xlsx')
+        os.close(descriptor)
+        try:
+            libro.save(ruta)
+            with open(ruta, 'rb') as archivo:
+                while bloque := archivo.read(64 * 1024):
+                    yield bloque
+        finally:
+            os.remove(ruta)
+    
+    def _parquet(self, columnas: List[str], filas: Iterable[list]) -> Iterator[bytes]:
+        """Genera el Parquet con un row group por lote, enviado apenas se escribe"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        tipos = {'Clase ID': pa.int64(), 'Socio ID': pa.int64(), 'Fecha Reserva': pa.timestamp('us')}
+        esquema = pa.schema([(columna, tipos.get(columna, pa.string())) for columna in columnas])
+        
+        salida = _SalidaDrenable()
+        with pq.ParquetWriter(salida, esquema) as escritor:
+            for lote in self._lotes(filas):
+                escritor.write_table(pa.Table.from_pylist(
+                    [dict(zip(columnas, fila)) for fila in lote], schema=esquema
+                ))
+                yield salida.drenar()
+        yield salida.drenar()
+    
+    @staticmethod
+    def _verificar_dependencia(formato: str, modulo: str) -> None:
+        """Verifica que esté instalada la dependencia opcional de un formato"""
+        try:
+            __import__(modulo)
+        except ImportError:
+            raise ValidationException(
+                f"El formato {formato} requiere el paquete '{modulo}', que no está instalado "
+                "(pip install -r requirements-export.txt)",
+                field='formato', value=formato
+            )
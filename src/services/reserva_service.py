@@ -1,13 +1,16 @@
 """Servicio de gestión de reservas"""
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
+from sqlalchemy.exc import IntegrityError
 from src.repositories.reserva_repository import ReservaRepository
 from src.repositories.socio_repository import SocioRepository
 from src.repositories.clase_repository import ClaseRepository
 from src.models.reserva import Reserva
 from src.models.socio import Socio
 from src.models.clase import Clase
-from src.utils.enums import HORARIO_CANCELACION_RESERVA_HORAS
+from src.core.dtos import ResultadoReserva
+from src.services.agregador_horarios_service import invalidar_cache_calendario
+from src.utils.enums import HORARIO_CANCELACION_RESERVA_HORAS, MotivoRechazoReserva
 
 
 class ReservaService:
@@ -27,6 +30,26 @@ class ReservaService:
         """
         Crea una nueva reserva para un socio en una clase.
         
+        Delegado en reservar(); mantiene el formato de diccionario que
+        consumen los controladores.
+        
+        Args:
+            socio_id: ID del socio que realiza la reserva
+            clase_id: ID de la clase a reservar
+            
+        Returns:
+            Dict con el resultado de la operación:
+                - success: bool indicando si fue exitosa
+                - reserva: objeto Reserva si fue exitosa
+                - message: mensaje descriptivo del resultado
+                - motivo: motivo del rechazo (None si fue exitosa)
+        """
+        return self.reservar(socio_id, clase_id).to_dict()
+    
+    def reservar(self, socio_id: int, clase_id: int) -> ResultadoReserva:
+        """
+        Reserva un lugar en una clase sin posibilidad de sobreventa.
+        
         Valida que:
         - El socio exista y tenga un plan activo
         - La clase exista y esté activa
@@ -34,98 +57,113 @@ class ReservaService:
         - Haya cupo disponible
         - El socio no tenga ya una reserva activa para esa clase
         
+        El cupo se toma con un UPDATE condicional sobre clases.cupos_ocupados
+        que es la primera escritura de la transacción: bloquea la fila de la
+        clase (o la base completa en SQLite) hasta el commit, por lo que la
+        verificación de duplicados y el INSERT posteriores quedan serializados
+        entre reservas concurrentes de la misma clase.
+        
         Args:
             socio_id: ID del socio que realiza la reserva
             clase_id: ID de la clase a reservar
             
         Returns:
-            Dict con el resultado de la operación:
-                - success: bool indicando si fue exitosa
-                - reserva: objeto Reserva si fue exitosa
-                - message: mensaje descriptivo del resultado
-                
-        Raises:
-            ValueError: Si las validaciones fallan
+            ResultadoReserva con la reserva creada o el motivo del rechazo
         """
-        # Validar que el socio existe
-        socio = self.socio_repository.get_by_id(socio_id)
+        # Validar que el socio existe (se carga junto con su plan)
+        socio = self.socio_repository.get_con_plan(socio_id)
         if not socio:
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'El socio con ID {socio_id} no existe'
-            }
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.SOCIO_INEXISTENTE,
+                f'El socio con ID {socio_id} no existe'
+            )
         
         # Validar que el socio tenga un plan activo
         if not socio.tiene_plan_activo():
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'El socio {socio.nombre_completo} no tiene un plan de membresía activo'
-            }
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.SIN_PLAN_ACTIVO,
+                f'El socio {socio.nombre_completo} no tiene un plan de membresía activo'
+            )
         
-        # Validar que la clase existe
-        clase = self.clase_repository.get_by_id(clase_id)
+        # Validar que la clase existe (se carga junto con sus planes)
+        clase = self.clase_repository.get_con_planes(clase_id)
         if not clase:
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'La clase con ID {clase_id} no existe'
-            }
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.CLASE_INEXISTENTE,
+                f'La clase con ID {clase_id} no existe'
+            )
         
         # Validar que la clase esté activa
         if not clase.activa:
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'La clase "{clase.titulo}" no está activa'
-            }
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.CLASE_INACTIVA,
+                f'La clase "{clase.titulo}" no está activa'
+            )
         
         # Validar que la clase esté incluida en el plan del socio
         if not socio.puede_acceder_clase(clase):
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'La clase "{clase.titulo}" no está incluida en el plan del socio'
-            }
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.CLASE_FUERA_DEL_PLAN,
+                f'La clase "{clase.titulo}" no está incluida en el plan del socio'
+            )
         
-        # Validar que haya cupo disponible
-        if not clase.tiene_cupo_disponible():
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'La clase "{clase.titulo}" no tiene cupo disponible'
-            }
+        # Los objetos expiran en un rollback: guardar los textos antes
+        titulo = clase.titulo
+        nombre_socio = socio.nombre_completo
+        session = self.reserva_repository.session
         
-        # Validar que el socio no tenga ya una reserva activa para esta clase
-        reserva_existente = self._tiene_reserva_activa(socio_id, clase_id)
-        if reserva_existente:
-            return {
-                'success': False,
-                'reserva': None,
-                'message': f'El socio ya tiene una reserva activa para la clase "{clase.titulo}"'
-            }
+        try:
+            # Ocupar el cupo (UPDATE condicional, toma el lock de escritura)
+            if not self.clase_repository.ocupar_cupo(clase_id):
+                session.rollback()
+                return ResultadoReserva.rechazo(
+                    MotivoRechazoReserva.SIN_CUPO,
+                    f'La clase "{titulo}" no tiene cupo disponible'
+                )
+            
+            # Validar duplicados dentro de la transacción ya serializada
+            if self.reserva_repository.existe_activa(socio_id, clase_id):
+                session.rollback()
+                return ResultadoReserva.rechazo(
+                    MotivoRechazoReserva.RESERVA_DUPLICADA,
+                    f'El socio ya tiene una reserva activa para la clase "{titulo}"'
+                )
+            
+            # Crear la reserva; el commit incluye el incremento del contador
+            reserva = Reserva(socio=socio, clase=clase)
+            session.add(reserva)
+            session.flush()
+            cupos_disponibles = clase.cupos_disponibles()
+            session.commit()
+        except IntegrityError:
+            # El índice único de reservas activas rechazó un duplicado
+            session.rollback()
+            return ResultadoReserva.rechazo(
+                MotivoRechazoReserva.RESERVA_DUPLICADA,
+                f'El socio ya tiene una reserva activa para la clase "{titulo}"'
+            )
+        except Exception:
+            session.rollback()
+            raise
         
-        # Crear la reserva
-        reserva = Reserva(socio=socio, clase=clase)
-        reserva_guardada = self.reserva_repository.save(reserva)
+        invalidar_cache_calendario()
         
         # Emitir evento de nueva reserva
         try:
             from src.extensions import socketio
             socketio.emit('actualizacion_cupos', {
-                'clase_id': clase.id,
-                'cupos_disponibles': clase.cupos_disponibles()
+                'clase_id': clase_id,
+                'cupos_disponibles': cupos_disponibles
             })
         except Exception as e:
             # No fallar si hay error en socket
             print(f"Error emitiendo evento socket: {e}")
         
-        return {
-            'success': True,
-            'reserva': reserva_guardada,
-            'message': f'Reserva creada exitosamente para {socio.nombre_completo} en "{clase.titulo}"'
-        }
+        return ResultadoReserva.ok(
+            reserva,
+            f'Reserva creada exitosamente para {nombre_socio} en "{titulo}"',
+            cupos_disponibles
+        )
     
     def cancelar_reserva(self, reserva_id: int) -> Dict[str, any]:
         """
@@ -170,9 +208,22 @@ class ReservaService:
                 'message': f'No se puede cancelar la reserva con menos de {HORARIO_CANCELACION_RESERVA_HORAS} horas de anticipación'
             }
         
-        # Cancelar la reserva
-        reserva.cancelar()
+        # Cancelar la reserva y liberar el cupo en la misma transacción. Solo
+        # libera el cupo quien logra cancelarla: otro request pudo ganarle
+        if not self.reserva_repository.cancelar_si_activa(reserva.id):
+            return {
+                'success': False,
+                'reserva': None,
+                'message': 'La reserva ya fue cancelada previamente'
+            }
+        self.clase_repository.liberar_cupo(reserva.clase_id)
         reserva_actualizada = self.reserva_repository.save(reserva)
+        invalidar_cache_calendario()
+        
+        # Ofrecer el cupo liberado a la lista de espera sin esperar al proceso nocturno
+        if reserva.clase.tiene_lista_espera:
+            from src.services.lista_espera_service import encolar_promocion
+            encolar_promocion(reserva.clase_id)
         
         # Emitir evento de cancelación
         try:
@@ -212,8 +263,7 @@ class ReservaService:
         Returns:
             Lista de reservas activas del socio
         """
-        reservas = self.reserva_repository.find_by_socio(socio_id)
-        return [r for r in reservas if r.esta_activa()]
+        return self.reserva_repository.find_activas_by_socio(socio_id)
     
     def listar_reservas_clase(self, clase_id: int) -> List[Reserva]:
         """
@@ -239,23 +289,6 @@ class ReservaService:
         """
         return self.reserva_repository.get_by_id(reserva_id)
     
-    def _tiene_reserva_activa(self, socio_id: int, clase_id: int) -> bool:
-        """
-        Verifica si un socio tiene una reserva activa para una clase.
-        
-        Args:
-            socio_id: ID del socio
-            clase_id: ID de la clase
-            
-        Returns:
-            True si tiene reserva activa, False en caso contrario
-        """
-        reservas = self.reserva_repository.find_by_socio(socio_id)
-        for reserva in reservas:
-            if reserva.clase_id == clase_id and reserva.esta_activa():
-                return True
-        return False
-    
     def _puede_cancelar_reserva(self, reserva: Reserva) -> bool:
         """
         Verifica si una reserva puede ser cancelada.
@@ -306,9 +339,8 @@ class ReservaService:
                 'tiene_cupo': False
             }
         
-        reservas_activas = self.reserva_repository.get_reservas_activas_clase(clase_id)
-        cupos_ocupados = len(reservas_activas)
-        cupos_disponibles = clase.cupo_maximo - cupos_ocupados
+        cupos_ocupados = clase.cupos_ocupados
+        cupos_disponibles = clase.cupos_disponibles()
         
         return {
             'cupo_maximo': clase.cupo_maximo,
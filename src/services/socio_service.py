@@ -1,8 +1,101 @@
 from typing import Dict, Any, Optional
+from flask import current_app, has_app_context
 from src.models.socio import Socio
 from src.models.plan_membresia import PlanMembresia
 from src.repositories.socio_repository import SocioRepository
-from src.config.database import db 
+from src.config.database import db, incrementar_version_catalogo, version_catalogo
+from src.core.cache import CacheSWR, LRUCacheStore, VersionCompartida
+from src.core.logging_config import get_logger
+from src.exceptions.base_exceptions import NotFoundException
+
+logger = get_logger(__name__)
+
+# Resumen del socio logueado (nombre, estado y plan) que usan las plantillas.
+# Se invalida al cambiar el plan o el estado. Cada worker tiene su propio
+# cache: al invalidar se incrementa la versión 'resumen_socio' en la base y
+# los demás workers la consultan cada INTERVALO_VERIFICACION_SEGUNDOS y
+# descartan sus resúmenes si cambió. El TTL acota lo que puede quedar
+# desactualizado si el cambio se hace por fuera de los servicios.
+PREFIJO_CACHE_RESUMEN_SOCIO = 'resumen_socio:'
+CLAVE_VERSION_RESUMEN_SOCIO = 'resumen_socio'
+INTERVALO_VERIFICACION_SEGUNDOS = 5
+TTL_RESUMEN_SOCIO_SEGUNDOS = 300
+MAX_RESUMENES_SOCIO = 1024
+
+
+def _obtener_cache_resumenes() -> Optional[CacheSWR]:
+    """Obtiene el cache de resúmenes de la aplicación actual (en app.extensions)"""
+    if not has_app_context():
+        return None
+    cache = current_app.extensions.get('resumen_socio_cache')
+    if cache is None:
+        cache = CacheSWR(LRUCacheStore(MAX_RESUMENES_SOCIO), TTL_RESUMEN_SOCIO_SEGUNDOS, 0)
+        current_app.extensions['resumen_socio_cache'] = cache
+        current_app.extensions['resumen_socio_version'] = VersionCompartida(
+            lambda: version_catalogo(CLAVE_VERSION_RESUMEN_SOCIO), INTERVALO_VERIFICACION_SEGUNDOS)
+    try:
+        if current_app.extensions['resumen_socio_version'].cambio():
+            cache.invalidar(PREFIJO_CACHE_RESUMEN_SOCIO)
+    except Exception as e:
+        logger.error(f"Error verificando la versión de los resúmenes de socio: {e}")
+    return cache
+
+
+def _calcular_resumen_socio(socio_id: int) -> Optional[Dict[str, Any]]:
+    """Arma el resumen de un socio con una única consulta (socio + plan)"""
+    socio = SocioRepository().get_con_plan(socio_id)
+    if socio is None:
+        return None
+    plan = socio.plan_membresia
+    return {
+        'id': socio.id,
+        'nombre': socio.nombre_completo,
+        'estado': socio.estado_membresia.value if socio.estado_membresia else None,
+        'plan': {'id': plan.id, 'titulo': plan.titulo, 'nivel': plan.nivel} if plan else None
+    }
+
+
+def obtener_resumen_socio(socio_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Obtiene el resumen cacheado de un socio (nombre, estado y plan).
+    
+    Args:
+        socio_id: ID del socio
+        
+    Returns:
+        Diccionario con id, nombre, estado y plan (id, titulo, nivel o
+        None), o None si el socio no existe
+    """
+    cache = _obtener_cache_resumenes()
+    if cache is None:
+        return _calcular_resumen_socio(socio_id)
+    clave = f'{PREFIJO_CACHE_RESUMEN_SOCIO}{socio_id}:'
+    return cache.obtener(clave, lambda: _calcular_resumen_socio(socio_id)).valor
+
+
+def invalidar_resumen_socio(socio_id: Optional[int] = None) -> None:
+    """
+    Invalida el resumen cacheado de un socio, o el de todos.
+    
+    En los demás workers se descartan todos los resúmenes al ver la nueva
+    versión (a lo sumo INTERVALO_VERIFICACION_SEGUNDOS después).
+    
+    Args:
+        socio_id: ID del socio; si es None se invalidan todos (ej. al
+            modificar un plan o al actualizar socios en lote)
+    """
+    try:
+        incrementar_version_catalogo(CLAVE_VERSION_RESUMEN_SOCIO)
+    except Exception as e:
+        logger.error(f"Error incrementando la versión de los resúmenes de socio: {e}")
+    try:
+        cache = _obtener_cache_resumenes()
+        if cache is not None:
+            sufijo = f'{socio_id}:' if socio_id is not None else ''
+            cache.invalidar(f'{PREFIJO_CACHE_RESUMEN_SOCIO}{sufijo}')
+    except Exception as e:
+        logger.error(f"Error invalidando el resumen del socio: {e}")
+
 
 class SocioService:
     def __init__(self):
@@ -56,6 +149,72 @@ class SocioService:
         # Si tu repositorio base usa 'add' o 'save', cambialo aquí.
         return self.socio_repository.create(nuevo_socio)
 
+    def actualizar_membresia(self, socio: Socio) -> Socio:
+        """
+        Guarda los cambios de plan o estado de membresía de un socio.
+        
+        Args:
+            socio: Socio con el plan y/o el estado ya modificados
+            
+        Returns:
+            El socio actualizado
+        """
+        socio = self.socio_repository.update(socio)
+        invalidar_resumen_socio(socio.id)
+        return socio
+
+    def eliminar_socio(self, socio_id: int) -> str:
+        """
+        Elimina un socio junto con sus reservas, solicitudes de baja y pagos.
+        
+        Cada reserva se cancela con un UPDATE condicional antes de borrarla
+        y solo libera su cupo si la canceló esta llamada: si el socio la
+        canceló al mismo tiempo, el cupo ya se liberó. Las clases con lista
+        de espera reciben la promoción después de confirmar.
+        
+        Args:
+            socio_id: ID del socio
+            
+        Returns:
+            Nombre completo del socio eliminado
+            
+        Raises:
+            NotFoundException: Si el socio no existe
+        """
+        from src.repositories.clase_repository import ClaseRepository
+        from src.repositories.reserva_repository import ReservaRepository
+        from src.services.agregador_horarios_service import invalidar_cache_calendario
+        from src.services.lista_espera_service import encolar_promocion
+
+        socio = self.socio_repository.get_by_id(socio_id)
+        if not socio:
+            raise NotFoundException('Socio', socio_id)
+        nombre = socio.nombre_completo
+
+        reserva_repository = ReservaRepository()
+        clase_repository = ClaseRepository()
+        clases_liberadas = []
+        for reserva in socio.reservas:
+            if reserva_repository.cancelar_si_activa(reserva.id):
+                clase_repository.liberar_cupo(reserva.clase_id)
+                if reserva.clase.tiene_lista_espera:
+                    clases_liberadas.append(reserva.clase_id)
+            db.session.delete(reserva)
+
+        for solicitud in socio.solicitudes_baja:
+            db.session.delete(solicitud)
+        for pago in socio.pagos:
+            db.session.delete(pago)
+
+        db.session.delete(socio)
+        db.session.commit()
+
+        invalidar_cache_calendario()
+        invalidar_resumen_socio(socio_id)
+        for clase_id in clases_liberadas:
+            encolar_promocion(clase_id)
+        return nombre
+
     def obtener_todos(self):
         """Devuelve todos los socios (útil para tu lista)"""
         return self.socio_repository.find_all() # Asumiendo que BaseRepository tiene find_all
\ No newline at end of file
@@ -2,9 +2,14 @@
 from typing import List
 from src.repositories.solicitud_baja_repository import SolicitudBajaRepository
 from src.repositories.socio_repository import SocioRepository
+from src.repositories.unit_of_work import uow
 from src.models.solicitud_baja import SolicitudBaja
+from src.services.socio_service import invalidar_resumen_socio
+from src.core.logging_config import get_logger
 from src.utils.enums import LONGITUD_MINIMA_SOLICITUD_BAJA
 
+logger = get_logger(__name__)
+
 
 class SolicitudBajaService:
     """Servicio para operaciones de negocio relacionadas con Solicitudes de Baja"""
@@ -82,14 +87,13 @@ class SolicitudBajaService:
             justificacion=justificacion
         )
         
-        # Actualizar estado del socio
-        print(f">>> DEBUG SERVICE: Updating socio {socio.id} status to BAJA_SOLICITADA")
-        socio.solicitar_baja()
-        self.socio_repo.update(socio)
-        
-        print(f">>> DEBUG SERVICE: Creating SolicitudBaja for socio {socio.id}")
-        creada = self.solicitud_repo.create(nueva_solicitud)
-        print(f">>> DEBUG SERVICE: Solicitud created with ID {creada.id} and State {creada.estado}")
+        # Actualizar estado del socio y crear la solicitud en una sola transacción
+        with uow():
+            socio.solicitar_baja()
+            self.socio_repo.update(socio)
+            creada = self.solicitud_repo.create(nueva_solicitud)
+        invalidar_resumen_socio(socio_id)
+        logger.debug(f"Solicitud de baja {creada.id} creada para el socio {socio.id}")
         return creada
     
     def listar_solicitudes_pendientes(self) -> List[SolicitudBaja]:
@@ -134,8 +138,11 @@ class SolicitudBajaService:
         if not solicitud.esta_pendiente():
             raise ValueError("Solo se pueden aprobar solicitudes pendientes")
         
+        # aprobar() da de baja al socio: su resumen cacheado queda desactualizado
         solicitud.aprobar(comentario_admin)
-        return self.solicitud_repo.update(solicitud)
+        aprobada = self.solicitud_repo.update(solicitud)
+        invalidar_resumen_socio(aprobada.socio_id)
+        return aprobada
     
     def rechazar_solicitud(self, solicitud_id: int, 
                           comentario_admin: str) -> SolicitudBaja:
@@ -161,14 +168,17 @@ class SolicitudBajaService:
         if not solicitud.esta_pendiente():
             raise ValueError("Solo se pueden rechazar solicitudes pendientes")
         
-        # Reactivar al socio
-        socio = solicitud.socio
-        from src.utils.enums import EstadoMembresia
-        socio.estado_membresia = EstadoMembresia.ACTIVA
-        self.socio_repo.update(socio)
-        
-        solicitud.rechazar(comentario_admin)
-        return self.solicitud_repo.update(solicitud)
+        # Reactivar al socio y rechazar la solicitud en una sola transacción
+        with uow():
+            socio = solicitud.socio
+            from src.utils.enums import EstadoMembresia
+            socio.estado_membresia = EstadoMembresia.ACTIVA
+            self.socio_repo.update(socio)
+            
+            solicitud.rechazar(comentario_admin)
+            self.solicitud_repo.update(solicitud)
+        invalidar_resumen_socio(socio.id)
+        return solicitud
     
     def obtener_solicitudes_socio(self, socio_id: int) -> List[SolicitudBaja]:
         """
@@ -36,6 +36,25 @@ class EstadoMembresia(Enum):
     BAJA_DEFINITIVA = "baja_definitiva"
 
 
+class MotivoRechazoReserva(Enum):
+    """Motivos por los que se rechaza un intento de reserva"""
+    SOCIO_INEXISTENTE = "socio_inexistente"
+    SIN_PLAN_ACTIVO = "sin_plan_activo"
+    CLASE_INEXISTENTE = "clase_inexistente"
+    CLASE_INACTIVA = "clase_inactiva"
+    CLASE_FUERA_DEL_PLAN = "clase_fuera_del_plan"
+    SIN_CUPO = "sin_cupo"
+    RESERVA_DUPLICADA = "reserva_duplicada"
+
+
+class EstadoTarea(Enum):
+    """Estados de una tarea en segundo plano"""
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADA = "completada"
+    FALLIDA = "fallida"
+
+
 # Constantes
 LONGITUD_MINIMA_SOLICITUD_BAJA = 20
 HORARIO_CANCELACION_RESERVA_HORAS = 24
@@ -0,0 +1,71 @@
+"""
+Benchmark del arranque de la aplicación.
+
+Mide, en un proceso nuevo por repetición, el tiempo de importar src.main
+y el tiempo de create_app() sobre una base SQLite temporal. La primera
+repetición encuentra la base vacía (crea el esquema); las siguientes la
+encuentran con el esquema al día, que es el caso de cada reinicio o de
+cada worker nuevo.
+
+Uso:
+    python tests/benchmark_arranque.py --repeticiones 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+MEDICION = """
+import json, os, time
+inicio = time.perf_counter()
+from src.main import create_app
+importado = time.perf_counter()
+create_app()
+fin = time.perf_counter()
+print(json.dumps({'importacion': importado - inicio, 'create_app': fin - importado}))
+os._exit(0)  # no esperar a los hilos del scheduler ni del ejecutor de tareas
+"""
+
+
+def medir(entorno: dict) -> dict:
+    """Ejecuta una medición en un proceso nuevo y devuelve los tiempos en segundos"""
+    salida = subprocess.run(
+        [sys.executable, '-c', MEDICION], env=entorno, cwd=os.getcwd(),
+        capture_output=True, text=True, check=True
+    ).stdout
+    ultima = [linea for linea in salida.splitlines() if linea.startswith('{')][-1]
+    return json.loads(ultima)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='fitflow_bench_')
+    entorno = {
+        **os.environ,
+        'DATABASE_URL': f"sqlite:///{os.path.join(directorio, 'bench.db')}",
+        'PYTHONPATH': os.getcwd(),
+        'LOG_LEVEL': 'WARNING',
+    }
+
+    primera = medir(entorno)
+    siguientes = [medir(entorno) for _ in range(args.repeticiones)]
+
+    def ms(segundos):
+        return f"{segundos * 1000:7.1f} ms"
+
+    print(f"{'':24}{'importación':>12}{'create_app':>12}")
+    print(f"{'base vacía':24}{ms(primera['importacion']):>12}{ms(primera['create_app']):>12}")
+    for nombre, funcion in (('mediana (esquema al día)', statistics.median), ('mínimo', min)):
+        print(f"{nombre:24}"
+              f"{ms(funcion(m['importacion'] for m in siguientes)):>12}"
+              f"{ms(funcion(m['create_app'] for m in siguientes)):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de la importación masiva de socios desde CSV.
+
+Genera un CSV sintético (por defecto 100.000 filas, con un pequeño
+porcentaje de filas inválidas) y mide la importación sobre una base
+SQLite temporal.
+
+Uso:
+    python tests/benchmark_importacion_csv.py --filas 100000
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+# Base temporal: se configura antes de importar src (Settings se carga al importar)
+DIRECTORIO = tempfile.mkdtemp(prefix='fitflow_bench_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DIRECTORIO, 'bench.db')}"
+os.environ['TESTING'] = 'true'
+
+sys.path.append(os.getcwd())
+
+from src.main import create_app
+from src.config.database import db
+from src.models import PlanMembresia
+
+
+def generar_csv(ruta: str, filas: int, plan_id: int) -> None:
+    """Escribe un CSV de socios con ~1% de filas inválidas"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['Nombre', 'Apellido', 'DNI', 'Email', 'ID Plan Membresía'])
+        for i in range(filas):
+            plan = plan_id if i % 100 else 'x'
+            escritor.writerow([f'Nombre{i}', f'Apellido{i}', f'B{i:08d}',
+                               f'socio{i}@bench.com', plan])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        from src.services.csv_importer_service import CSVImporterService
+
+        plan = PlanMembresia("Plan Benchmark", "Plan para el benchmark", 1000.0)
+        db.session.add(plan)
+        db.session.commit()
+        ruta = os.path.join(DIRECTORIO, 'socios.csv')
+        generar_csv(ruta, args.filas, plan.id)
+
+        inicio = time.perf_counter()
+        resultado = CSVImporterService().importar_socios(ruta)
+        duracion = time.perf_counter() - inicio
+
+    print(f"Filas: {resultado['total']} | creados: {resultado['creados']} | "
+          f"actualizados: {resultado['actualizados']} | errores: {len(resultado['errores'])}")
+    print(f"Duración: {duracion:.2f} s ({resultado['total'] / duracion:,.0f} filas/s)")
+
+
+if __name__ == '__main__':
+    main()
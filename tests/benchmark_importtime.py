@@ -0,0 +1,103 @@
+"""
+Benchmark de regresión del arranque con `python -X importtime`.
+
+Ejecuta `from src.main import create_app; create_app()` en un proceso nuevo
+con -X importtime, muestra los paquetes que más tiempo propio suman y falla
+(código de salida 1) si importar src.main más create_app() supera el
+presupuesto o si se cargó alguna dependencia pesada que debe ser perezosa
+(pandas solo se usa al importar o exportar socios).
+
+Uso:
+    python tests/benchmark_importtime.py --presupuesto-ms 1500 --top 15
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+# Dependencias que no deben cargarse al arrancar la aplicación
+MODULOS_PEREZOSOS = ('pandas', 'numpy', 'openpyxl')
+
+MEDICION = """
+import json, os, sys, time
+inicio = time.perf_counter()
+from src.main import create_app
+importado = time.perf_counter()
+create_app()
+fin = time.perf_counter()
+print(json.dumps({
+    'importacion': importado - inicio,
+    'create_app': fin - importado,
+    'perezosos': [m for m in %r if m in sys.modules],
+}))
+os._exit(0)  # no esperar a los hilos del scheduler ni del ejecutor de tareas
+""" % (MODULOS_PEREZOSOS,)
+
+LINEA_IMPORTTIME = re.compile(r'^import time:\s+(\d+)\s+\|\s+\d+\s+\|\s+(\S+)')
+
+
+def medir(entorno: dict):
+    """
+    Ejecuta la medición en un proceso nuevo.
+
+    Returns:
+        Tupla (tiempos en segundos, lista de (tiempo_propio_us, paquete) de mayor a menor)
+    """
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', MEDICION], env=entorno,
+        cwd=os.getcwd(), capture_output=True, text=True, check=True
+    )
+    ultima = [linea for linea in proceso.stdout.splitlines() if linea.startswith('{')][-1]
+
+    # Suma el tiempo propio de cada módulo en su paquete raíz (sqlalchemy, flask, src...)
+    paquetes = {}
+    for linea in proceso.stderr.splitlines():
+        coincidencia = LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            raiz = coincidencia.group(2).split('.')[0]
+            paquetes[raiz] = paquetes.get(raiz, 0) + int(coincidencia.group(1))
+    return json.loads(ultima), sorted(((us, p) for p, us in paquetes.items()), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--presupuesto-ms', type=float, default=1500,
+                        help='Máximo para importar src.main más create_app()')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='fitflow_importtime_')
+    entorno = {
+        **os.environ,
+        'DATABASE_URL': f"sqlite:///{os.path.join(directorio, 'bench.db')}",
+        'PYTHONPATH': os.getcwd(),
+        'LOG_LEVEL': 'WARNING',
+    }
+
+    medir(entorno)  # crea el esquema; se mide el arranque con el esquema al día
+    tiempos, paquetes = medir(entorno)
+
+    print(f"{'propio':>12}  paquete")
+    for propio, paquete in paquetes[:args.top]:
+        print(f"{propio / 1000:9.1f} ms  {paquete}")
+
+    total_ms = (tiempos['importacion'] + tiempos['create_app']) * 1000
+    print(f"\nimportación {tiempos['importacion'] * 1000:.1f} ms + "
+          f"create_app {tiempos['create_app'] * 1000:.1f} ms = {total_ms:.1f} ms "
+          f"(presupuesto {args.presupuesto_ms:.0f} ms)")
+
+    fallas = []
+    if total_ms > args.presupuesto_ms:
+        fallas.append(f"el arranque supera el presupuesto por {total_ms - args.presupuesto_ms:.1f} ms")
+    if tiempos['perezosos']:
+        fallas.append(f"se cargaron al arrancar: {', '.join(tiempos['perezosos'])}")
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    sys.exit(1 if fallas else 0)
+
+
+if __name__ == '__main__':
+    main()
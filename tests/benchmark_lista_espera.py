@@ -0,0 +1,140 @@
+"""
+Benchmark de las operaciones de la cola de lista de espera.
+
+Crea N clases llenas con lista de espera y M socios (por defecto 500 y
+10.000), inscribe a cada socio en la lista de una clase, libera cupos en
+todas las clases y mide:
+
+- la inscripción (asignación de posición),
+- la reconciliación nocturna (procesar_liberaciones_cupos),
+- la promoción por evento de un cupo por clase (promover_lista_espera),
+
+con la cantidad de consultas de cada etapa. También verifica que cada
+clase haya notificado a tantos socios distintos como cupos liberó.
+
+Uso:
+    python tests/benchmark_lista_espera.py --clases 500 --socios 10000 --liberados 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import time as hora
+
+# Base temporal: se configura antes de importar src (Settings se carga al importar)
+DIRECTORIO = tempfile.mkdtemp(prefix='fitflow_bench_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DIRECTORIO, 'bench.db')}"
+os.environ['TESTING'] = 'true'
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import event, func, insert, update
+from src.main import create_app
+from src.config.database import db
+from src.models import Clase, Entrenador, Horario, ListaEspera, Socio
+from src.utils.enums import DiaSemana
+
+
+@contextmanager
+def medir(nombre: str, resultados: list):
+    """Mide la duración y la cantidad de consultas del bloque"""
+    consultas = [0]
+
+    def contar(*args):
+        consultas[0] += 1
+
+    event.listen(db.engine, 'before_cursor_execute', contar)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracion = time.perf_counter() - inicio
+        event.remove(db.engine, 'before_cursor_execute', contar)
+        resultados.append((nombre, duracion, consultas[0]))
+
+
+def sembrar(clases: int, socios: int) -> None:
+    """Crea las clases (llenas, con lista de espera) y los socios con inserts en lote"""
+    entrenador = Entrenador("Bench", "Mark", "bench@fitflow.com", "Benchmark")
+    db.session.add(entrenador)
+    db.session.flush()
+    horarios = [Horario(DiaSemana.LUNES, hora(8 + i % 12, 0), hora(9 + i % 12, 0))
+                for i in range(clases)]
+    db.session.add_all(horarios)
+    db.session.flush()
+    db.session.execute(insert(Clase), [{
+        'titulo': f'Clase {i}', 'descripcion': 'Benchmark', 'cupo_maximo': 20,
+        'cupos_ocupados': 20, 'activa': True, 'tiene_lista_espera': True,
+        'entrenador_id': entrenador.id, 'horario_id': horarios[i].id,
+    } for i in range(clases)])
+    db.session.execute(insert(Socio), [{
+        'nombre': f'Socio{i}', 'apellido': 'Bench', 'dni': f'L{i:08d}',
+        'email': f'espera{i}@bench.com',
+    } for i in range(socios)])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clases', type=int, default=500)
+    parser.add_argument('--socios', type=int, default=10_000)
+    parser.add_argument('--liberados', type=int, default=2, help='Cupos liberados por clase')
+    args = parser.parse_args()
+
+    app = create_app()
+    resultados = []
+    with app.app_context():
+        from src.services.lista_espera_service import ListaEsperaService
+
+        sembrar(args.clases, args.socios)
+        servicio = ListaEsperaService()
+        clases = [fila.id for fila in db.session.query(Clase.id).order_by(Clase.id)]
+        socios = [fila.id for fila in db.session.query(Socio.id).order_by(Socio.id)]
+
+        # Cada inscripción con la sesión vacía, como en un request
+        with medir('inscripción', resultados):
+            for i, socio_id in enumerate(socios):
+                servicio.inscribir_en_lista_espera(
+                    db.session.get(Socio, socio_id),
+                    db.session.get(Clase, clases[i % len(clases)])
+                )
+                db.session.expunge_all()
+
+        db.session.execute(update(Clase).values(cupos_ocupados=20 - args.liberados))
+        db.session.commit()
+        db.session.expire_all()
+
+        with medir('reconciliación nocturna', resultados):
+            servicio.procesar_liberaciones_cupos()
+
+        notificados = (db.session.query(ListaEspera.clase_id,
+                                        func.count(func.distinct(ListaEspera.socio_id)))
+                       .filter_by(notificado=True, activo=True)
+                       .group_by(ListaEspera.clase_id).all())
+        correctas = sum(1 for _, cantidad in notificados if cantidad == args.liberados)
+
+        # Un cupo más por clase: cada liberación se atiende con un evento
+        db.session.execute(update(Clase).values(cupos_ocupados=Clase.cupos_ocupados - 1))
+        db.session.commit()
+        with medir('promoción por evento', resultados):
+            for clase_id in clases:
+                servicio.promover_lista_espera(clase_id, 1)
+                db.session.expunge_all()
+
+    print(f"{args.clases} clases, {args.socios} socios en lista de espera, "
+          f"{args.liberados} cupos liberados por clase\n")
+    print(f"{'etapa':26}{'total':>10}{'por operación':>16}{'consultas':>11}")
+    operaciones = {'inscripción': args.socios, 'reconciliación nocturna': 1,
+                   'promoción por evento': args.clases}
+    for nombre, duracion, consultas in resultados:
+        por_operacion = duracion / operaciones[nombre] * 1000
+        print(f"{nombre:26}{duracion:9.2f}s{por_operacion:13.3f} ms{consultas:11}")
+    print(f"\nClases con {args.liberados} socios distintos notificados: "
+          f"{correctas}/{args.clases}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ from datetime import time
 from src.main import create_app
 from src.config.database import db
 from src.models import Socio, Clase, Horario, Entrenador, PlanMembresia
+from src.repositories.clase_repository import ClaseRepository
 from src.utils.enums import DiaSemana
 
 @pytest.fixture
@@ -109,6 +110,7 @@ def datos(app):
         # Asociar clases al plan
         plan.clases.append(clase1)
         plan.clases.append(clase2)
+        ClaseRepository().recalcular_nivel_minimo()
         
         # Asignar plan a socios
         socio1.plan = plan
@@ -0,0 +1,53 @@
+"""Tests para la carga perezosa de servicios y dependencias pesadas"""
+import os
+import subprocess
+import sys
+from src.api.controllers.base_controller import ServicioPerezoso
+
+
+class TestServicioPerezoso:
+    """Tests para los servicios de controlador construidos en el primer uso"""
+
+    def test_construye_una_sola_vez_en_el_primer_acceso(self):
+        creados = []
+
+        class Servicio:
+            def __init__(self):
+                creados.append(self)
+
+            def saludar(self):
+                return 'hola'
+
+        servicio = ServicioPerezoso(Servicio)
+        assert creados == []
+
+        assert servicio.saludar() == 'hola'
+        assert servicio.saludar() == 'hola'
+        assert len(creados) == 1
+        assert servicio.instancia() is creados[0]
+
+    def test_controladores_no_construyen_servicios_al_importar(self, app):
+        from src.api.controllers import socio_controller
+
+        assert isinstance(socio_controller.socio_service, ServicioPerezoso)
+        assert isinstance(socio_controller.csv_importer, ServicioPerezoso)
+
+
+class TestDependenciasPerezosas:
+    """pandas se carga al importar o exportar, no al arrancar"""
+
+    def test_create_app_no_importa_pandas(self, tmp_path):
+        codigo = (
+            "import os, sys\n"
+            "from src.main import create_app\n"
+            "create_app()\n"
+            "print('pandas' in sys.modules)\n"
+            "os._exit(0)\n"
+        )
+        entorno = {**os.environ, 'DATABASE_URL': f"sqlite:///{tmp_path / 'arranque.db'}",
+                   'PYTHONPATH': os.getcwd(), 'LOG_LEVEL': 'WARNING'}
+
+        salida = subprocess.run([sys.executable, '-c', codigo], env=entorno, cwd=os.getcwd(),
+                                capture_output=True, text=True, check=True).stdout
+
+        assert salida.strip().splitlines()[-1] == 'False'
@@ -0,0 +1,122 @@
+"""Tests para la configuración del engine y el pool de conexiones"""
+import threading
+from dataclasses import replace
+from sqlalchemy import create_engine, text
+from src.config.database import (
+    db, PoolConMetricas, configurar_pragmas_sqlite, estado_pool, opciones_engine
+)
+from src.config.settings import settings
+
+
+class TestConfiguracionEngine:
+    """Tests para opciones_engine y los PRAGMAs de SQLite"""
+
+    def test_opciones_de_pool_para_postgres(self):
+        config = replace(settings.database, pool_size=7, max_overflow=3, pool_recycle=600)
+
+        opciones = opciones_engine('postgresql://u:p@localhost/fitflow', config)
+
+        assert opciones['poolclass'] is PoolConMetricas
+        assert opciones['pool_size'] == 7
+        assert opciones['max_overflow'] == 3
+        assert opciones['pool_recycle'] == 600
+        assert opciones['pool_pre_ping'] is True
+
+    def test_sqlite_en_archivo_sin_recycle_y_en_memoria_sin_opciones(self):
+        opciones = opciones_engine('sqlite:///fitflow.db', settings.database)
+
+        assert 'pool_recycle' not in opciones
+        assert opciones['connect_args']['timeout'] == settings.database.sqlite_busy_timeout_ms / 1000
+        assert opciones_engine('sqlite://', settings.database) == {}
+
+    def test_pragmas_aplicados_a_las_conexiones_de_la_app(self, app):
+        with db.engine.connect() as conexion:
+            pragma = lambda nombre: conexion.execute(text(f'PRAGMA {nombre}')).scalar()
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('busy_timeout') == settings.database.sqlite_busy_timeout_ms
+            assert pragma('cache_size') == -settings.database.sqlite_cache_mb * 1024
+
+
+class TestEstadoPool:
+    """Tests para las métricas del pool y su exposición en /health"""
+
+    def test_cuenta_los_checkouts_que_esperan(self, tmp_path):
+        config = replace(settings.database, pool_size=1, max_overflow=0, pool_timeout=5)
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}",
+                               **opciones_engine(f"sqlite:///{tmp_path / 'pool.db'}", config))
+        configurar_pragmas_sqlite(engine, config)
+        ocupada = engine.connect()
+
+        threading.Timer(0.1, ocupada.close).start()
+        with engine.connect() as conexion:
+            conexion.execute(text('SELECT 1'))
+            estado = estado_pool(engine)
+
+        assert estado['en_uso'] == 1
+        assert estado['esperas'] == 1
+        assert estado['espera_total_ms'] >= 50
+        engine.dispose()
+
+    def test_health_informa_el_pool(self, client):
+        respuesta = client.get('/health')
+        base = respuesta.get_json()['checks']['database']
+
+        assert respuesta.status_code == 200
+        assert base['type'] == 'sqlite'
+        assert base['pool']['clase'] == 'PoolConMetricas'
+        assert base['pool']['tamano'] == settings.database.pool_size
+        assert {'en_uso', 'libres', 'overflow', 'esperas', 'espera_total_ms'} <= set(base['pool'])
+
+
+class TestVersionEsquema:
+    """Tests para la verificación de la versión de esquema al iniciar"""
+
+    def test_init_db_omite_create_all_con_esquema_al_dia(self, app, monkeypatch):
+        from flask import Flask
+        from src.config import database
+
+        assert database.esquema_al_dia(database.version_esquema())
+        llamadas = []
+        monkeypatch.setattr(database, 'actualizar_esquema', lambda *args: llamadas.append(args))
+
+        otra = Flask(__name__)
+        otra.config['SQLALCHEMY_DATABASE_URI'] = app.config['SQLALCHEMY_DATABASE_URI']
+        database.init_db(otra)
+
+        assert llamadas == []
+
+    def test_version_distinta_vuelve_a_migrar(self, app):
+        from src.config.database import (
+            actualizar_esquema, esquema_al_dia, esquema_version, version_esquema
+        )
+
+        db.session.execute(esquema_version.update().values(version='anterior'))
+        db.session.commit()
+        assert not esquema_al_dia(version_esquema())
+
+        actualizar_esquema()
+
+        assert esquema_al_dia(version_esquema())
+
+
+class TestDatosDemo:
+    """Tests para la carga explícita de datos de ejemplo (init-db)"""
+
+    def test_carga_una_sola_vez_y_completa_multimedia(self, app):
+        from src.config.datos_demo import cargar_datos_demo, completar_multimedia_clases
+        from src.models import Clase, PlanMembresia, Reserva, Socio
+
+        assert PlanMembresia.query.count() == 0  # create_app ya no carga datos
+        assert cargar_datos_demo()
+        assert not cargar_datos_demo()
+        assert (PlanMembresia.query.count(), Clase.query.count(),
+                Socio.query.count(), Reserva.query.count()) == (3, 7, 8, 10)
+
+        clase = Clase.query.filter_by(titulo="Pilates").one()
+        clase.imagen_url = None
+        db.session.commit()
+
+        assert completar_multimedia_clases() == 1
+        assert clase.imagen_url.startswith('https://')
+        assert completar_multimedia_clases() == 0
@@ -0,0 +1,99 @@
+"""Tests para el cache del calendario consolidado"""
+import time
+from unittest.mock import patch
+from src.config.database import db, incrementar_version_catalogo
+from src.services import agregador_horarios_service
+from src.core.cache import CacheSWR, EntradaCache, LRUCacheStore, SQLiteCacheStore
+from src.services.agregador_horarios_service import (
+    AgregadorHorariosService,
+    ModoVisualizacion,
+    obtener_cache_calendario
+)
+
+
+class TestCacheStores:
+    """Tests para los almacenamientos del cache"""
+
+    def test_lru_descarta_la_menos_usada_e_invalida_por_prefijo(self):
+        store = LRUCacheStore(max_entradas=2)
+        entrada = EntradaCache([1], 0, 0, 0)
+        store.guardar('calendario:a', entrada)
+        store.guardar('otro:b', entrada)
+        store.obtener('calendario:a')
+        store.guardar('calendario:c', entrada)
+
+        assert store.obtener('otro:b') is None
+        store.invalidar('calendario:')
+        assert store.obtener('calendario:a') is None
+        assert store.obtener('calendario:c') is None
+
+    def test_sqlite_compartido_entre_instancias(self, tmp_path):
+        ruta = str(tmp_path / 'cache.db')
+        SQLiteCacheStore(ruta).guardar('calendario:x', EntradaCache([{'id': 'a'}], 1.0, 2.0, 3.0))
+
+        otra_instancia = SQLiteCacheStore(ruta)
+        assert otra_instancia.obtener('calendario:x').valor == [{'id': 'a'}]
+        otra_instancia.invalidar('calendario:')
+        assert SQLiteCacheStore(ruta).obtener('calendario:x') is None
+
+    def test_stale_while_revalidate(self):
+        cache = CacheSWR(LRUCacheStore(), ttl_segundos=0, ventana_stale_segundos=60)
+        cache.refrescar('clave', lambda: 'viejo')
+
+        entrada = cache.obtener('clave', lambda: 'nuevo')
+
+        assert entrada.valor == 'viejo'
+        for _ in range(50):
+            if cache.store.obtener('clave').valor == 'nuevo':
+                break
+            time.sleep(0.01)
+        assert cache.store.obtener('clave').valor == 'nuevo'
+
+
+class TestCacheCalendario:
+    """Tests para el uso del cache en AgregadorHorariosService"""
+
+    def test_segunda_lectura_no_consulta_las_fuentes(self, app):
+        servicio = AgregadorHorariosService()
+        with patch.object(servicio, 'obtener_clases_externas', return_value=[]), \
+             patch.object(servicio, 'obtener_clases_internas',
+                          wraps=servicio.obtener_clases_internas) as internas:
+            primero = servicio.obtener_calendario_consolidado(ModoVisualizacion.OCUPADO)
+            segundo = servicio.obtener_calendario_consolidado(ModoVisualizacion.OCUPADO)
+            servicio.obtener_estadisticas_calendario()
+
+        assert internas.call_count == 1
+        assert [e.to_dict() for e in primero] == [e.to_dict() for e in segundo]
+
+    def test_reserva_invalida_el_cache(self, app, datos):
+        from src.models import PlanMembresia, Socio
+        from src.services.reserva_service import ReservaService
+
+        socio = db.session.get(Socio, datos['socio1'])
+        socio.asignar_plan(db.session.get(PlanMembresia, datos['plan']))
+        db.session.commit()
+        reserva = ReservaService().crear_reserva(datos['socio1'], datos['clase1'])['reserva']
+
+        servicio = AgregadorHorariosService()
+        servicio.obtener_calendario_consolidado(ModoVisualizacion.OCUPADO)
+        cache = obtener_cache_calendario()
+        clave = servicio._clave_cache(ModoVisualizacion.OCUPADO, None, None)
+        assert cache.store.obtener(clave) is not None
+
+        ReservaService().cancelar_reserva(reserva.id)
+
+        assert cache.store.obtener(clave) is None
+
+    def test_invalidacion_de_otro_worker_por_version(self, app, monkeypatch):
+        monkeypatch.setattr(agregador_horarios_service, 'INTERVALO_VERIFICACION_SEGUNDOS', 0)
+        servicio = AgregadorHorariosService()
+        with patch.object(servicio, 'obtener_clases_externas', return_value=[]):
+            servicio.obtener_calendario_consolidado(ModoVisualizacion.OCUPADO)
+        clave = servicio._clave_cache(ModoVisualizacion.OCUPADO, None, None)
+
+        assert obtener_cache_calendario().store.obtener(clave) is not None
+
+        # Otro worker invalida su cache y publica la nueva versión
+        incrementar_version_catalogo(agregador_horarios_service.CLAVE_VERSION_CALENDARIO)
+
+        assert obtener_cache_calendario().store.obtener(clave) is None
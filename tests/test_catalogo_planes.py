@@ -0,0 +1,80 @@
+"""Tests para el chequeo de acceso a clases y el catálogo de planes cacheado"""
+from sqlalchemy import event, insert, update
+from src.config.database import catalogo_version, db
+from src.models import Clase, PlanMembresia
+from src.models.clase import plan_clase_association
+from src.services import catalogo_planes_service
+from src.services.plan_service import PlanService
+
+
+def _accesible(datos, clase, plan='plan'):
+    """Chequea el acceso con la clase recién cargada (sin la relación planes)"""
+    db.session.expunge_all()
+    return (db.session.get(Clase, datos[clase])
+            .es_accesible_por_plan(db.session.get(PlanMembresia, datos[plan])))
+
+
+class TestCatalogoPlanes:
+    """Tests para el nivel mínimo persistido y el cache del plan mínimo por clase"""
+
+    def test_chequeo_de_acceso_sin_consultas_con_el_catalogo_cargado(self, app, datos):
+        assert _accesible(datos, 'clase1')
+        db.session.get(Clase, datos['clase1']).plan_minimo_requerido()  # carga el catálogo
+        clase = db.session.get(Clase, datos['clase2'])
+        plan = db.session.get(PlanMembresia, datos['plan'])
+        consultas = []
+
+        def registrar(conn, cursor, sentencia, *args):
+            consultas.append(sentencia)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            assert clase.es_accesible_por_plan(plan)
+            assert clase.plan_minimo_requerido() is plan
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+        assert consultas == []
+
+    def test_plan_service_actualiza_el_acceso(self, app, datos):
+        servicio = PlanService()
+        premium = servicio.crear_plan('Plan Premium', 'Todas las clases', 8000.0, nivel=2)
+        servicio.agregar_clase_a_plan(premium.id, db.session.get(Clase, datos['clase1']))
+        assert _accesible(datos, 'clase1')
+
+        servicio.quitar_clase_de_plan(datos['plan'], db.session.get(Clase, datos['clase1']))
+
+        assert not _accesible(datos, 'clase1')
+        assert _accesible(datos, 'clase2')
+
+    def test_el_acceso_no_depende_del_catalogo(self, app, datos, monkeypatch):
+        def sin_catalogo():
+            raise AssertionError('el chequeo de acceso no debe usar el catálogo')
+
+        monkeypatch.setattr(catalogo_planes_service, 'obtener_catalogo_planes', sin_catalogo)
+        assert _accesible(datos, 'clase1')
+        assert db.session.get(Clase, datos['clase1']).nivel_minimo == 1
+
+    def test_otro_worker_recarga_al_cambiar_la_version(self, app, datos, monkeypatch):
+        intermedio = PlanService().crear_plan('Plan Intermedio', 'Más clases', 5000.0, nivel=2)
+
+        def plan_minimo():
+            db.session.expunge_all()
+            return db.session.get(Clase, datos['clase1']).plan_minimo_requerido().id
+
+        assert plan_minimo() == datos['plan']
+
+        # Otro worker sube el nivel del plan básico y asocia la clase al intermedio
+        with db.engine.begin() as conexion:
+            conexion.execute(update(PlanMembresia)
+                             .where(PlanMembresia.id == datos['plan']).values(nivel=3))
+            conexion.execute(insert(plan_clase_association)
+                             .values(plan_id=intermedio.id, clase_id=datos['clase1']))
+        assert plan_minimo() == datos['plan']  # catálogo anterior, sin verificar
+
+        # ...y publica la nueva versión
+        monkeypatch.setattr(catalogo_planes_service, 'INTERVALO_VERIFICACION_SEGUNDOS', 0)
+        with db.engine.begin() as conexion:
+            conexion.execute(update(catalogo_version).values(version=catalogo_version.c.version + 1))
+
+        assert plan_minimo() == intermedio.id
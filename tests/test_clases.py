@@ -0,0 +1,114 @@
+"""Tests para el catálogo de clases"""
+import uuid
+from contextlib import contextmanager
+from datetime import time
+from sqlalchemy import event
+from src.config.database import db
+from src.models import Clase, Entrenador, Horario, PlanMembresia
+from src.utils.enums import DiaSemana
+
+
+@contextmanager
+def contar_consultas():
+    """Cuenta las sentencias SQL ejecutadas dentro del bloque"""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+
+
+def _crear_clases(cantidad):
+    """Crea clases activas, cada una con su entrenador, horario y plan"""
+    sufijo = uuid.uuid4().hex[:8]
+    for i in range(cantidad):
+        entrenador = Entrenador(f"Entrenador{i}", "Catálogo", f"catalogo{i}.{sufijo}@fitflow.com")
+        horario = Horario(DiaSemana.MARTES, time(8, 0), time(9, 0))
+        clase = Clase(f"Catálogo {i}", "Clase de catálogo", 10, entrenador, horario)
+        plan = PlanMembresia(f"Plan Catálogo {i}", "Plan de catálogo", 1000.0)
+        plan.clases.append(clase)
+        db.session.add_all([entrenador, horario, clase, plan])
+    db.session.commit()
+
+
+class TestCatalogoClases:
+    """Tests para el listado de clases sin N+1"""
+
+    def test_cantidad_de_consultas_constante(self, app, client):
+        _crear_clases(2)
+        db.session.remove()
+        with contar_consultas() as pocas:
+            respuesta = client.get('/api/clases')
+        assert respuesta.status_code == 200
+        total_inicial = respuesta.get_json()['count']
+
+        _crear_clases(15)
+        db.session.remove()
+        with contar_consultas() as muchas:
+            respuesta = client.get('/api/clases')
+
+        assert respuesta.get_json()['count'] == total_inicial + 15
+        assert 0 < len(muchas) == len(pocas)
+
+    def test_filtros_en_sql(self, app, client):
+        _crear_clases(2)
+        respuesta = client.get('/api/clases?dia=martes&con_cupo=true')
+        datos = respuesta.get_json()['data']
+
+        assert respuesta.status_code == 200
+        assert datos
+        assert all(c['dia'] == 'martes' and c['tiene_cupo'] for c in datos)
+        assert all(c['plan_minimo'] is not None for c in datos if c['titulo'].startswith('Catálogo'))
+
+
+class TestNivelMinimo:
+    """Tests para el nivel mínimo de plan precalculado en cada clase"""
+
+    def test_se_mantiene_al_asociar_y_quitar_planes(self, app, datos):
+        from src.services.plan_service import PlanService
+        servicio = PlanService()
+        elite = servicio.crear_plan('Plan Elite', 'Todo incluido', 9000.0, nivel=3)
+        clase = db.session.get(Clase, datos['clase1'])
+
+        assert clase.nivel_minimo == 1
+        servicio.agregar_clase_a_plan(elite.id, clase)
+        assert clase.nivel_minimo == 1
+
+        servicio.quitar_clase_de_plan(datos['plan'], clase)
+        assert clase.nivel_minimo == 3
+        servicio.quitar_clase_de_plan(elite.id, clase)
+        assert clase.nivel_minimo is None
+
+    def test_catalogo_filtra_las_clases_accesibles_por_plan(self, app, client, datos):
+        from src.repositories.clase_repository import ClaseRepository
+        from src.services.plan_service import PlanService
+        premium = PlanService().crear_plan('Plan Premium', 'Más clases', 7000.0, nivel=2)
+        PlanService().quitar_clase_de_plan(datos['plan'], db.session.get(Clase, datos['clase2']))
+        PlanService().agregar_clase_a_plan(premium.id, db.session.get(Clase, datos['clase2']))
+        db.session.commit()
+
+        def ids(plan_id):
+            respuesta = client.get(f'/api/clases?plan_accesible={plan_id}')
+            return [c['id'] for c in respuesta.get_json()['data']]
+
+        assert ids(datos['plan']) == [datos['clase1']]
+        assert ids(premium.id) == [datos['clase1'], datos['clase2']]
+        assert client.get('/api/clases?plan_accesible=9999').status_code == 400
+        assert [c.id for c in ClaseRepository().find_accesibles_por_nivel(1)] == [datos['clase1']]
+
+    def test_migracion_calcula_el_nivel_minimo(self, app, datos):
+        from sqlalchemy import text
+        from src.config.database import migrar_esquema
+        db.session.execute(text('DROP INDEX ix_clases_nivel_minimo'))
+        db.session.execute(text('ALTER TABLE clases DROP COLUMN nivel_minimo'))
+        db.session.commit()
+
+        assert 'clases.nivel_minimo' in migrar_esquema()
+
+        db.session.expire_all()
+        assert db.session.get(Clase, datos['clase1']).nivel_minimo == 1
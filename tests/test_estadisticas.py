@@ -0,0 +1,70 @@
+"""Tests para las estadísticas del dashboard"""
+from sqlalchemy import event
+from src.config.database import db
+from src.services.estadisticas_service import EstadisticasService
+
+
+class TestEstadisticasDashboard:
+    """Tests para /api/estadisticas"""
+
+    def test_dashboard_en_una_sola_consulta(self, app):
+        service = EstadisticasService()
+        esperado = {
+            "clase_popular": service.get_clase_mas_popular(),
+            "horario_concurrido": service.get_horario_mas_concurrido(),
+            "plan_ingresos": service.get_plan_mayor_ingresos(),
+            "tasa_presentismo": service.get_tasa_presentismo(),
+            **service.get_totales()
+        }
+        sentencias = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            resultado = service.get_dashboard_stats()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+        assert len(sentencias) == 1
+        assert resultado == esperado
+
+    def test_cada_agregado_se_calcula_una_vez(self, app, datos):
+        from src.models import Clase, Reserva, Socio
+        for socio, clase in [('socio1', 'clase1'), ('socio2', 'clase1'), ('socio1', 'clase2')]:
+            db.session.add(Reserva(db.session.get(Socio, datos[socio]),
+                                   db.session.get(Clase, datos[clase])))
+        db.session.commit()
+        service = EstadisticasService()
+        sentencias = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            resultado = service.get_dashboard_stats()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+        assert len(sentencias) == 1
+        assert sentencias[0].count('GROUP BY') == 3
+        assert resultado['clase_popular'] == {"clase": "Funcional Básico", "reservas": 2}
+        assert resultado['horario_concurrido'] == service.get_horario_mas_concurrido()
+        assert resultado['plan_ingresos'] == service.get_plan_mayor_ingresos()
+        assert resultado['total_reservas'] == 3
+        assert resultado['tasa_presentismo'] == service.get_tasa_presentismo()
+
+    def test_historico_devuelve_snapshots(self, app, client):
+        EstadisticasService().generar_snapshot()
+
+        respuesta = client.get('/api/estadisticas/historico?dias=7')
+        datos = respuesta.get_json()
+
+        assert respuesta.status_code == 200
+        assert datos['count'] >= 1
+        assert datos['data'][-1]['total_socios'] == datos['data'][-1]['datos']['total_socios']
+
+    def test_historico_valida_rango_de_dias(self, client):
+        assert client.get('/api/estadisticas/historico?dias=0').status_code == 400
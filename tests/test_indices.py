@@ -0,0 +1,140 @@
+"""Tests para los índices de las consultas frecuentes"""
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from src.config.database import db, migrar_esquema
+from src.models import Socio, Clase, PlanMembresia, Reserva
+from src.models.reserva import INDICE_RESERVA_ACTIVA
+from src.repositories.clase_repository import ClaseRepository
+from src.repositories.pago_repository import PagoRepository
+from src.repositories.reserva_repository import ReservaRepository
+from src.repositories.solicitud_baja_repository import SolicitudBajaRepository
+from src.services.lista_espera_service import ListaEsperaRepository
+from src.services.reserva_service import ReservaService
+from src.utils.enums import MotivoRechazoReserva
+
+
+@contextmanager
+def planes_de_consulta():
+    """Registra el EXPLAIN QUERY PLAN de cada SELECT ejecutado dentro del bloque"""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            consultas.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', registrar)
+    planes = []
+    try:
+        yield planes
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', registrar)
+    for statement, parameters in consultas:
+        filas = db.session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {statement}', parameters)
+        planes.append(' | '.join(fila[-1] for fila in filas))
+
+
+def _usa_indice(repositorio, metodo, *args):
+    """Devuelve el plan de la consulta que ejecuta el método del repositorio"""
+    with planes_de_consulta() as planes:
+        getattr(repositorio, metodo)(*args)
+    assert len(planes) == 1
+    return planes[0]
+
+
+class TestPlanesDeConsulta:
+    """Las consultas frecuentes usan un índice en lugar de recorrer la tabla"""
+
+    @pytest.mark.parametrize('repositorio, metodo, args, indice', [
+        (ReservaRepository, 'get_reservas_activas_clase', (1,), 'ix_reservas_clase_confirmada'),
+        (ReservaRepository, 'existe_activa', (1, 2), INDICE_RESERVA_ACTIVA),
+        (ListaEsperaRepository, 'obtener_por_clase', (1,), 'ix_lista_espera_clase_activo_posicion'),
+        (ListaEsperaRepository, 'obtener_sin_notificar', (1, 5), 'ix_lista_espera_clase_pendientes'),
+        (ClaseRepository, 'find_accesibles_por_nivel', (2,), 'ix_clases_nivel_minimo'),
+        (PagoRepository, 'find_pagos_socio_periodo', (1, 3, 2026), 'ix_pagos_socio_periodo'),
+        (PagoRepository, 'find_referencias_pendientes', (), 'ix_pagos_estado'),
+        (SolicitudBajaRepository, 'tiene_solicitud_pendiente', (1,), 'ix_solicitudes_baja_socio_estado'),
+    ])
+    def test_usa_indice(self, app, repositorio, metodo, args, indice):
+        plan = _usa_indice(repositorio(), metodo, *args)
+
+        assert f'INDEX {indice}' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_reservas_activas_de_un_socio(self, app):
+        with planes_de_consulta() as planes:
+            Reserva.query.filter_by(socio_id=1, confirmada=True).all()
+
+        assert 'INDEX ix_reservas_socio_confirmada' in planes[0]
+
+    def test_reporte_de_asistencia_por_rango(self, app):
+        with planes_de_consulta() as planes:
+            list(ReservaRepository().iterar_asistencia(
+                [1, 2], datetime(2026, 3, 1), datetime(2026, 4, 1)))
+
+        assert 'INDEX ix_reservas_clase_fecha' in planes[0]
+        assert 'TEMP B-TREE' not in planes[0]
+
+
+class TestReservaActivaUnica:
+    """Tests para el índice único parcial de reservas activas"""
+
+    def _socio_y_clase(self, datos):
+        plan = db.session.get(PlanMembresia, datos['plan'])
+        socio = db.session.get(Socio, datos['socio1'])
+        socio.asignar_plan(plan)
+        db.session.commit()
+        return socio, db.session.get(Clase, datos['clase1'])
+
+    def test_rechaza_segunda_reserva_activa_pero_no_canceladas(self, app, datos):
+        socio, clase = self._socio_y_clase(datos)
+        cancelada = Reserva(socio, clase)
+        cancelada.cancelar()
+        db.session.add_all([cancelada, Reserva(socio, clase)])
+        db.session.commit()
+
+        db.session.add(Reserva(socio, clase))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_servicio_informa_duplicado_si_lo_detecta_el_indice(self, app, datos, monkeypatch):
+        socio, clase = self._socio_y_clase(datos)
+        service = ReservaService()
+        assert service.crear_reserva(socio.id, clase.id)['success']
+
+        # Simula una carrera: la verificación previa no ve la otra reserva
+        monkeypatch.setattr(service.reserva_repository, 'existe_activa', lambda *args: False)
+        resultado = service.crear_reserva(socio.id, clase.id)
+
+        assert not resultado['success']
+        assert resultado['motivo'] == MotivoRechazoReserva.RESERVA_DUPLICADA.value
+        assert db.session.get(Clase, clase.id).cupos_ocupados == 1
+
+
+class TestMigracionIndices:
+    """Tests para la creación de índices en una base existente"""
+
+    def test_crea_indices_faltantes_y_cancela_duplicados(self, app, datos):
+        plan = db.session.get(PlanMembresia, datos['plan'])
+        socio = db.session.get(Socio, datos['socio1'])
+        socio.asignar_plan(plan)
+        clase = db.session.get(Clase, datos['clase1'])
+        for nombre in (INDICE_RESERVA_ACTIVA, 'ix_pagos_estado', 'ix_reservas_socio_confirmada'):
+            db.session.execute(text(f'DROP INDEX {nombre}'))
+        primera, repetida = Reserva(socio, clase), Reserva(socio, clase)
+        db.session.add_all([primera, repetida])
+        db.session.commit()
+
+        creados = migrar_esquema()
+
+        assert sorted(creados) == sorted(
+            [INDICE_RESERVA_ACTIVA, 'ix_pagos_estado', 'ix_reservas_socio_confirmada'])
+        db.session.expire_all()
+        assert db.session.get(Reserva, primera.id).esta_activa()
+        assert not db.session.get(Reserva, repetida.id).confirmada
+        assert db.session.get(Clase, clase.id).cupos_ocupados == 1
+        assert migrar_esquema() == []
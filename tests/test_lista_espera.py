@@ -0,0 +1,122 @@
+"""Tests para la cola de lista de espera y su promoción al liberarse cupos"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from src.config.database import db, migrar_esquema
+from src.config.scheduler import scheduler
+from src.models import Clase, ListaEspera, PlanMembresia, Socio, Tarea
+from src.services.lista_espera_service import ListaEsperaService
+from src.services.reserva_service import ReservaService
+from src.utils.enums import EstadoTarea
+
+
+def _inscribir(datos, *socios):
+    """Inscribe a los socios dados, en orden, en la lista de espera de clase1"""
+    servicio = ListaEsperaService()
+    clase = db.session.get(Clase, datos['clase1'])
+    return [servicio.inscribir_en_lista_espera(db.session.get(Socio, datos[s]), clase)
+            for s in socios]
+
+
+def _notificados(datos):
+    return [e.socio_id for e in ListaEspera.query.filter_by(
+        clase_id=datos['clase1'], notificado=True, activo=True).order_by(ListaEspera.posicion)]
+
+
+class TestPromoverListaEspera:
+    """Tests para la promoción por evento de cupos liberados"""
+
+    def test_notifica_tantos_como_cupos_liberados_sin_repetir(self, app, datos):
+        _inscribir(datos, 'socio1', 'socio2', 'socio3')
+        servicio = ListaEsperaService()
+
+        assert servicio.promover_lista_espera(datos['clase1'], 1) == 1
+        assert _notificados(datos) == [datos['socio1']]
+
+        # Cupo 2 y un lugar ya ofrecido: solo queda uno por ofrecer
+        assert servicio.promover_lista_espera(datos['clase1'], 5) == 1
+        assert servicio.promover_lista_espera(datos['clase1'], 1) == 0
+        assert _notificados(datos) == [datos['socio1'], datos['socio2']]
+
+    def test_cancelar_reserva_promueve_en_segundo_plano(self, app, datos):
+        plan = db.session.get(PlanMembresia, datos['plan'])
+        for clave in ('socio1', 'socio2', 'socio3'):
+            db.session.get(Socio, datos[clave]).asignar_plan(plan)
+        db.session.commit()
+        service = ReservaService()
+        reserva = service.crear_reserva(datos['socio1'], datos['clase1'])['reserva']
+        assert service.crear_reserva(datos['socio2'], datos['clase1'])['success']
+        entrada, = _inscribir(datos, 'socio3')
+
+        assert service.cancelar_reserva(reserva.id)['success']
+
+        for _ in range(100):
+            db.session.expire_all()
+            tarea = Tarea.query.filter_by(tipo='promover_lista_espera').first()
+            if tarea and tarea.estado not in (EstadoTarea.PENDIENTE, EstadoTarea.EN_CURSO):
+                break
+            time.sleep(0.05)
+        assert tarea.estado == EstadoTarea.COMPLETADA
+        assert tarea.resultado == {'notificaciones': 1}
+        assert _notificados(datos) == [datos['socio3']]
+        assert scheduler.scheduler.get_job(f'vencer_lista_espera_{entrada.id}') is not None
+
+    def test_vencimiento_ofrece_el_cupo_al_siguiente(self, app, datos):
+        primera, segunda = _inscribir(datos, 'socio1', 'socio2')
+        servicio = ListaEsperaService()
+        servicio.promover_lista_espera(datos['clase1'], 1)
+
+        assert servicio.procesar_vencimiento(primera.id) == 0  # todavía vigente
+
+        primera.fecha_limite_confirmacion = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        assert servicio.procesar_vencimiento(primera.id) == 1
+        assert not primera.activo
+        assert _notificados(datos) == [datos['socio2']]
+
+
+class TestColaListaEspera:
+    """Tests para la asignación de posiciones y la notificación en lote"""
+
+    def test_posiciones_no_se_reutilizan(self, app, datos):
+        servicio = ListaEsperaService()
+        primera, segunda = _inscribir(datos, 'socio1', 'socio2')
+        servicio.cancelar_inscripcion_lista_espera(primera.socio, primera.clase)
+
+        tercera, = _inscribir(datos, 'socio3')
+
+        assert [primera.posicion, segunda.posicion, tercera.posicion] == [1, 2, 3]
+        assert db.session.get(Clase, datos['clase1']).ultima_posicion_espera == 3
+
+    def test_reconciliacion_notifica_socios_distintos(self, app, datos):
+        _inscribir(datos, 'socio1', 'socio2', 'socio3')
+        servicio = ListaEsperaService()
+
+        # Cupo 2 libre: antes se notificaba dos veces al primero
+        assert servicio.procesar_liberaciones_cupos() == 2
+        assert servicio.procesar_liberaciones_cupos() == 0
+        assert _notificados(datos) == [datos['socio1'], datos['socio2']]
+
+    def test_expirados_se_desactivan_y_liberan_el_cupo(self, app, datos):
+        primera, segunda, tercera = _inscribir(datos, 'socio1', 'socio2', 'socio3')
+        servicio = ListaEsperaService()
+        servicio.promover_lista_espera(datos['clase1'], 1)
+        primera.fecha_limite_confirmacion = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        assert servicio.procesar_expirados() == 1
+
+        assert not db.session.get(ListaEspera, primera.id).activo
+        assert _notificados(datos) == [datos['socio2']]
+
+    def test_migracion_reconstruye_el_contador_de_posiciones(self, app, datos):
+        _inscribir(datos, 'socio1', 'socio2')
+        db.session.execute(text('ALTER TABLE clases DROP COLUMN ultima_posicion_espera'))
+        db.session.commit()
+
+        assert 'clases.ultima_posicion_espera' in migrar_esquema()
+
+        db.session.expire_all()
+        assert db.session.get(Clase, datos['clase1']).ultima_posicion_espera == 2
+        assert db.session.get(Clase, datos['clase2']).ultima_posicion_espera == 0
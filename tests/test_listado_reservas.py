@@ -0,0 +1,77 @@
+"""Tests para el listado general de reservas: filtros, paginación y exportación"""
+import json
+from datetime import datetime
+from sqlalchemy import event
+from src.config.database import db
+from src.models import Clase, Reserva, Socio
+
+
+def _reservar(datos, socio, clase, fecha, confirmada=True):
+    reserva = Reserva(db.session.get(Socio, datos[socio]), db.session.get(Clase, datos[clase]))
+    reserva.fecha_reserva = fecha
+    if not confirmada:
+        reserva.cancelar()
+    db.session.add(reserva)
+    db.session.commit()
+    return reserva.id
+
+
+class TestListadoReservas:
+    """Tests para GET /api/reservas"""
+
+    def test_filtros_en_la_base(self, client, datos):
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 3, 1, 9, 0))
+        _reservar(datos, 'socio2', 'clase1', datetime(2026, 3, 2, 9, 0), confirmada=False)
+        esperada = _reservar(datos, 'socio2', 'clase2', datetime(2026, 3, 31, 23, 0))
+        _reservar(datos, 'socio2', 'clase2', datetime(2026, 4, 1, 9, 0), confirmada=False)
+
+        def ids(query):
+            return [r['id'] for r in client.get(f'/api/reservas?{query}').get_json()['data']]
+
+        assert len(ids('')) == 4
+        assert len(ids('activas=true')) == 2
+        assert len(ids(f"clase_id={datos['clase1']}")) == 2
+        assert ids(f"socio_id={datos['socio2']}&fecha_desde=2026-03-03&fecha_hasta=2026-03-31") \
+            == [esperada]
+        assert client.get('/api/reservas?fecha_hasta=31/03').status_code == 400
+
+    def test_paginacion_keyset_con_nombres_precargados(self, client, datos):
+        for dia in range(1, 6):
+            _reservar(datos, 'socio1', 'clase2', datetime(2026, 3, dia), confirmada=dia == 5)
+        consultas = []
+
+        def registrar(conn, cursor, sentencia, *args):
+            consultas.append(sentencia)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            primera = client.get('/api/reservas?page_size=2&incluir_total=true').get_json()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+        assert len([c for c in consultas if 'FROM reservas' in c]) == 2  # COUNT y página
+        assert primera['pagination']['total_items'] == 5
+        assert primera['data'][0]['socio_nombre'] == 'María González'
+        assert primera['data'][0]['clase_titulo'] == 'CrossFit'
+
+        cursor = primera['pagination']['next_cursor']
+        segunda = client.get(f'/api/reservas?page_size=2&cursor={cursor}').get_json()
+        assert [r['id'] for r in segunda['data']] == [cursor + 1, cursor + 2]
+        ultima = client.get(
+            f"/api/reservas?page_size=2&cursor={segunda['pagination']['next_cursor']}").get_json()
+        assert ultima['count'] == 1
+        assert not ultima['pagination']['has_next']
+
+    def test_exportacion_ndjson(self, client, datos):
+        for dia in range(1, 4):
+            _reservar(datos, 'socio3', 'clase1', datetime(2026, 3, dia, 18, 0), confirmada=dia == 3)
+
+        respuesta = client.get(f"/api/reservas?formato=ndjson&socio_id={datos['socio3']}")
+
+        assert respuesta.is_streamed
+        assert respuesta.mimetype == 'application/x-ndjson'
+        lineas = [json.loads(linea) for linea in respuesta.get_data(as_text=True).splitlines()]
+        assert [linea['fecha_reserva'] for linea in lineas] == [
+            '2026-03-01T18:00:00', '2026-03-02T18:00:00', '2026-03-03T18:00:00']
+        assert lineas[0]['socio_nombre'] == 'Ana López'
+        assert lineas[0]['clase_titulo'] == 'Funcional Básico'
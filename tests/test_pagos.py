@@ -0,0 +1,133 @@
+"""Tests para la verificación de pagos en lote con la pasarela"""
+import time
+import uuid
+from unittest.mock import patch
+from src.config.database import db
+from src.datasources.proxy.pasarela_pagos_proxy import PasarelaPagosProxy
+from src.models import Socio, Pago
+from src.models.pago import EstadoPago
+from src.services.pago_service import PagoService
+from src.utils.enums import EstadoMembresia
+from tests.test_clases import contar_consultas
+
+
+class PasarelaFalsa(PasarelaPagosProxy):
+    """Pasarela local: cada lote demora un tiempo fijo y puede fallar o colgarse"""
+
+    def __init__(self, demora=0.1, fallidos=(), colgados=(), estados=None, **config):
+        super().__init__(config)
+        self.demora = demora
+        self.fallidos = set(fallidos)
+        self.colgados = set(colgados)
+        self.estados = estados or {}
+        self.conectar()
+
+    def verificar_disponibilidad(self):
+        return self.conectado
+
+    def _consultar_lote(self, referencias, timeout):
+        if referencias[0] in self.fallidos:
+            raise ConnectionError('respuesta 503')
+        time.sleep(timeout * 3 if referencias[0] in self.colgados else self.demora)
+        return {ref: self.estados.get(ref, EstadoPago.PROCESANDO) for ref in referencias
+                if ref not in self.estados or self.estados[ref] is not None}
+
+
+def _referencias(cantidad):
+    return [f'PAY_{i}' for i in range(cantidad)]
+
+
+class TestVerificacionEnLote:
+    """Tests para PasarelaPagosProxy.verificar_estados_lote"""
+
+    def test_duracion_acotada_por_el_lote_mas_lento(self):
+        pasarela = PasarelaFalsa(demora=0.1, tamano_lote=50, workers_lote=10)
+
+        inicio = time.perf_counter()
+        resultado = pasarela.verificar_estados_lote(_referencias(500))
+        duracion = time.perf_counter() - inicio
+
+        # 10 lotes de 0.1s en paralelo, no 1s en serie
+        assert duracion < 0.5
+        assert resultado.completo
+        assert len(resultado.estados) == 500
+
+    def test_fallas_parciales_y_timeout_por_lote(self):
+        pasarela = PasarelaFalsa(demora=0.01, fallidos={'PAY_0'}, colgados={'PAY_20'},
+                                 tamano_lote=10, workers_lote=4, timeout_lote=0.2)
+
+        inicio = time.perf_counter()
+        resultado = pasarela.verificar_estados_lote(_referencias(40))
+        duracion = time.perf_counter() - inicio
+
+        assert duracion < 0.5
+        assert sorted(resultado.no_verificadas) == sorted(_referencias(40)[0:10] + _referencias(40)[20:30])
+        assert len(resultado.estados) == 20
+        assert len(resultado.errores) == 2
+        assert any('503' in e for e in resultado.errores)
+        assert any('timeout' in e for e in resultado.errores)
+
+    def test_sin_conexion_no_verifica_nada(self):
+        pasarela = PasarelaFalsa()
+        pasarela.desconectar()
+
+        resultado = pasarela.verificar_estados_lote(_referencias(3))
+
+        assert resultado.estados == {}
+        assert resultado.no_verificadas == _referencias(3)
+
+
+class TestConciliacionPagos:
+    """Tests para PagoService.verificar_pagos_pendientes"""
+
+    def test_actualiza_en_lote_con_un_solo_commit(self, app):
+        sufijo = uuid.uuid4().hex[:8]
+        suspendido = Socio("Susp", "Endido", f"S{sufijo}", f"susp.{sufijo}@test.com")
+        suspendido.estado_membresia = EstadoMembresia.SUSPENDIDA
+        activo = Socio("Ac", "Tivo", f"A{sufijo}", f"activo.{sufijo}@test.com")
+        activo.estado_membresia = EstadoMembresia.ACTIVA
+        pagos = [Pago(suspendido if i == 0 else activo, 1000.0, 1, 2026, f'CONC_{sufijo}_{i}')
+                 for i in range(30)]
+        db.session.add_all([suspendido, activo, *pagos])
+        db.session.commit()
+
+        estados = {p.referencia_externa: EstadoPago.APROBADO for p in pagos[:20]}
+        estados.update({p.referencia_externa: EstadoPago.RECHAZADO for p in pagos[20:25]})
+        estados.update({p.referencia_externa: None for p in pagos[25:]})
+        servicio = PagoService()
+        servicio.pasarela_proxy = PasarelaFalsa(demora=0, estados=estados)
+        verificaciones = []
+        verificar_lote = servicio.pasarela_proxy.verificar_estados_lote
+
+        def espiar_verificacion(referencias):
+            verificaciones.append(verificar_lote(referencias))
+            return verificaciones[-1]
+
+        servicio.pasarela_proxy.verificar_estados_lote = espiar_verificacion
+
+        with contar_consultas() as sentencias, \
+                patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            resultado = servicio.verificar_pagos_pendientes()
+
+        assert commit.call_count == 1
+        updates = [s for s in sentencias
+                   if s.lstrip().upper().startswith(('UPDATE PAGOS', 'UPDATE SOCIOS'))]
+        # Un UPDATE por estado resultante + la reactivación de socios
+        assert len(updates) == 3
+        (verificacion,) = verificaciones
+        assert len(verificacion.estados) == 25
+        assert (sorted(verificacion.no_verificadas)
+                == sorted(p.referencia_externa for p in pagos[25:]))
+        assert verificacion.errores == []
+        assert (resultado['verificados'], resultado['aprobados'], resultado['rechazados'],
+                resultado['reactivados'], resultado['no_verificados']) == (25, 20, 5, 1, 5)
+
+        db.session.expire_all()
+        assert db.session.get(Socio, suspendido.id).estado_membresia == EstadoMembresia.ACTIVA
+        assert db.session.get(Socio, activo.id).estado_membresia == EstadoMembresia.ACTIVA
+        esperados = ([EstadoPago.APROBADO] * 20 + [EstadoPago.RECHAZADO] * 5
+                     + [EstadoPago.PENDIENTE] * 5)
+        for pago, esperado in zip(pagos, esperados):
+            actual = db.session.get(Pago, pago.id)
+            assert actual.estado == esperado, pago.referencia_externa
+            assert (actual.fecha_verificacion is not None) == (esperado != EstadoPago.PENDIENTE)
@@ -0,0 +1,133 @@
+"""Tests para la exportación por partes del reporte de asistencia"""
+import csv
+import io
+import sys
+import types
+from datetime import date, datetime
+import pytest
+from sqlalchemy import event
+from src.config.database import db
+from src.models import Clase, Reserva, Socio
+
+
+def _reservar(datos, socio, clase, fecha):
+    reserva = Reserva(db.session.get(Socio, datos[socio]), db.session.get(Clase, datos[clase]))
+    reserva.fecha_reserva = fecha
+    db.session.add(reserva)
+    db.session.commit()
+    return reserva
+
+
+def _filas(respuesta):
+    return list(csv.reader(io.StringIO(respuesta.get_data(as_text=True))))
+
+
+class TestReporteAsistencia:
+    """Tests para el reporte de una clase y el de varias clases por rango"""
+
+    def test_reporte_de_una_clase_se_envia_por_partes(self, client, datos):
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 3, 2, 18, 0))
+        cancelada = _reservar(datos, 'socio2', 'clase1', datetime(2026, 3, 3, 18, 0))
+        cancelada.confirmada = False
+        db.session.commit()
+
+        respuesta = client.get(f"/api/clases/{datos['clase1']}/reporte-asistencia")
+
+        assert respuesta.status_code == 200
+        assert respuesta.is_streamed
+        assert respuesta.mimetype == 'text/csv'
+        filas = _filas(respuesta)
+        assert filas[0] == ['Socio ID', 'Nombre', 'Apellido', 'DNI', 'Email',
+                            'Estado Reserva', 'Fecha Reserva']
+        assert [(f[0], f[5], f[6]) for f in filas[1:]] == [
+            (str(datos['socio1']), 'Confirmada', '2026-03-02 18:00:00'),
+            (str(datos['socio2']), 'Cancelada', '2026-03-03 18:00:00'),
+        ]
+
+    def test_una_sola_consulta_de_reservas(self, app, datos):
+        from src.services.reporte_asistencia_service import ReporteAsistenciaService
+        for socio in ('socio1', 'socio2', 'socio3'):
+            _reservar(datos, socio, 'clase2', datetime(2026, 3, 2, 19, 0))
+        db.session.expunge_all()
+        consultas = []
+
+        def registrar(conn, cursor, sentencia, *args):
+            consultas.append(sentencia)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            contenido = b''.join(ReporteAsistenciaService().exportar([datos['clase2']]))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+        assert contenido.count(b'\r\n') == 4
+        assert len([c for c in consultas if 'FROM reservas' in c]) == 1
+
+    def test_varias_clases_por_rango_de_fechas(self, client, datos):
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 2, 28, 23, 0))
+        _reservar(datos, 'socio1', 'clase2', datetime(2026, 3, 1, 9, 0))
+        _reservar(datos, 'socio2', 'clase1', datetime(2026, 3, 31, 23, 59))
+        _reservar(datos, 'socio3', 'clase2', datetime(2026, 4, 1, 0, 0))
+
+        respuesta = client.get(
+            f"/api/clases/reporte-asistencia?clases={datos['clase1']},{datos['clase2']}"
+            "&fecha_desde=2026-03-01&fecha_hasta=2026-03-31"
+        )
+
+        assert respuesta.status_code == 200
+        filas = _filas(respuesta)
+        assert filas[0][:2] == ['Clase ID', 'Clase']
+        assert [(f[1], f[2]) for f in filas[1:]] == [
+            ('Funcional Básico', str(datos['socio2'])),
+            ('CrossFit', str(datos['socio1'])),
+        ]
+
+    def test_parametros_invalidos(self, client, datos):
+        base = '/api/clases/reporte-asistencia'
+        assert client.get(f'{base}?formato=pdf').status_code == 400
+        assert client.get(f'{base}?fecha_desde=01-03-2026').status_code == 400
+        assert client.get(f'{base}?fecha_desde=2026-03-02&fecha_hasta=2026-03-01').status_code == 400
+        assert client.get(f'{base}?clases=9999').status_code == 400
+
+    def test_formato_sin_dependencia_instalada(self, client, datos, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+        respuesta = client.get(f"/api/clases/{datos['clase1']}/reporte-asistencia?formato=parquet")
+
+        assert respuesta.status_code == 400
+        assert 'pyarrow' in respuesta.get_json()['error']['message']
+
+    def test_xlsx(self, client, datos):
+        openpyxl = pytest.importorskip('openpyxl')
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 3, 2, 18, 0))
+
+        respuesta = client.get(f"/api/clases/{datos['clase1']}/reporte-asistencia?formato=xlsx")
+
+        hoja = openpyxl.load_workbook(io.BytesIO(respuesta.get_data())).active
+        assert [c.value for c in next(hoja.iter_rows(min_row=2, max_row=2))][-2] == 'Confirmada'
+
+    def test_xlsx_supera_el_maximo_de_filas(self, client, datos, monkeypatch):
+        from src.services import reporte_asistencia_service
+        # El límite se verifica antes de escribir: no hace falta openpyxl real
+        monkeypatch.setitem(sys.modules, 'openpyxl', types.ModuleType('openpyxl'))
+        monkeypatch.setattr(reporte_asistencia_service, 'MAX_FILAS_XLSX', 1)
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 3, 2, 18, 0))
+        _reservar(datos, 'socio2', 'clase1', datetime(2026, 3, 3, 18, 0))
+        url = f"/api/clases/{datos['clase1']}/reporte-asistencia?formato=xlsx"
+
+        respuesta = client.get(url)
+
+        assert respuesta.status_code == 400
+        assert 'XLSX admite hasta 1' in respuesta.get_json()['error']['message']
+        # Acotando el rango a una sola fila el reporte se acepta
+        reporte_asistencia_service.ReporteAsistenciaService().exportar(
+            [datos['clase1']], fecha_hasta=date(2026, 3, 2), formato='xlsx')
+
+    def test_parquet(self, client, datos):
+        pq = pytest.importorskip('pyarrow.parquet')
+        _reservar(datos, 'socio1', 'clase1', datetime(2026, 3, 2, 18, 0))
+
+        respuesta = client.get(f"/api/clases/{datos['clase1']}/reporte-asistencia?formato=parquet")
+
+        tabla = pq.read_table(io.BytesIO(respuesta.get_data()))
+        assert tabla.column('Socio ID').to_pylist() == [datos['socio1']]
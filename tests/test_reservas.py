@@ -0,0 +1,190 @@
+"""Tests para el contador de cupos y la creación de reservas"""
+import pytest
+from sqlalchemy import update
+from src.config.database import db
+from src.models import Socio, Clase, PlanMembresia, Reserva
+from src.services.reserva_service import ReservaService
+from src.repositories.clase_repository import ClaseRepository
+
+
+def _asignar_plan(datos, *socios):
+    """Asigna el plan del fixture a los socios indicados"""
+    plan = db.session.get(PlanMembresia, datos['plan'])
+    for clave in socios:
+        db.session.get(Socio, datos[clave]).asignar_plan(plan)
+    db.session.commit()
+
+
+class TestContadorCupos:
+    """Tests para el contador desnormalizado cupos_ocupados"""
+
+    def test_reserva_incrementa_y_cancelacion_libera(self, app, datos):
+        _asignar_plan(datos, 'socio1')
+        service = ReservaService()
+
+        resultado = service.crear_reserva(datos['socio1'], datos['clase1'])
+        assert resultado['success']
+        clase = db.session.get(Clase, datos['clase1'])
+        assert clase.cupos_ocupados == 1
+        assert clase.cupos_disponibles() == 1
+
+        resultado = service.cancelar_reserva(resultado['reserva'].id)
+        assert resultado['success']
+        db.session.refresh(clase)
+        assert clase.cupos_ocupados == 0
+
+    def test_cancelacion_concurrente_libera_el_cupo_una_vez(self, app, datos):
+        _asignar_plan(datos, 'socio1', 'socio2')
+        service = ReservaService()
+        reserva = service.crear_reserva(datos['socio1'], datos['clase1'])['reserva']
+        assert service.crear_reserva(datos['socio2'], datos['clase1'])['success']
+
+        # Otro request cancela la reserva mientras esta sesión todavía la ve confirmada
+        with db.engine.begin() as conexion:
+            conexion.execute(update(Reserva).where(Reserva.id == reserva.id)
+                             .values(confirmada=False))
+            conexion.execute(update(Clase).where(Clase.id == datos['clase1'])
+                             .values(cupos_ocupados=Clase.cupos_ocupados - 1))
+
+        resultado = service.cancelar_reserva(reserva.id)
+
+        assert not resultado['success']
+        clase = db.session.get(Clase, datos['clase1'])
+        db.session.refresh(clase)
+        assert clase.cupos_ocupados == 1
+
+    def test_no_supera_cupo_maximo(self, app, datos):
+        _asignar_plan(datos, 'socio1', 'socio2', 'socio3')
+        service = ReservaService()
+
+        assert service.crear_reserva(datos['socio1'], datos['clase1'])['success']
+        assert service.crear_reserva(datos['socio2'], datos['clase1'])['success']
+        resultado = service.crear_reserva(datos['socio3'], datos['clase1'])
+
+        assert not resultado['success']
+        assert 'cupo' in resultado['message']
+        assert db.session.get(Clase, datos['clase1']).cupos_ocupados == 2
+
+    def test_recalcular_corrige_contador_desincronizado(self, app, datos):
+        socio = db.session.get(Socio, datos['socio1'])
+        clase = db.session.get(Clase, datos['clase2'])
+        db.session.add(Reserva(socio, clase))
+        clase.cupos_ocupados = 7
+        db.session.commit()
+
+        corregidas = ClaseRepository().recalcular_cupos_ocupados()
+
+        assert corregidas >= 1
+        assert db.session.get(Clase, datos['clase2']).cupos_ocupados == 1
+
+
+class TestReservasActivasSocio:
+    """Tests para las consultas de reservas activas de un socio"""
+
+    def test_filtra_en_sql_con_clase_y_horario_precargados(self, app, client, datos):
+        from tests.test_clases import contar_consultas
+
+        _asignar_plan(datos, 'socio1')
+        service = ReservaService()
+        activa = service.crear_reserva(datos['socio1'], datos['clase1'])['reserva']
+        cancelada = service.crear_reserva(datos['socio1'], datos['clase2'])['reserva']
+        cancelada.cancelar()
+        db.session.commit()
+        db.session.expire_all()
+
+        with contar_consultas() as consultas:
+            respuesta = client.get(f"/api/reservas/socio/{datos['socio1']}")
+
+        reservas = respuesta.get_json()['data']
+        assert [r['id'] for r in reservas] == [activa.id]
+        assert reservas[0]['clase_dia'] is not None
+        assert len(consultas) == 1
+
+    def test_existe_activa(self, app, datos):
+        _asignar_plan(datos, 'socio1')
+        service = ReservaService()
+        reserva = service.crear_reserva(datos['socio1'], datos['clase1'])['reserva']
+        repo = service.reserva_repository
+
+        assert repo.existe_activa(datos['socio1'], datos['clase1'])
+        assert not repo.existe_activa(datos['socio1'], datos['clase2'])
+        service.cancelar_reserva(reserva.id)
+        assert not repo.existe_activa(datos['socio1'], datos['clase1'])
+
+
+class TestReservasConcurrentes:
+    """
+    Prueba de estrés: muchas reservas simultáneas sobre la misma clase.
+    
+    Usa una base SQLite en archivo con el pool normal: cada hilo tiene su
+    propia conexión y transacción (la base en memoria de conftest comparte
+    una sola conexión entre hilos y no prueba el aislamiento).
+    """
+
+    HILOS = 32
+    CUPO = 10
+
+    @pytest.fixture
+    def app_archivo(self, tmp_path, monkeypatch):
+        from src.config.settings import settings
+        from src.main import create_app
+
+        monkeypatch.setattr(settings.database, 'url', f"sqlite:///{tmp_path / 'estres.db'}")
+        app = create_app(iniciar_segundo_plano=False)
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.engine.dispose()
+
+    def test_sin_sobreventa_con_hilos_concurrentes(self, app_archivo):
+        import time as reloj
+        import uuid
+        from datetime import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.models import Entrenador, Horario
+        from src.utils.enums import DiaSemana, MotivoRechazoReserva
+
+        app = app_archivo
+        assert db.engine.url.database.endswith('estres.db')
+        assert db.engine.pool.__class__.__name__ == 'PoolConMetricas'
+        sufijo = uuid.uuid4().hex[:8]
+        plan = PlanMembresia("Plan Estrés", "Plan para prueba de estrés", 1000.0)
+        entrenador = Entrenador("Carga", "Test", f"carga.{sufijo}@fitflow.com")
+        horario = Horario(DiaSemana.VIERNES, time(7, 0), time(8, 0))
+        clase = Clase("Clase Estrés", "Clase muy demandada", self.CUPO, entrenador, horario)
+        plan.clases.append(clase)
+        socios = [
+            Socio("Socio", f"N{i}", f"{sufijo}{i:03d}", f"socio{i}.{sufijo}@test.com", plan)
+            for i in range(self.HILOS)
+        ]
+        db.session.add_all([plan, entrenador, horario, clase, *socios])
+        ClaseRepository().recalcular_nivel_minimo()
+        db.session.commit()
+        clase_id = clase.id
+        # Cada socio intenta dos veces: también se ejercita el control de duplicados
+        intentos = [s.id for s in socios] * 2
+
+        def reservar(socio_id):
+            with app.app_context():
+                return ReservaService().reservar(socio_id, clase_id)
+
+        inicio = reloj.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.HILOS) as executor:
+            resultados = list(executor.map(reservar, intentos))
+        duracion = reloj.perf_counter() - inicio
+
+        exitosas = [r for r in resultados if r.exitosa]
+        motivos = {r.motivo for r in resultados if not r.exitosa}
+        print(f"\n{len(intentos)} intentos con {self.HILOS} hilos en {duracion:.3f}s "
+              f"({len(intentos) / duracion:.0f} reservas/s)")
+
+        db.session.expire_all()
+        assert len(exitosas) == self.CUPO
+        assert motivos <= {MotivoRechazoReserva.SIN_CUPO, MotivoRechazoReserva.RESERVA_DUPLICADA}
+        clase = db.session.get(Clase, clase_id)
+        assert clase.cupos_ocupados == clase.cupo_maximo
+        assert Reserva.query.filter_by(clase_id=clase_id, confirmada=True).count() == len(exitosas)
+        socios_con_reserva = (db.session.query(Reserva.socio_id)
+                              .filter_by(clase_id=clase_id).distinct().count())
+        assert socios_con_reserva == self.CUPO
@@ -0,0 +1,61 @@
+"""Tests para la elección de líder del scheduler entre procesos"""
+import time
+from src.config.database import db
+from src.config.scheduler import EleccionLider, TaskScheduler
+
+
+def _eleccion(nodo, lease_segundos=60):
+    return EleccionLider(db.engine, nombre='test', lease_segundos=lease_segundos, nodo=nodo)
+
+
+class TestEleccionLider:
+    """Tests para el lease de liderazgo sobre SQLite"""
+
+    def test_un_solo_lider_y_relevo_al_liberar(self, app):
+        a, b = _eleccion('nodo-a'), _eleccion('nodo-b')
+
+        assert a.intentar()
+        assert not b.intentar()
+        assert a.intentar()  # renueva su propio lease
+
+        a.liberar()
+
+        assert b.intentar()
+        assert not a.intentar()
+        assert b.estado()['lider'] == 'nodo-b'
+
+    def test_otro_nodo_toma_el_liderazgo_si_el_lease_vence(self, app):
+        a, b = _eleccion('nodo-a', lease_segundos=0.1), _eleccion('nodo-b')
+        assert a.intentar()
+
+        time.sleep(0.15)  # a deja de latir
+
+        assert b.intentar()
+        assert not a.intentar()
+
+
+class TestTareasSoloEnElLider:
+    """Las tareas programadas se ejecutan solo en el proceso líder"""
+
+    def test_el_seguidor_omite_la_tarea(self, app):
+        lider = _eleccion('nodo-a')
+        lider.intentar()
+        ejecuciones = []
+        tareas = {}
+        for nodo in ('nodo-a', 'nodo-b'):
+            task_scheduler = TaskScheduler()
+            task_scheduler.eleccion = _eleccion(nodo)
+            tareas[nodo] = task_scheduler._solo_lider(lambda n=nodo: ejecuciones.append(n), 'prueba')
+
+        tareas['nodo-a']()
+        tareas['nodo-b']()
+
+        assert ejecuciones == ['nodo-a']
+
+    def test_health_informa_el_lider(self, client):
+        respuesta = client.get('/health')
+        liderazgo = respuesta.get_json()['checks']['scheduler']['liderazgo']
+
+        assert liderazgo['mecanismo'] == 'lease'
+        assert liderazgo['es_lider'] is True
+        assert liderazgo['lider'] == liderazgo['nodo']
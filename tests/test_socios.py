@@ -0,0 +1,299 @@
+"""Tests para el listado paginado de socios"""
+import uuid
+from src.config.database import db
+from src.models import Clase, PlanMembresia, Reserva, Socio
+from src.utils.enums import EstadoMembresia
+
+
+def _crear_socios(cantidad, plan=None):
+    """Crea socios con DNI y email únicos"""
+    sufijo = uuid.uuid4().hex[:8]
+    socios = [
+        Socio("Socio", f"Paginado{i}", f"P{sufijo}{i:03d}", f"pag{i}.{sufijo}@test.com", plan)
+        for i in range(cantidad)
+    ]
+    db.session.add_all(socios)
+    db.session.commit()
+    return socios
+
+
+class TestListadoSocios:
+    """Tests para GET /api/socios"""
+
+    def test_paginacion_por_offset_respeta_page_size(self, app, client):
+        _crear_socios(25)
+
+        respuesta = client.get('/api/socios?page=2&page_size=10&incluir_total=true')
+        datos = respuesta.get_json()
+
+        assert respuesta.status_code == 200
+        assert datos['count'] == 10
+        total = Socio.query.count()
+        assert datos['pagination']['total_items'] == total
+        assert datos['pagination']['total_pages'] == -(-total // 10)
+        assert datos['pagination']['has_previous'] is True
+
+    def test_paginacion_keyset_recorre_todos_sin_repetir(self, app, client):
+        _crear_socios(12)
+        vistos = []
+        url = '/api/socios?page_size=5'
+
+        while True:
+            datos = client.get(url).get_json()
+            vistos.extend(s['id'] for s in datos['data'])
+            if not datos['pagination']['has_next']:
+                break
+            url = f"/api/socios?page_size=5&cursor={datos['pagination']['next_cursor']}"
+
+        assert vistos == sorted(vistos)
+        assert len(vistos) == len(set(vistos)) == Socio.query.count()
+
+    def test_filtro_estado_en_sql_sin_total_por_defecto(self, app, client):
+        plan = PlanMembresia("Plan Paginado", "Plan de prueba", 1000.0)
+        db.session.add(plan)
+        _crear_socios(3, plan)
+        _crear_socios(3)
+
+        datos = client.get('/api/socios?estado=suspendida&page_size=100').get_json()
+
+        assert datos['pagination']['total_items'] is None
+        assert datos['count'] == Socio.query.filter_by(
+            estado_membresia=EstadoMembresia.SUSPENDIDA).count()
+        assert all(s['estado_membresia'] == 'suspendida' for s in datos['data'])
+
+
+class TestImportacionCSV:
+    """Tests para la importación masiva de socios desde CSV"""
+
+    def _escribir_csv(self, tmp_path, filas):
+        ruta = tmp_path / 'socios.csv'
+        lineas = ['Nombre,Apellido,DNI,Email,ID Plan Membresía'] + [','.join(f) for f in filas]
+        ruta.write_text('\n'.join(lineas) + '\n', encoding='utf-8')
+        return str(ruta)
+
+    def test_importa_actualiza_y_reporta_errores_por_fila(self, app, tmp_path):
+        from src.services.csv_importer_service import CSVImporterService
+
+        plan = PlanMembresia("Plan CSV", "Plan de prueba", 1000.0)
+        db.session.add(plan)
+        existente = _crear_socios(1)[0]
+        sufijo = uuid.uuid4().hex[:8]
+        p = str(plan.id)
+        ruta = self._escribir_csv(tmp_path, [
+            ['Ana', 'Nueva', f'N1{sufijo}', f'ana.{sufijo}@test.com', p],
+            ['Beto', 'Actualizado', existente.dni, f'beto.{sufijo}@test.com', p],
+            ['Caro', 'SinPlan', f'N2{sufijo}', f'caro.{sufijo}@test.com', '999999'],
+            ['', 'SinNombre', f'N3{sufijo}', f'sn.{sufijo}@test.com', p],
+            ['Dani', 'EmailAjeno', f'N4{sufijo}', f'ana.{sufijo}@test.com', p],
+            ['Ana', 'Repetida', f'N1{sufijo}', f'ana.{sufijo}@test.com', 'x'],
+            ['Ana', 'Final', f'N1{sufijo}', f'ana.{sufijo}@test.com', p],
+        ])
+
+        resultado = CSVImporterService().importar_socios(ruta)
+
+        assert resultado['total'] == 7
+        assert resultado['creados'] == 1
+        assert resultado['actualizados'] == 2
+        assert resultado['errores'] == [
+            'Error en fila 4: Plan con ID 999999 no existe',
+            'Error en fila 5: Todos los campos son obligatorios',
+            f'Error en fila 6: El email ana.{sufijo}@test.com ya está registrado por otro socio',
+            'Error en fila 7: ID de plan inválido: x',
+        ]
+        db.session.expire_all()
+        assert Socio.query.filter_by(dni=f'N1{sufijo}').one().apellido == 'Final'
+        actualizado = db.session.get(Socio, existente.id)
+        assert actualizado.apellido == 'Actualizado'
+        assert actualizado.plan_membresia_id == plan.id
+        assert actualizado.estado_membresia == EstadoMembresia.ACTIVA
+
+    def test_lote_que_falla_se_reintenta_fila_por_fila(self, app, tmp_path, monkeypatch):
+        from src.repositories.socio_repository import SocioRepository
+        from src.services.csv_importer_service import CSVImporterService
+
+        plan = PlanMembresia("Plan CSV", "Plan de prueba", 1000.0)
+        db.session.add(plan)
+        existente = _crear_socios(1)[0]
+        sufijo = uuid.uuid4().hex[:8]
+        p = str(plan.id)
+        ruta = self._escribir_csv(tmp_path, [
+            ['Ana', 'Nueva', f'N1{sufijo}', f'ana.{sufijo}@test.com', p],
+            ['Mala', 'Rechazada', f'MALO{sufijo}', f'mala.{sufijo}@test.com', p],
+            ['Beto', 'Actualizado', existente.dni, f'beto.{sufijo}@test.com', p],
+        ])
+        insertar = SocioRepository.insertar_en_lote
+
+        def insertar_fallando(repo, filas):
+            if any(f['dni'].startswith('MALO') for f in filas):
+                raise ValueError('restricción violada')
+            insertar(repo, filas)
+
+        monkeypatch.setattr(SocioRepository, 'insertar_en_lote', insertar_fallando)
+
+        resultado = CSVImporterService().importar_socios(ruta)
+
+        assert resultado['creados'] == 1
+        assert resultado['actualizados'] == 1
+        assert resultado['errores'] == ['Error en fila 3: restricción violada']
+        db.session.expire_all()
+        assert Socio.query.filter_by(dni=f'N1{sufijo}').count() == 1
+        assert Socio.query.filter_by(dni=f'MALO{sufijo}').count() == 0
+        assert db.session.get(Socio, existente.id).apellido == 'Actualizado'
+
+    def test_columnas_faltantes(self, app, tmp_path):
+        from src.services.csv_importer_service import CSVImporterService
+
+        ruta = tmp_path / 'malo.csv'
+        ruta.write_text('Nombre,DNI\nAna,1\n', encoding='utf-8')
+
+        resultado = CSVImporterService().importar_socios(str(ruta))
+
+        assert resultado['creados'] == 0
+        assert 'El CSV debe contener las columnas' in resultado['errores'][0]
+
+    def test_importacion_en_segundo_plano_por_lotes(self, app, client, monkeypatch):
+        import io
+        import time
+        from src.services import csv_importer_service
+
+        monkeypatch.setattr(csv_importer_service, 'TAMANO_LOTE', 2)
+        plan = PlanMembresia("Plan CSV Lotes", "Plan de prueba", 1000.0)
+        db.session.add(plan)
+        db.session.commit()
+        sufijo = uuid.uuid4().hex[:8]
+        filas = [[f'Socio{i}', 'Lote', f'L{sufijo}{i}', f'lote{i}.{sufijo}@test.com', str(plan.id)]
+                 for i in range(5)]
+        filas[3][3] = filas[0][3]  # email ya importado en el primer lote
+        contenido = '\n'.join(['Nombre,Apellido,DNI,Email,ID Plan Membresía']
+                              + [','.join(f) for f in filas]) + '\n'
+
+        respuesta = client.post(
+            '/api/socios/importar-csv',
+            data={'archivo': (io.BytesIO(contenido.encode('utf-8')), 'socios.csv')},
+            content_type='multipart/form-data'
+        )
+        assert respuesta.status_code == 202
+        url = f"/api/tareas/{respuesta.get_json()['data']['id']}"
+
+        for _ in range(100):
+            tarea = client.get(url).get_json()['data']
+            if tarea['estado'] not in ('pendiente', 'en_curso'):
+                break
+            time.sleep(0.05)
+
+        assert tarea['estado'] == 'completada'
+        progreso = tarea['resultado']
+        assert progreso['porcentaje'] == 100.0
+        assert progreso['filas_procesadas'] == 5
+        assert progreso['creados'] == 4
+        assert progreso['errores'] == [
+            f'Error en fila 5: El email lote0.{sufijo}@test.com ya está registrado por otro socio'
+        ]
+
+
+class TestResumenSocio:
+    """Tests para el resumen cacheado del socio logueado en las plantillas"""
+
+    def _contexto_plantilla(self, app, socio_id):
+        from flask import session
+        with app.test_request_context():
+            session['socio_id'] = socio_id
+            contexto = {}
+            app.update_template_context(contexto)
+            return contexto['current_user']
+
+    def test_encabezado_sin_consultas_e_invalidacion_al_cambiar_plan(self, app, datos):
+        from tests.test_clases import contar_consultas
+        from src.services.socio_service import SocioService
+        from src.services.plan_service import PlanService
+
+        socio = db.session.get(Socio, datos['socio1'])
+        plan = db.session.get(PlanMembresia, datos['plan'])
+        assert self._contexto_plantilla(app, socio.id)['plan'] is None
+
+        socio.asignar_plan(plan)
+        SocioService().actualizar_membresia(socio)
+        assert self._contexto_plantilla(app, socio.id)['plan']['titulo'] == plan.titulo
+
+        with contar_consultas() as consultas:
+            usuario = self._contexto_plantilla(app, socio.id)
+        assert consultas == []
+        assert usuario['plan'] == {'id': plan.id, 'titulo': plan.titulo, 'nivel': plan.nivel}
+
+        PlanService().actualizar_plan(plan.id, titulo="Plan Renombrado")
+        assert self._contexto_plantilla(app, socio.id)['plan']['titulo'] == "Plan Renombrado"
+
+    def test_actualizar_socio_por_api_invalida_el_resumen(self, app, client, datos):
+        from src.services.socio_service import obtener_resumen_socio
+
+        socio_id = datos['socio1']
+        assert obtener_resumen_socio(socio_id) == {
+            'id': socio_id, 'nombre': 'María González', 'estado': 'suspendida', 'plan': None
+        }
+
+        respuesta = client.put(f'/api/socios/{socio_id}', json={
+            'plan_membresia_id': datos['plan'],
+            'estado_membresia': 'activa'
+        })
+
+        assert respuesta.status_code == 200
+        resumen = obtener_resumen_socio(socio_id)
+        assert resumen['estado'] == 'activa'
+        assert resumen['plan']['id'] == datos['plan']
+
+    def test_aprobar_baja_invalida_el_resumen(self, app, datos):
+        from src.models import SolicitudBaja
+        from src.services.socio_service import obtener_resumen_socio
+        from src.services.solicitud_baja_service import SolicitudBajaService
+
+        socio = db.session.get(Socio, datos['socio1'])
+        socio.asignar_plan(db.session.get(PlanMembresia, datos['plan']))
+        solicitud = SolicitudBaja(socio, 'Me mudo a otra ciudad y no voy a poder asistir')
+        db.session.add(solicitud)
+        db.session.commit()
+        assert obtener_resumen_socio(socio.id)['plan'] is not None
+
+        SolicitudBajaService().aprobar_solicitud(solicitud.id)
+
+        resumen = obtener_resumen_socio(socio.id)
+        assert resumen['estado'] == 'baja_definitiva'
+        assert resumen['plan'] is None
+
+    def test_invalidacion_de_otro_worker_por_version(self, app, datos, monkeypatch):
+        from src.config.database import incrementar_version_catalogo
+        from src.services import socio_service
+
+        monkeypatch.setattr(socio_service, 'INTERVALO_VERIFICACION_SEGUNDOS', 0)
+        socio_id = datos['socio1']
+        assert socio_service.obtener_resumen_socio(socio_id)['estado'] == 'suspendida'
+
+        # Otro worker cambia el estado del socio e invalida su cache
+        db.session.get(Socio, socio_id).estado_membresia = EstadoMembresia.ACTIVA
+        db.session.commit()
+        incrementar_version_catalogo(socio_service.CLAVE_VERSION_RESUMEN_SOCIO)
+
+        assert socio_service.obtener_resumen_socio(socio_id)['estado'] == 'activa'
+
+
+class TestEliminarSocio:
+    """Tests para DELETE /api/socios/<id>"""
+
+    def test_libera_solo_los_cupos_de_reservas_confirmadas(self, app, client, datos):
+        socio = db.session.get(Socio, datos['socio1'])
+        clase1 = db.session.get(Clase, datos['clase1'])
+        clase2 = db.session.get(Clase, datos['clase2'])
+        cancelada = Reserva(socio, clase2)
+        cancelada.cancelar()
+        db.session.add_all([Reserva(socio, clase1), cancelada,
+                            Reserva(db.session.get(Socio, datos['socio2']), clase2)])
+        clase1.cupos_ocupados, clase2.cupos_ocupados = 1, 1
+        db.session.commit()
+
+        respuesta = client.delete(f"/api/socios/{datos['socio1']}")
+
+        assert respuesta.status_code == 200
+        db.session.expire_all()
+        assert db.session.get(Socio, datos['socio1']) is None
+        assert db.session.get(Clase, datos['clase1']).cupos_ocupados == 0
+        assert db.session.get(Clase, datos['clase2']).cupos_ocupados == 1
+        assert client.delete(f"/api/socios/{datos['socio1']}").status_code == 400
@@ -0,0 +1,179 @@
+"""Tests para el ejecutor de tareas en segundo plano"""
+import threading
+import time
+from datetime import datetime, timedelta
+from src.config.database import db
+from src.config.tareas import EjecutorTareas, ejecutor_tareas
+from src.models import Tarea
+from src.repositories.tarea_repository import TareaRepository
+from src.utils.enums import EstadoTarea
+
+
+def _esperar(client, tarea_id):
+    """Consulta la tarea hasta que termine y devuelve su última versión"""
+    for _ in range(100):
+        tarea = client.get(f'/api/tareas/{tarea_id}').get_json()['data']
+        if tarea['estado'] not in ('pendiente', 'en_curso'):
+            return tarea
+        time.sleep(0.05)
+    return tarea
+
+
+class TestEjecutorTareas:
+    """Tests para EjecutorTareas y los endpoints de /api/tareas"""
+
+    def test_tarea_informa_progreso_y_resultado(self, app, client):
+        def contar(parametros, reportar):
+            for i in range(parametros['hasta']):
+                reportar({'hechos': i + 1})
+            return {'total': parametros['hasta']}
+
+        ejecutor_tareas.registrar('prueba_contar', contar)
+        tarea = ejecutor_tareas.encolar('prueba_contar', {'hasta': 3})
+
+        final = _esperar(client, tarea.id)
+
+        assert final['estado'] == 'completada'
+        assert final['progreso'] == {'hechos': 3}
+        assert final['resultado'] == {'total': 3}
+        assert final['iniciada_en'] and final['finalizada_en']
+        listado = client.get('/api/tareas?tipo=prueba_contar&estado=completada').get_json()
+        assert tarea.id in [t['id'] for t in listado['data']]
+
+    def test_tarea_fallida_guarda_el_error(self, app, client):
+        def fallar(parametros, reportar):
+            raise RuntimeError('pasarela caída')
+
+        ejecutor_tareas.registrar('prueba_fallar', fallar)
+        tarea = ejecutor_tareas.encolar('prueba_fallar')
+
+        final = _esperar(client, tarea.id)
+
+        assert final['estado'] == 'fallida'
+        assert final['error'] == 'pasarela caída'
+        assert final['resultado'] is None
+
+    def test_unica_devuelve_la_tarea_activa(self, app, client):
+        liberar = threading.Event()
+        ejecutor_tareas.registrar('prueba_bloquear', lambda p, r: liberar.wait(5) and None)
+
+        primera = ejecutor_tareas.encolar('prueba_bloquear', unica=True)
+        segunda = ejecutor_tareas.encolar('prueba_bloquear', unica=True)
+        liberar.set()
+
+        assert segunda.id == primera.id
+        assert _esperar(client, primera.id)['estado'] == 'completada'
+
+    def test_operaciones_largas_responden_202(self, app, client):
+        for url in ('/api/pagos/verificar-pendientes', '/api/calendario/actualizar'):
+            respuesta = client.post(url)
+            assert respuesta.status_code == 202
+            # La pasarela simulada puede no estar disponible: basta con que termine
+            assert _esperar(client, respuesta.get_json()['data']['id'])['estado'] in (
+                'completada', 'fallida')
+
+    def test_dos_ejecutores_compiten_por_la_misma_tarea(self, app):
+        ejecuciones = []
+        candado = threading.Lock()
+
+        def registrar_ejecucion(parametros, reportar):
+            with candado:
+                ejecuciones.append(threading.current_thread().name)
+            time.sleep(0.05)
+
+        ejecutores = [EjecutorTareas(), EjecutorTareas()]
+        for ejecutor in ejecutores:
+            ejecutor.registrar('prueba_carrera', registrar_ejecucion)
+            ejecutor.iniciar(app, 1)
+        tarea = Tarea('carrera' + datetime.utcnow().strftime('%H%M%S%f'), 'prueba_carrera')
+        db.session.add(tarea)
+        db.session.commit()
+        tarea_id = tarea.id
+
+        largada = threading.Barrier(len(ejecutores))
+
+        def competir(ejecutor):
+            largada.wait()
+            ejecutor._ejecutar(tarea_id)
+
+        hilos = [threading.Thread(target=competir, args=(e,)) for e in ejecutores]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(5)
+        for ejecutor in ejecutores:
+            ejecutor.detener()
+
+        assert len(ejecuciones) == 1
+        db.session.expire_all()
+        assert db.session.get(Tarea, tarea_id).estado == EstadoTarea.COMPLETADA
+
+    def test_worker_lento_no_pisa_la_tarea_ya_recuperada(self, app):
+        def terminar_tarde(parametros, reportar):
+            # Mientras corre, el líder la da por interrumpida (latido atrasado)
+            TareaRepository().marcar_interrumpidas(datetime.utcnow() + timedelta(minutes=1))
+            return {'ok': True}
+
+        ejecutor = EjecutorTareas()
+        ejecutor.registrar('prueba_lenta', terminar_tarde)
+        ejecutor.iniciar(app, 1)
+        tarea = Tarea('lenta' + datetime.utcnow().strftime('%H%M%S%f'), 'prueba_lenta')
+        db.session.add(tarea)
+        db.session.commit()
+        tarea_id = tarea.id
+
+        hilo = threading.Thread(target=ejecutor._ejecutar, args=(tarea_id,))
+        hilo.start()
+        hilo.join(5)
+        ejecutor.detener()
+
+        db.session.expire_all()
+        final = db.session.get(Tarea, tarea_id)
+        assert final.estado == EstadoTarea.FALLIDA
+        assert final.resultado is None
+        assert 'dejó de responder' in final.error
+
+    def test_recuperacion_solo_toca_tareas_de_nodos_sin_latido(self, app, client):
+        ejecutor_tareas.registrar('prueba_recuperar', lambda p, r: {'ok': True})
+        hace_un_rato = datetime.utcnow() - timedelta(minutes=10)
+        tareas = {nombre: Tarea(nombre + datetime.utcnow().strftime('%H%M%S%f'), 'prueba_recuperar')
+                  for nombre in ('viva', 'muerta', 'huerfana', 'nueva')}
+        for nombre, nodo in (('viva', 'otro-worker:1'), ('muerta', 'caido:2')):
+            tareas[nombre].estado = EstadoTarea.EN_CURSO
+            tareas[nombre].nodo = nodo
+            tareas[nombre].iniciada_en = tareas[nombre].latido_en = hace_un_rato
+        tareas['huerfana'].creada_en = hace_un_rato
+        db.session.add_all(tareas.values())
+        db.session.commit()
+        ids = {nombre: tarea.id for nombre, tarea in tareas.items()}
+
+        # El otro worker sigue vivo y renueva el latido de su tarea
+        TareaRepository().registrar_latido('otro-worker:1')
+
+        assert ejecutor_tareas.recuperar(abandono_segundos=120) == (1, 1)
+
+        assert _esperar(client, ids['huerfana'])['estado'] == 'completada'
+        db.session.expire_all()
+        assert db.session.get(Tarea, ids['viva']).estado == EstadoTarea.EN_CURSO
+        assert db.session.get(Tarea, ids['muerta']).estado == EstadoTarea.FALLIDA
+        assert db.session.get(Tarea, ids['nueva']).estado == EstadoTarea.PENDIENTE
+
+    def test_purga_respeta_la_retencion(self, app):
+        vieja = Tarea('vieja' + datetime.utcnow().strftime('%H%M%S%f'), 'prueba_purga')
+        reciente = Tarea('reciente' + datetime.utcnow().strftime('%H%M%S%f'), 'prueba_purga')
+        for tarea, dias in ((vieja, 10), (reciente, 1)):
+            tarea.estado = EstadoTarea.COMPLETADA
+            tarea.finalizada_en = datetime.utcnow() - timedelta(days=dias)
+        db.session.add_all([vieja, reciente])
+        db.session.commit()
+        vieja_id, reciente_id = vieja.id, reciente.id
+
+        assert ejecutor_tareas.purgar(retencion_dias=7) >= 1
+
+        db.session.expire_all()
+        assert db.session.get(Tarea, vieja_id) is None
+        assert db.session.get(Tarea, reciente_id) is not None
+
+    def test_tarea_inexistente_y_filtro_invalido(self, app, client):
+        assert client.get('/api/tareas/no-existe').status_code == 400
+        assert client.get('/api/tareas?estado=otro').status_code == 400
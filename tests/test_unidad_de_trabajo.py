@@ -0,0 +1,80 @@
+"""Tests para la unidad de trabajo (uow) de los repositorios"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from src.config.database import db
+from src.models import Socio, SolicitudBaja
+from src.repositories import SocioRepository, uow
+from src.services.solicitud_baja_service import SolicitudBajaService
+from src.utils.enums import EstadoMembresia
+
+JUSTIFICACION = "Me mudo a otra ciudad por trabajo y no voy a poder seguir asistiendo"
+
+
+@contextmanager
+def contar_commits():
+    """Cuenta los commits de la sesión actual dentro del bloque"""
+    commits = []
+    session = db.session()
+
+    def registrar(sesion):
+        commits.append(sesion)
+
+    event.listen(session, 'after_commit', registrar)
+    try:
+        yield commits
+    finally:
+        event.remove(session, 'after_commit', registrar)
+
+
+class TestUnidadDeTrabajo:
+    """Tests para uow() y su uso en los servicios"""
+
+    def test_sin_uow_cada_operacion_confirma(self, app, datos):
+        socio = db.session.get(Socio, datos['socio1'])
+
+        with contar_commits() as commits:
+            socio.apellido = 'Modificado'
+            SocioRepository().update(socio)
+            SocioRepository().save(socio)
+
+        assert len(commits) == 2
+
+    def test_crear_solicitud_confirma_una_sola_vez(self, app, datos):
+        with contar_commits() as commits:
+            solicitud = SolicitudBajaService().crear_solicitud(datos['socio1'], JUSTIFICACION)
+
+        assert len(commits) == 1
+        db.session.expire_all()
+        assert db.session.get(SolicitudBaja, solicitud.id) is not None
+        assert db.session.get(Socio, datos['socio1']).estado_membresia == EstadoMembresia.BAJA_SOLICITADA
+
+    def test_excepcion_deshace_toda_la_unidad(self, app, datos):
+        repo = SocioRepository()
+        socio = repo.get_by_id(datos['socio2'])
+        apellido_original = socio.apellido
+
+        with pytest.raises(RuntimeError):
+            with uow():
+                socio.apellido = 'NoDebeQuedar'
+                repo.update(socio)
+                nuevo = repo.create(Socio("Temporal", "Uow", "UOW-TMP-1", "uow.tmp@test.com"))
+                assert nuevo.id is not None
+                raise RuntimeError('falla a mitad del flujo')
+
+        db.session.expire_all()
+        assert repo.get_by_id(datos['socio2']).apellido == apellido_original
+        assert repo.find_by_dni("UOW-TMP-1") is None
+
+    def test_unidades_anidadas_confirman_al_final(self, app, datos):
+        repo = SocioRepository()
+        socio = repo.get_by_id(datos['socio3'])
+
+        with contar_commits() as commits:
+            with uow():
+                with uow():
+                    socio.apellido = 'Anidado'
+                    repo.update(socio)
+                assert commits == []
+
+        assert len(commits) == 1
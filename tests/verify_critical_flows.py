@@ -7,6 +7,7 @@ sys.path.append(os.getcwd())
 
 from src.main import create_app
 from src.config.database import db
+from src.repositories.clase_repository import ClaseRepository
 from src.services.reserva_service import ReservaService
 from src.services.lista_espera_service import ListaEsperaService
 from src.services.solicitud_baja_service import SolicitudBajaService
@@ -65,6 +66,7 @@ def run_verification():
         # Vincular clase al plan (para que puedan reservarla)
         if clase_limite not in plan.clases:
             plan.clases.append(clase_limite)
+        ClaseRepository().recalcular_nivel_minimo([clase_limite.id])
         db.session.commit()
         
         reserva_service = ReservaService()